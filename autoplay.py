@@ -0,0 +1,173 @@
+"""
+AUTOPLAY
+========
+A scripted player and per-wave recorder for headless benchmark runs of
+game2.py (python game2.py --headless --bot ...).
+
+ScriptedBot plays through the same input path as a person: it buys a
+weapon from the shop, strafes left and right, turns to face the nearest
+enemy or boss and fires at the weapon's fire rate, reloads, and grapples
+every few seconds. On boss waves it closes in on the boss so its abilities
+(slams, charges, bursts, teleports) actually fire. It keeps the player's
+health topped up so a run always reaches the target wave; the point is a
+repeatable workload, not a fair fight.
+
+WaveRecorder collects, per wave: frame-time percentiles, peak entity
+counts, allocation and GC activity and peak RSS, and writes them as JSON.
+"""
+
+import gc
+import json
+import sys
+from math import atan2, degrees
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (0 where unavailable)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KB elsewhere
+
+
+class ScriptedBot:
+    """Deterministic player that strafes, aims, fires and grapples"""
+    def __init__(self, press, player, targets, fire_interval, weapon_key='3',
+                 strafe_period=1.5, grapple_period=4.0, boss_range=12):
+        self.press = press              # press(key) feeds one input event, e.g. 'a' or 'a up'
+        self.player = player
+        self.targets = targets          # targets() -> (enemies, bosses)
+        self.fire_interval = fire_interval
+        self.weapon_key = weapon_key    # Shop key of the weapon to buy on the first tick
+        self.strafe_period = strafe_period
+        self.grapple_period = grapple_period
+        self.boss_range = boss_range
+        self.time = 0.0
+        self._fire_timer = 0.0
+        self._strafe_timer = 0.0
+        self._strafe_key = 'a'
+        self._grapple_timer = 0.0
+        self._closing_in = False
+        self._started = False
+
+    def start(self):
+        self.press('b')
+        self.press(self.weapon_key)  # Buying closes the shop
+        self.press(self._strafe_key)
+        self._started = True
+
+    def update(self, dt):
+        if not self._started:
+            self.start()
+        self.time += dt
+        player = self.player
+        player.health = player.max_health
+
+        # Strafe back and forth
+        self._strafe_timer += dt
+        if self._strafe_timer >= self.strafe_period:
+            self._strafe_timer = 0.0
+            self.press(f'{self._strafe_key} up')
+            self._strafe_key = 'd' if self._strafe_key == 'a' else 'a'
+            self.press(self._strafe_key)
+
+        enemies, bosses = self.targets()
+        target = self._nearest(enemies) or self._nearest(bosses)
+        boss = self._nearest(bosses)
+        self._close_in(boss)
+        if target is None:
+            return
+        self._aim_at(target)
+
+        # Fire at the weapon's rate; an empty magazine triggers a reload
+        self._fire_timer += dt
+        if self._fire_timer >= self.fire_interval:
+            self._fire_timer = 0.0
+            if player.ammo <= 0:
+                self.press('r')
+            else:
+                self.press('left mouse down')
+                self.press('left mouse up')
+
+        self._grapple_timer += dt
+        if self._grapple_timer >= self.grapple_period:
+            self._grapple_timer = 0.0
+            self.press('e')
+
+    def _nearest(self, entities):
+        px, pz = self.player.x, self.player.z
+        best, best_distance = None, None
+        for entity in entities:
+            distance = (entity.x - px) ** 2 + (entity.z - pz) ** 2
+            if best is None or distance < best_distance:
+                best, best_distance = entity, distance
+        return best
+
+    def _aim_at(self, target):
+        player = self.player
+        dx, dz = target.x - player.x, target.z - player.z
+        dy = (target.y + 1) - (player.y + player.camera_pivot.y)
+        player.rotation_y = degrees(atan2(dx, dz))
+        player.camera_pivot.rotation_x = -degrees(atan2(dy, max((dx * dx + dz * dz) ** 0.5, 1e-6)))
+
+    def _close_in(self, boss):
+        """Walk toward a live boss until inside its attack range"""
+        closing = boss is not None and ((boss.x - self.player.x) ** 2 + (boss.z - self.player.z) ** 2) > self.boss_range ** 2
+        if closing != self._closing_in:
+            self.press('w' if closing else 'w up')
+            self._closing_in = closing
+
+
+class WaveRecorder:
+    """Per-wave frame times, entity counts, allocations and peak RSS"""
+    def __init__(self, counts):
+        self.counts = counts            # counts() -> {'enemies': n, ...} sampled every frame
+        self.waves = []
+        self._wave = None
+        self._start_wave(None)
+
+    def _start_wave(self, wave):
+        self._wave = wave
+        self._frame_times = []
+        self._peaks = {}
+        self._blocks = sys.getallocatedblocks()
+        self._collections = sum(stat['collections'] for stat in gc.get_stats())
+
+    def tick(self, wave, frame_time):
+        if wave != self._wave:
+            self.finish()
+            self._start_wave(wave)
+        self._frame_times.append(frame_time)
+        for name, value in self.counts().items():
+            if value > self._peaks.get(name, -1):
+                self._peaks[name] = value
+
+    def finish(self):
+        """Close the current wave's record (call once more at the end of the run)"""
+        if self._wave is None or not self._frame_times:
+            return
+        times = np.array(self._frame_times) * 1000
+        p50, p95, p99 = np.percentile(times, (50, 95, 99)).tolist()
+        self.waves.append({
+            'wave': self._wave,
+            'frames': len(times),
+            'frame_ms': {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3),
+                         'mean': round(float(times.mean()), 3), 'max': round(float(times.max()), 3)},
+            'peak_counts': dict(self._peaks),
+            'allocated_blocks_delta': sys.getallocatedblocks() - self._blocks,
+            'gc_collections': sum(stat['collections'] for stat in gc.get_stats()) - self._collections,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        })
+        self._frame_times = []
+
+    def write(self, path, meta=None):
+        with open(path, 'w') as f:
+            json.dump({'meta': meta or {}, 'waves': self.waves}, f, indent=2)
+        return path
@@ -0,0 +1,101 @@
+"""
+BVH ray query benchmark
+=======================
+Cost per ray as the number of boxes in the scene grows (100, 1,000, 5,000):
+
+  ursina       - ursina's raycast() against one box-collider Entity per box
+                 (what the grapple used to do)
+  brute        - one vectorized slab test over all boxes (no tree)
+  bvh          - BVH.raycast, one ray at a time
+  bvh batch    - BVH.raycast_many over all rays at once
+  masked       - BVH.raycast with a mask only half the boxes match
+
+Usage: python benchmarks/bench_bvh.py [--rays 500] [--counts 100 1000 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Ursina, Entity, Vec3, destroy, raycast, application
+
+if not getattr(application, 'base', None):
+    Ursina(window_type='none')
+
+import numpy as np
+
+from bvh import BVH, LAYER_STATIC, LAYER_GRAPPLE
+
+
+def random_boxes(rng, n):
+    extent = 10 * n ** 0.5  # Keep density roughly constant as the scene grows
+    for _ in range(n):
+        size = (rng.uniform(1, 8), rng.uniform(1, 12), rng.uniform(1, 8))
+        yield (rng.uniform(-extent, extent), size[1] / 2, rng.uniform(-extent, extent)), size
+
+
+def random_rays(rng, n, extent):
+    origins = np.array([(rng.uniform(-extent, extent), rng.uniform(1, 6), rng.uniform(-extent, extent)) for _ in range(n)])
+    directions = np.array([(rng.uniform(-1, 1), rng.uniform(-0.3, 0.3), rng.uniform(-1, 1)) for _ in range(n)])
+    directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+    return origins, directions
+
+
+def brute_raycast(mins, maxs, origin, direction, max_dist):
+    """Distance to the nearest box along a ray, testing every box (None if nothing is hit)"""
+    origin, direction = np.asarray(origin), np.asarray(direction)
+    inv = 1.0 / np.where(np.abs(direction) < 1e-12, 1e-12, direction)
+    t1 = (mins - origin) * inv
+    t2 = (maxs - origin) * inv
+    t_near = np.maximum(np.minimum(t1, t2).max(axis=1), 0.0)
+    t_far = np.maximum(t1, t2).min(axis=1)
+    hit = (t_near <= t_far) & (t_near <= max_dist)
+    return float(t_near[hit].min()) if hit.any() else None
+
+
+def per_ray_us(func, rays):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1e6 / rays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rays', type=int, default=500)
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 5000])
+    args = parser.parse_args()
+    max_dist = 50
+
+    print(f"{'boxes':>6} {'ursina us':>10} {'brute us':>9} {'bvh us':>7} {'bvh batch us':>13} {'masked us':>10}")
+    for n in args.counts:
+        rng = random.Random(n)
+        boxes = list(random_boxes(rng, n))
+        origins, directions = random_rays(rng, args.rays, 10 * n ** 0.5)
+        rays = list(zip(origins.tolist(), directions.tolist()))
+
+        entities = [Entity(model='cube', position=c, scale=s, collider='box') for c, s in boxes]
+        ursina_us = per_ray_us(lambda: [raycast(Vec3(*o), Vec3(*d), max_dist) for o, d in rays], args.rays)
+        for e in entities:
+            destroy(e)
+
+        tree = BVH()
+        for i, (c, s) in enumerate(boxes):
+            tree.add(i, c, s, LAYER_STATIC | (LAYER_GRAPPLE if i % 2 else 0))
+        tree.build()
+        centers = np.array([c for c, _ in boxes])
+        half = np.array([s for _, s in boxes]) / 2
+        mins, maxs = centers - half, centers + half
+
+        brute_us = per_ray_us(lambda: [brute_raycast(mins, maxs, o, d, max_dist) for o, d in rays], args.rays)
+        bvh_us = per_ray_us(lambda: [tree.raycast(o, d, max_dist) for o, d in rays], args.rays)
+        batch_us = per_ray_us(lambda: tree.raycast_many(origins, directions, max_dist), args.rays)
+        masked_us = per_ray_us(lambda: [tree.raycast(o, d, max_dist, LAYER_GRAPPLE) for o, d in rays], args.rays)
+        print(f'{n:>6} {ursina_us:>10.1f} {brute_us:>9.1f} {bvh_us:>7.1f} {batch_us:>13.1f} {masked_us:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Bullet collision benchmark
+==========================
+Per-frame cost of bullet-vs-enemy checks at 50, 200 and 1,000 live enemies:
+
+  intersects  - the old loop, bullet.intersects(e) for every pair (needs ursina)
+  brute       - same pairs, but sphere-vs-capsule math instead of Panda3D traversals
+  grid        - rebuild the SpatialHashGrid, then each bullet tests only nearby enemies
+  swept       - grid plus swept segment-vs-capsule over the distance each bullet
+                travelled this frame (80 units/s at a 0.1 s frame spike)
+
+Usage: python benchmarks/bench_collision.py [--bullets 30] [--intersects]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial import SpatialHashGrid, sphere_capsule_overlap, sweep_hits
+
+ARENA = 140
+ENEMY_COUNTS = [50, 200, 1000]
+
+
+class Target:
+    """Stand-in for an enemy base entity (position plus hit capsule)"""
+    def __init__(self, rng):
+        self.x = rng.uniform(-ARENA, ARENA)
+        self.y = 0.0
+        self.z = rng.uniform(-ARENA, ARENA)
+        self.hit_radius = rng.choice([0.7, 1.0, 0.8])
+        self.hit_height = rng.choice([2.3, 3.3, 1.0])
+
+
+def make_bullets(rng, n):
+    return [(rng.uniform(-ARENA, ARENA), rng.uniform(0.5, 2.5), rng.uniform(-ARENA, ARENA), 0.05) for _ in range(n)]
+
+
+def frame_brute(bullets, targets, grid):
+    hits = 0
+    for bx, by, bz, r in bullets:
+        for t in targets:
+            if sphere_capsule_overlap(bx, by, bz, r, t.x, t.y, t.z, t.hit_radius, t.hit_height):
+                hits += 1
+                break
+    return hits
+
+
+def frame_grid(bullets, targets, grid):
+    grid.clear()
+    for t in targets:
+        grid.insert(t, t.x, t.z, t.hit_radius)
+    hits = 0
+    for bx, by, bz, r in bullets:
+        for t in grid.query(bx, bz, r):
+            if sphere_capsule_overlap(bx, by, bz, r, t.x, t.y, t.z, t.hit_radius, t.hit_height):
+                hits += 1
+                break
+    return hits
+
+
+def frame_swept(bullets, targets, grid, step=8.0):
+    grid.clear()
+    for t in targets:
+        grid.insert(t, t.x, t.z, t.hit_radius)
+    segments = [(bx, by, bz - step, bx, by, bz, r) for bx, by, bz, r in bullets]
+    return sum(1 for hit in sweep_hits(grid, segments) if hit)
+
+
+def time_frames(func, frames, *args):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func(*args)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def bench_intersects(n_enemies, n_bullets, frames, rng):
+    """Old path: Panda3D collider traversal per bullet/enemy pair"""
+    from ursina import Ursina, Entity, application
+    if not getattr(application, 'base', None):
+        Ursina(window_type='none')
+    enemies = []
+    for t in (Target(rng) for _ in range(n_enemies)):
+        base = Entity(position=(t.x, t.y, t.z))
+        Entity(parent=base, model='cube', scale=(t.hit_radius * 2, t.hit_height, t.hit_radius * 2), y=t.hit_height / 2)
+        base.collider = 'box'
+        enemies.append(base)
+    bullets = [Entity(model='sphere', scale=0.1, position=(x, y, z), collider='sphere') for x, y, z, _ in make_bullets(rng, n_bullets)]
+
+    def frame():
+        for bullet in bullets:
+            for e in enemies:
+                if bullet.intersects(e).hit:
+                    break
+
+    result = time_frames(frame, frames)
+    for entity in enemies + bullets:
+        entity.enabled = False
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bullets', type=int, default=30, help='live bullets per frame (assault rifle keeps ~20-30 alive)')
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--intersects', action='store_true', help='also time the old Panda3D intersects() loop')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'enemies':>8} {'intersects ms':>14} {'brute ms':>10} {'grid ms':>10} {'swept ms':>10}")
+    for n in ENEMY_COUNTS:
+        targets = [Target(rng) for _ in range(n)]
+        bullets = make_bullets(rng, args.bullets)
+        grid = SpatialHashGrid(cell_size=4)
+        old = f'{bench_intersects(n, args.bullets, max(1, args.frames // 10), rng):.3f}' if args.intersects else 'skipped'
+        brute = time_frames(frame_brute, args.frames, bullets, targets, grid)
+        hashed = time_frames(frame_grid, args.frames, bullets, targets, grid)
+        swept = time_frames(frame_swept, args.frames, bullets, targets, grid)
+        print(f'{n:>8} {old:>14} {brute:>10.3f} {hashed:>10.3f} {swept:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Crowd steering benchmark
+========================
+Per-frame cost of separating the enemy horde, and how well it stays spread
+out. Agents start scattered on a ring around the player and chase it with
+EnemySimulation for --frames steps at 60 fps:
+
+  none      - seek only; agents converge and stack on each other
+  pairwise  - separation from an all-pairs n x n distance matrix
+  grid      - CrowdSteering (spatial.neighbour_pairs() + vectorized forces)
+
+  ms/frame  - average time of one EnemySimulation.step()
+  stacked   - share of agents with another agent within 0.5 m at the end
+
+Usage: python benchmarks/bench_crowd.py [--agents 100 500 2000] [--frames 600]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crowd import CrowdSteering
+from enemy_sim import EnemySimulation
+from spatial import neighbour_pairs
+
+
+class PairwiseSeparation(CrowdSteering):
+    """Separation only, from the full n x n distance matrix (the O(n^2) reference)"""
+    def steer(self, positions, headings):
+        offset = positions[:, np.newaxis, :] - positions[np.newaxis, :, :]
+        dist = np.sqrt((offset ** 2).sum(axis=2))
+        np.fill_diagonal(dist, np.inf)
+        weight = np.clip(1.0 - dist / self.radius, 0.0, 1.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            push = np.nan_to_num(offset / dist[..., np.newaxis]) * weight[..., np.newaxis]
+        self.pairs = int((weight > 0).sum()) // 2
+        return np.clip(self.separation * push.sum(axis=1), -self.max_push, self.max_push)
+
+
+class Agent:
+    """Stand-in for an enemy entity (the simulation only sets sim_index on it)"""
+    sim_index = None
+
+
+def stacked_share(positions, distance=0.5):
+    i, j = neighbour_pairs(positions[:, 0], positions[:, 1], distance)
+    return len(np.union1d(i, j)) / len(positions)
+
+
+def run(count, frames, crowd, seed=1):
+    rng = np.random.default_rng(seed)
+    sim = EnemySimulation(capacity=count, contact_range=0.0)  # No knockback, so agents pile up on the player
+    angle = rng.uniform(0, 2 * np.pi, count)
+    radius = rng.uniform(20, 60, count)
+    for a, r in zip(angle, radius):
+        sim.add(Agent(), (np.cos(a) * r, 0, np.sin(a) * r), rng.uniform(4.5, 10.5))
+    dt = 1 / 60
+    start = time.perf_counter()
+    for _ in range(frames):
+        sim.step(dt, (0, 0, 0), crowd=crowd)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / frames, stacked_share(sim.positions[:count][:, [0, 2]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--agents', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--pairwise-max', type=int, default=2000, help='Skip the n x n reference above this many agents')
+    args = parser.parse_args()
+
+    print(f"{'agents':>7} {'mode':>9} {'ms/frame':>9} {'stacked':>8} {'pairs':>7}")
+    for count in args.agents:
+        modes = {'none': None, 'grid': CrowdSteering(radius=1.6)}
+        if count <= args.pairwise_max:
+            modes['pairwise'] = PairwiseSeparation(radius=1.6)
+        for name, crowd in modes.items():
+            ms, stacked = run(count, args.frames, crowd)
+            pairs = crowd.pairs if crowd is not None else '-'
+            print(f'{count:>7} {name:>9} {ms:>9.3f} {stacked * 100:>7.1f}% {pairs:>7}')
+
+
+if __name__ == '__main__':
+    main()
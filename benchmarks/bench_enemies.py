@@ -0,0 +1,96 @@
+"""
+Enemy movement benchmark
+========================
+Per-frame cost of moving N enemies toward the player (50, 200 and 1,000),
+with a few of them in contact range every frame:
+
+  entity      - the old per-enemy loop (look_at, Vec3 seek, contact test and
+                knockback on every Entity, then a height snap)
+  sim step    - EnemySimulation.step alone (one vectorized NumPy step)
+  sim + sync  - step plus write_back onto the enemy entities
+
+Usage: python benchmarks/bench_enemies.py [--frames 60]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Ursina, Entity, Vec3, application
+
+if not getattr(application, 'base', None):
+    Ursina(window_type='none')
+
+import numpy as np
+
+from enemy_sim import EnemySimulation
+from terrain import Heightfield
+
+COUNTS = [50, 200, 1000]
+DT = 1 / 60
+PLAYER = Vec3(0, 0, 0)
+
+
+def spawn_positions(rng, n):
+    return [(rng.uniform(-60, 60), 0, rng.uniform(-60, 60)) for _ in range(n)]
+
+
+def old_frame(enemies, heightfield):
+    for e in enemies:
+        e.look_at(PLAYER)
+        direction = Vec3(PLAYER.x - e.x, 0, PLAYER.z - e.z).normalized()
+        e.position += direction * e.speed * DT
+        if (e.position - PLAYER).length() < 1.5:
+            push = Vec3(e.x - PLAYER.x, 0, e.z - PLAYER.z).normalized()
+            e.position += push * 15
+    ground = heightfield.heights_at(np.array([e.x for e in enemies]), np.array([e.z for e in enemies]))
+    for e, ground_y in zip(enemies, ground):
+        e.y = ground_y
+
+
+def time_frames(func, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=60)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    heightfield = Heightfield(rng.uniform(0, 3, (101, 101)), cell_size=4)
+
+    print(f"{'enemies':>8} {'entity ms':>10} {'sim step ms':>12} {'sim + sync ms':>14}")
+    for n in COUNTS:
+        positions = spawn_positions(random.Random(n), n)
+
+        enemies = [Entity(model='cube', position=p, speed=4) for p in positions]
+        old_ms = time_frames(lambda: old_frame(enemies, heightfield), args.frames)
+        for e in enemies:
+            e.enabled = False
+
+        enemies = [Entity(model='cube', position=p) for p in positions]
+        sim = EnemySimulation(capacity=n)
+        for e, p in zip(enemies, positions):
+            sim.add(e, p, 4)
+        step_ms = time_frames(lambda: sim.step(DT, PLAYER, heightfield), args.frames)
+
+        def sim_frame():
+            sim.step(DT, PLAYER, heightfield)
+            sim.write_back()
+
+        sync_ms = time_frames(sim_frame, args.frames)
+        for e in enemies:
+            e.enabled = False
+        print(f'{n:>8} {old_ms:>10.3f} {step_ms:>12.3f} {sync_ms:>14.3f}')
+
+
+if __name__ == '__main__':
+    main()
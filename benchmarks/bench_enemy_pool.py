@@ -0,0 +1,98 @@
+"""
+Enemy pool benchmark
+====================
+Cost of spawning and killing wave after wave of composite enemies (box
+collider, cached body model, billboard nameplate) the way game2.py does:
+
+  destroy  - a new enemy per spawn and destroy() on death (the old path)
+  pooled   - EnemyPool.acquire() per spawn and release() on death, after
+             prewarming the pool for the first wave
+
+  spawn ms - time to spawn one whole wave
+  kill ms  - time to remove one whole wave
+
+Usage: python benchmarks/bench_enemy_pool.py [--enemies 60] [--waves 10]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Ursina, Entity, Text, color, destroy, application
+
+if not getattr(application, 'base', None):
+    Ursina(window_type='none')
+
+from models import ModelCache
+from pools import EnemyPool
+
+TYPES = ['grunt', 'brute', 'crawler']
+STATS = {'grunt': dict(speed=7.5, health=50), 'brute': dict(speed=4.5, health=150), 'crawler': dict(speed=10.5, health=30)}
+
+
+def make_builder(scale):
+    def build():
+        enemy = Entity(model=None)
+        Entity(parent=enemy, model='cube', color=color.orange, scale=(0.8 * scale, 1.2 * scale, 0.6), position=(0, 1, 0))
+        Entity(parent=enemy, model='sphere', color=color.orange, scale=0.4 * scale, position=(0, 2, 0))
+        for x in (-0.6, 0.6, -0.2, 0.2):
+            Entity(parent=enemy, model='cube', color=color.orange, scale=(0.2, 0.8, 0.2), position=(x * scale, 0.8, 0))
+        return enemy
+    return build
+
+
+BUILDERS = {'grunt': make_builder(1.0), 'brute': make_builder(1.4), 'crawler': make_builder(0.7)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--enemies', type=int, default=60)
+    parser.add_argument('--waves', type=int, default=10)
+    args = parser.parse_args()
+
+    cache = ModelCache()
+
+    def create_enemy(enemy_type):
+        base = Entity(model=None, collider='box', enabled=False)
+        base.body = cache.instance(enemy_type, BUILDERS[enemy_type], parent=base)
+        base.nameplate = Text(text=enemy_type.upper(), world_parent=base, y=3, scale=1.5, color=color.white, billboard=True)
+        return base
+
+    def spawn_fresh(enemy_type, position):
+        enemy = create_enemy(enemy_type)
+        enemy.position = position
+        for name, value in STATS[enemy_type].items():
+            setattr(enemy, name, value)
+        enemy.enabled = True
+        return enemy
+
+    pool = EnemyPool(create_enemy)
+    pool.prewarm_step({enemy_type: args.enemies // len(TYPES) + 4 for enemy_type in TYPES}, limit=10 ** 6)
+
+    modes = {
+        'destroy': (spawn_fresh, destroy),
+        'pooled': (lambda enemy_type, position: pool.acquire(enemy_type, position, **STATS[enemy_type]), pool.release),
+    }
+    print(f"{'mode':>8} {'spawn ms':>9} {'kill ms':>8}")
+    for name, (spawn, kill) in modes.items():
+        rng = random.Random(1)
+        spawn_total = kill_total = 0.0
+        for _ in range(args.waves):
+            wave = [(rng.choice(TYPES), (rng.uniform(-140, 140), 0, rng.uniform(-140, 140))) for _ in range(args.enemies)]
+            start = time.perf_counter()
+            enemies = [spawn(enemy_type, position) for enemy_type, position in wave]
+            spawn_total += time.perf_counter() - start
+            start = time.perf_counter()
+            for enemy in enemies:
+                kill(enemy)
+            kill_total += time.perf_counter() - start
+        print(f'{name:>8} {spawn_total * 1000 / args.waves:>9.2f} {kill_total * 1000 / args.waves:>8.2f}')
+    print(f'pool: {pool.stats()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Flow field benchmark
+====================
+Cost of steering enemies around the level's walls and obstacles, on a
+layout like game2.py's (boundary walls, arena walls, corner walls, 50 random
+obstacles) with a 2.5 m grid:
+
+  astar     - one A* search per enemy to the player's cell (what per-enemy
+              pathfinding costs; only run up to --astar-max enemies)
+  field     - FlowField.directions_at() for every enemy (one array lookup)
+
+  recompute - time to rebuild the field after the player changes cells,
+              split into the per-frame update() slices game2.py runs
+
+Usage: python benchmarks/bench_flowfield.py [--enemies 100 500 2000] [--moves 20]
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flowfield import FlowField, NEIGHBOURS
+
+
+def build_level(field, rng):
+    for _ in range(50):
+        size = rng.uniform(2, 8)
+        field.add_box((rng.uniform(-140, 140), size, rng.uniform(-140, 140)), (size, size * 2, size))
+    for x, z, sx, sz in ((0, 150, 300, 2), (0, -150, 300, 2), (150, 0, 2, 300), (-150, 0, 2, 300),
+                         (0, 60, 80, 3), (0, -60, 80, 3), (60, 0, 3, 80), (-60, 0, 3, 80)):
+        field.add_box((x, 15, z), (sx, 30, sz))
+    for x in (-40, 40):
+        for z in (-40, 40):
+            field.add_box((x, 5, z), (40, 10, 2))
+            field.add_box((x, 5, z), (2, 10, 40))
+
+
+def astar(blocked, start, goal):
+    """Length of the 8-neighbour path from start to goal (None if unreachable)"""
+    res = blocked.shape[0]
+    gz, gx = goal
+    open_set = [(0.0, 0.0, start)]
+    best = {start: 0.0}
+    while open_set:
+        _, cost, cell = heapq.heappop(open_set)
+        if cell == goal:
+            return cost
+        if cost > best[cell]:
+            continue
+        z, x = cell
+        for dz, dx, step in NEIGHBOURS:
+            nz, nx = z + dz, x + dx
+            if not (0 <= nz < res and 0 <= nx < res) or blocked[nz, nx]:
+                continue
+            new_cost = cost + step
+            if new_cost < best.get((nz, nx), float('inf')):
+                best[(nz, nx)] = new_cost
+                ddz, ddx = abs(nz - gz), abs(nx - gx)
+                heuristic = max(ddz, ddx) + (2 ** 0.5 - 1) * min(ddz, ddx)
+                heapq.heappush(open_set, (new_cost + heuristic, new_cost, (nz, nx)))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--enemies', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--moves', type=int, default=20, help='Player cell changes to time the recompute over')
+    parser.add_argument('--iterations', type=int, default=16, help='Relaxation iterations per update() call')
+    parser.add_argument('--astar-max', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    field = FlowField(half_extent=150, cell_size=2.5, clearance=1.0)
+    build_level(field, rng)
+    free = np.argwhere(~field.blocked)
+
+    # Recompute after the player moves, one update() slice per frame
+    total, slices, worst = 0.0, 0, 0.0
+    for _ in range(args.moves + 1):
+        z, x = free[rng.randrange(len(free))]
+        field.set_target((x + 0.5) * field.cell_size - 150, (z + 0.5) * field.cell_size - 150)
+        first = not field.builds
+        while field.computing:
+            start = time.perf_counter()
+            field.update(args.iterations)
+            elapsed = time.perf_counter() - start
+            if not first:  # The first build also pays NumPy warm-up
+                total, slices, worst = total + elapsed, slices + 1, max(worst, elapsed)
+    print(f'grid {field.res}x{field.res}, {int(field.blocked.sum())} blocked cells')
+    print(f'recompute: {total * 1000 / args.moves:.2f} ms per player cell change over '
+          f'{slices / args.moves:.1f} frames, worst frame {worst * 1000:.2f} ms')
+
+    print(f"{'enemies':>8} {'astar ms':>9} {'field ms':>9}")
+    goal = field.target_cell
+    for count in args.enemies:
+        cells = free[np.array([rng.randrange(len(free)) for _ in range(count)])]
+        xs = (cells[:, 1] + 0.5) * field.cell_size - 150
+        zs = (cells[:, 0] + 0.5) * field.cell_size - 150
+
+        start = time.perf_counter()
+        for _ in range(100):
+            field.directions_at(xs, zs)
+        lookup_ms = (time.perf_counter() - start) * 1000 / 100
+
+        astar_ms = float('nan')
+        if count <= args.astar_max:
+            start = time.perf_counter()
+            for z, x in cells.tolist():
+                astar(field.blocked, (z, x), goal)
+            astar_ms = (time.perf_counter() - start) * 1000
+        print(f'{count:>8} {astar_ms:>9.2f} {lookup_ms:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
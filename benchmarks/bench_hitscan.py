@@ -0,0 +1,142 @@
+"""
+Hitscan vs projectile benchmark
+===============================
+Fires the assault rifle (10 shots/s) for a simulated stretch of play at a
+fixed 60 fps, once with projectile Bullets (one sphere Entity + collider per
+shot, destroyed after its 2 s lifetime) and once in hitscan mode (one ray query
+per shot plus a pooled tracer), and reports allocations per second:
+
+  entities/s   - scene-graph Entities created per simulated second
+  destroyed/s  - Entities destroyed per simulated second
+  peak KiB     - tracemalloc peak of Python allocations during the run
+  shot us      - wall time per shot including the frame updates
+
+Usage: python benchmarks/bench_hitscan.py [--seconds 20] [--enemies 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Ursina, Entity, Vec3, destroy, application
+
+if not getattr(application, 'base', None):
+    Ursina(window_type='none')
+
+from bvh import BVH, LAYER_STATIC, LAYER_ENEMY
+from spatial import SpatialHashGrid, sweep_hits
+from pools import TracerPool
+
+FPS = 60
+FIRE_RATE = 0.1
+BULLET_SPEED = 60
+BULLET_LIFETIME = 2
+
+
+class Target:
+    def __init__(self, rng):
+        self.x = rng.uniform(-60, 60)
+        self.y = 0.0
+        self.z = rng.uniform(5, 100)
+        self.hit_radius = 0.7
+        self.hit_height = 2.3
+        self.health = 10 ** 9
+
+
+def build_world(rng, n_enemies):
+    """Spatial grid of targets for bullet sweeps, and one BVH of targets and walls for hitscan rays"""
+    grid = SpatialHashGrid(cell_size=4)
+    tree = BVH()
+    for t in (Target(rng) for _ in range(n_enemies)):
+        grid.insert(t, t.x, t.z, t.hit_radius)
+        tree.add_bounds(t, (t.x - t.hit_radius, t.y, t.z - t.hit_radius),
+                        (t.x + t.hit_radius, t.y + t.hit_height, t.z + t.hit_radius), LAYER_ENEMY)
+    for _ in range(80):
+        size = rng.uniform(2, 8)
+        tree.add(None, (rng.uniform(-140, 140), size, rng.uniform(-140, 140)), (size, size * 2, size), LAYER_STATIC)
+    tree.build()
+    return grid, tree
+
+
+def run_projectiles(seconds, grid, tree, rng):
+    created = destroyed = 0
+    live = []
+    dt = 1 / FPS
+    shot_timer = 0
+    for _ in range(int(seconds * FPS)):
+        shot_timer += dt
+        if shot_timer >= FIRE_RATE:
+            shot_timer -= FIRE_RATE
+            direction = Vec3(rng.uniform(-0.3, 0.3), 0, 1).normalized()
+            bullet = Entity(model='sphere', scale=0.08, position=Vec3(0, 1.5, 0), collider='sphere')
+            bullet.direction = direction
+            bullet.timer = 0
+            bullet.last_position = bullet.position
+            live.append(bullet)
+            created += 1
+        segments = []
+        for bullet in live:
+            bullet.position += bullet.direction * BULLET_SPEED * dt
+            bullet.timer += dt
+            start, end = bullet.last_position, bullet.position
+            bullet.last_position = end
+            segments.append((start.x, start.y, start.z, end.x, end.y, end.z, 0.04))
+        sweep_hits(grid, segments)
+        for bullet in live[:]:
+            if bullet.timer >= BULLET_LIFETIME:
+                live.remove(bullet)
+                destroy(bullet)
+                destroyed += 1
+    for bullet in live:
+        destroy(bullet)
+    return created, destroyed
+
+
+def run_hitscan(seconds, grid, tree, rng, tracers):
+    dt = 1 / FPS
+    shot_timer = 0
+    origin = Vec3(0, 1.5, 0)
+    for _ in range(int(seconds * FPS)):
+        shot_timer += dt
+        if shot_timer >= FIRE_RATE:
+            shot_timer -= FIRE_RATE
+            direction = Vec3(rng.uniform(-0.3, 0.3), 0, 1).normalized()
+            hit = tree.raycast(origin, direction, 100, LAYER_STATIC | LAYER_ENEMY)
+            tracers.spawn(origin, origin + direction * (hit.distance if hit else 100))
+        tracers.update(dt)
+    return 0, 0
+
+
+def measure(name, func, seconds, *args):
+    shots = int(seconds / FIRE_RATE)
+    tracemalloc.start()
+    start = time.perf_counter()
+    created, destroyed = func(seconds, *args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name:>11} {created / seconds:>11.1f} {destroyed / seconds:>12.1f} {peak / 1024:>9.1f} {elapsed / shots * 1e6:>8.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--enemies', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    grid, tree = build_world(rng, args.enemies)
+    tracers = TracerPool(size=24)  # Allocated once up front, like the game does at load
+
+    print(f"{'mode':>11} {'entities/s':>11} {'destroyed/s':>12} {'peak KiB':>9} {'shot us':>8}")
+    measure('projectile', run_projectiles, args.seconds, grid, tree, random.Random(1))
+    measure('hitscan', run_hitscan, args.seconds, grid, tree, random.Random(1), tracers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Enemy model benchmark
+=====================
+Spawns a wave-20 horde (62 enemies: 5 per wave plus 3 for each wave after
+the first) into an offscreen window and renders it, once with the per-part
+enemy models (one child Entity per body part) and once with ModelCache's
+flattened archetypes:
+
+  spawn ms   - time to create the whole horde
+  nodes      - GeomNodes under render (each is at least one draw call)
+  frame ms   - mean time per rendered frame (CPU-side culling, state sorting
+               and draw submission; with a software GL this includes raster)
+
+Usage: python benchmarks/bench_models.py [--enemies 62] [--frames 60] [--target-ms 16.7]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from math import cos, sin, radians
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Ursina, Entity, color, destroy, application, camera
+
+if not getattr(application, 'base', None):
+    Ursina(window_type='offscreen', size=(640, 360))
+
+from models import ModelCache
+
+
+# Same part layout as create_grunt_model / create_crawler_model in game2.py
+def create_grunt_model():
+    enemy = Entity(model=None)
+    Entity(parent=enemy, model='cube', color=color.orange, scale=(0.8, 1.2, 0.6), position=(0, 1, 0))
+    Entity(parent=enemy, model='sphere', color=color.orange, scale=(0.4, 0.4, 0.4), position=(0, 2, 0))
+    Entity(parent=enemy, model='sphere', color=color.red, scale=(0.05, 0.05, 0.05), position=(-0.1, 2.1, 0.3))
+    Entity(parent=enemy, model='sphere', color=color.red, scale=(0.05, 0.05, 0.05), position=(0.1, 2.1, 0.3))
+    Entity(parent=enemy, model='cube', color=color.orange, scale=(0.2, 0.8, 0.2), position=(-0.6, 1.2, 0))
+    Entity(parent=enemy, model='cube', color=color.orange, scale=(0.2, 0.8, 0.2), position=(0.6, 1.2, 0))
+    Entity(parent=enemy, model='cube', color=color.orange, scale=(0.2, 0.8, 0.2), position=(-0.2, 0.4, 0))
+    Entity(parent=enemy, model='cube', color=color.orange, scale=(0.2, 0.8, 0.2), position=(0.2, 0.4, 0))
+    return enemy
+
+
+def create_crawler_model():
+    enemy = Entity(model=None)
+    Entity(parent=enemy, model='sphere', color=color.violet, scale=(1.2, 0.4, 0.8), position=(0, 0.4, 0))
+    Entity(parent=enemy, model='sphere', color=color.violet, scale=(0.3, 0.3, 0.3), position=(0, 0.8, 0.3))
+    Entity(parent=enemy, model='sphere', color=color.white, scale=(0.05, 0.05, 0.05), position=(-0.08, 0.85, 0.5))
+    Entity(parent=enemy, model='sphere', color=color.white, scale=(0.05, 0.05, 0.05), position=(0.08, 0.85, 0.5))
+    for i in range(6):
+        x, z = cos(radians(i * 60)) * 0.6, sin(radians(i * 60)) * 0.6
+        Entity(parent=enemy, model='sphere', color=color.violet, scale=(0.1, 0.3, 0.1), position=(x, 0.2, z))
+    return enemy
+
+
+BUILDERS = {'grunt': create_grunt_model, 'crawler': create_crawler_model}
+
+
+def spawn_horde(n, make_body):
+    rng = random.Random(20)
+    horde = []
+    for _ in range(n):
+        base = Entity(position=(rng.uniform(-15, 15), 0, rng.uniform(10, 40)))
+        kind = rng.choice(list(BUILDERS))
+        body = make_body(kind)
+        body.parent = base
+        horde.append(base)
+    return horde
+
+
+def render_frames(frames):
+    engine = application.base.graphicsEngine
+    engine.renderFrame()
+    start = time.perf_counter()
+    for _ in range(frames):
+        engine.renderFrame()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def measure(name, n, frames, make_body, target_ms):
+    start = time.perf_counter()
+    horde = spawn_horde(n, make_body)
+    spawn_ms = (time.perf_counter() - start) * 1000
+    nodes = len(application.base.render.findAllMatches('**/+GeomNode'))
+    frame_ms = render_frames(frames)
+    verdict = 'ok' if frame_ms <= target_ms else 'over'
+    print(f'{name:>10} {spawn_ms:>9.1f} {nodes:>6} {frame_ms:>9.2f} {verdict:>7}')
+    for base in horde:
+        destroy(base)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--enemies', type=int, default=62)
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--target-ms', type=float, default=1000 / 60)
+    args = parser.parse_args()
+
+    camera.position = (0, 10, -20)
+    camera.look_at((0, 0, 25))
+    cache = ModelCache()
+
+    print(f"{'models':>10} {'spawn ms':>9} {'nodes':>6} {'frame ms':>9} {'target':>7}")
+    measure('per-part', args.enemies, args.frames, lambda kind: BUILDERS[kind](), args.target_ms)
+    measure('cached', args.enemies, args.frames, lambda kind: cache.instance(kind, BUILDERS[kind]), args.target_ms)
+
+
+if __name__ == '__main__':
+    main()
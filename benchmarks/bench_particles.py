@@ -0,0 +1,136 @@
+"""
+Particle stress benchmark
+=========================
+Many bosses using their abilities at once. Every simulated second each boss
+fires a ground-slam shockwave, a magic burst, a teleport flash and a spray
+of 40 sparks, for a few seconds at a fixed 60 fps, rendered offscreen:
+
+  entity     - one sphere Entity per particle, animated in Python
+               (how effects were drawn before the batched emitters)
+  batched    - ParticleSystem: NumPy arrays and one quad mesh per emitter
+
+Columns are mean ms per frame for the simulation update alone, for update
+plus rendering, and the peak number of live particles.
+
+The entity mode gets very slow past ~50 bosses; use --batched-only for
+larger counts.
+
+Usage: python benchmarks/bench_particles.py [--bosses 10 50] [--seconds 3] [--batched-only]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Ursina, Entity, Vec3, color, destroy, application
+
+if not getattr(application, 'base', None):
+    Ursina(window_type='offscreen', size=(640, 360))
+
+from particles import ParticleSystem
+
+FPS = 60
+DT = 1 / FPS
+SPARKS = 40
+
+
+class EntityEffects:
+    """Entity-per-particle effects with the same rates as ParticleSystem"""
+    def __init__(self):
+        self.live = []
+
+    def _add(self, entity, lifetime, velocity=None, growth=None, shrink=None, fade=0):
+        self.live.append([entity, lifetime, velocity, growth, shrink, fade, 0])
+
+    def sparks(self, position, rng, count):
+        for _ in range(count):
+            e = Entity(model='sphere', color=color.blue, scale=0.1,
+                       position=position + Vec3(rng.uniform(-0.5, 0.5), 0, rng.uniform(-0.5, 0.5)))
+            self._add(e, 1.0, velocity=Vec3(rng.uniform(-2, 2), rng.uniform(1, 3), rng.uniform(-2, 2)), shrink=0.95)
+
+    def shockwave(self, position):
+        self._add(Entity(model='sphere', color=color.red, scale=(1, 0.1, 1), position=position, alpha=0.8),
+                  0.4, growth=Vec3(2, 0, 2), fade=2)
+
+    def burst(self, position):
+        self._add(Entity(model='sphere', color=color.cyan, scale=0.1, position=position), 0.5,
+                  growth=Vec3(5, 5, 5), fade=2)
+
+    def flash(self, position):
+        self._add(Entity(model='sphere', color=color.cyan, scale=3, position=position, alpha=0.8), 0.4, fade=2)
+
+    def update(self, dt):
+        for particle in self.live[:]:
+            entity, lifetime, velocity, growth, shrink, fade, timer = particle
+            particle[6] = timer = timer + dt
+            if timer >= lifetime:
+                destroy(entity)
+                self.live.remove(particle)
+                continue
+            if velocity is not None:
+                entity.position += velocity * dt
+            if growth is not None:
+                entity.scale += growth * dt
+            if shrink is not None:
+                entity.scale *= shrink ** (dt * 60)
+            if fade:
+                entity.alpha -= fade * dt
+
+    def __len__(self):
+        return len(self.live)
+
+
+def run(effects, bosses, seconds):
+    rng = random.Random(bosses)
+    positions = [Vec3(rng.uniform(-30, 30), 0, rng.uniform(20, 80)) for _ in range(bosses)]
+    engine = application.base.graphicsEngine
+    update_time = render_time = 0
+    peak = 0
+    frames = int(seconds * FPS)
+    for frame in range(frames):
+        start = time.perf_counter()
+        if frame % FPS == 0:
+            for p in positions:
+                effects.shockwave(p)
+                effects.burst(p + Vec3(0, 2, 0))
+                effects.flash(p + Vec3(0, 2, 0))
+                effects.sparks(p + Vec3(0, 1, 0), rng, SPARKS)
+        effects.update(DT)
+        mid = time.perf_counter()
+        engine.renderFrame()
+        end = time.perf_counter()
+        update_time += mid - start
+        render_time += end - mid
+        peak = max(peak, len(effects))
+    return update_time * 1000 / frames, (update_time + render_time) * 1000 / frames, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bosses', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--batched-only', action='store_true')
+    args = parser.parse_args()
+
+    print(f"{'bosses':>7} {'mode':>8} {'update ms':>10} {'frame ms':>9} {'peak live':>10}")
+    for bosses in args.bosses:
+        modes = [('batched', ParticleSystem())]
+        if not args.batched_only:
+            modes.insert(0, ('entity', EntityEffects()))
+        for name, effects in modes:
+            update_ms, frame_ms, peak = run(effects, bosses, args.seconds)
+            print(f'{bosses:>7} {name:>8} {update_ms:>10.2f} {frame_ms:>9.2f} {peak:>10}')
+            if name == 'entity':
+                for particle in effects.live:
+                    destroy(particle[0])
+            else:
+                effects.clear()
+                effects.update(DT)
+
+
+if __name__ == '__main__':
+    main()
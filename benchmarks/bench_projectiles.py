@@ -0,0 +1,103 @@
+"""
+Projectile simulation benchmark
+===============================
+Per-frame cost of moving N live projectiles (500, 1,000 and 2,000):
+
+  entity      - the old Bullet.update (Vec3 math on every Entity), run twice
+                per frame like ursina's automatic update plus the manual call
+  soa step    - ProjectileSystem.step + remove_expired (vectorized NumPy)
+  soa + sync  - step plus writing positions back onto the visual entities
+
+Usage: python benchmarks/bench_projectiles.py [--frames 60]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Ursina, Entity, Vec3, application
+
+if not getattr(application, 'base', None):
+    Ursina(window_type='none')
+
+from projectiles import ProjectileSystem
+
+COUNTS = [500, 1000, 2000]
+DT = 1 / 60
+PLAYER = Vec3(0, 0, 0)
+
+
+class OldBullet(Entity):
+    """The pre-SoA Bullet: state on the Entity, moved with Vec3 math"""
+    def __init__(self, position, direction):
+        super().__init__(model='sphere', scale=0.1, position=position)
+        self.direction = direction.normalized()
+        self.speed = 60
+        self.lifetime = 10 ** 9
+        self.timer = 0
+
+    def step(self):
+        self.position += self.direction * self.speed * DT
+        self.timer += DT
+        if self.timer >= self.lifetime or (self.position - PLAYER).length() > 10 ** 9:
+            pass
+
+
+def random_direction(rng):
+    return Vec3(rng.uniform(-1, 1), rng.uniform(-0.2, 0.2), rng.uniform(-1, 1))
+
+
+def time_frames(func, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'projectiles':>12} {'entity ms':>10} {'soa step ms':>12} {'soa + sync ms':>14}")
+    for n in COUNTS:
+        rng = random.Random(n)
+        old = [OldBullet(Vec3(0, 1.5, 0), random_direction(rng)) for _ in range(n)]
+
+        def old_frame():
+            for bullet in old:
+                bullet.step()  # ursina's automatic Bullet.update
+            for bullet in old:
+                bullet.step()  # ...and the second call from game2.update()
+
+        old_ms = time_frames(old_frame, args.frames)
+        for bullet in old:
+            bullet.enabled = False
+
+        visuals = [Entity(model='sphere', scale=0.1) for _ in range(n)]
+        system = ProjectileSystem(capacity=n)
+        for visual in visuals:
+            system.spawn((0, 1.5, 0), random_direction(rng), 60, 25, 0.05, lifetime=10 ** 9, visual=visual)
+
+        def soa_step():
+            system.step(DT)
+            system.remove_expired(PLAYER, 10 ** 9)
+
+        step_ms = time_frames(soa_step, args.frames)
+
+        def soa_frame():
+            soa_step()
+            system.sync_visuals()
+
+        sync_ms = time_frames(soa_frame, args.frames)
+        for visual in visuals:
+            visual.enabled = False
+        print(f'{n:>12} {old_ms:>10.3f} {step_ms:>12.3f} {sync_ms:>14.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Terrain startup benchmark
+=========================
+Compares the old per-vertex PerlinNoise loop against the NumPy terrain builder
+(cold, i.e. generating and writing the cache, and warm, i.e. loading the .npy)
+for terrain_res of 100, 256 and 512.
+
+Usage: python benchmarks/bench_terrain.py [--skip-legacy] [--res 100 256 512]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terrain import load_or_build_heightfield, build_terrain_arrays
+
+SEED = 1234
+
+
+def legacy_terrain(res):
+    """The original game2.py terrain loop"""
+    from perlin_noise import PerlinNoise
+    noise = PerlinNoise(octaves=4, seed=SEED)
+    verts = []
+    uvs = []
+    tris = []
+    for z in range(res):
+        for x in range(res):
+            y = noise([x/res*3, z/res*3]) * 3
+            verts.append((x - res//2, y, z - res//2))
+            uvs.append((x/res, z/res))
+    for z in range(res-1):
+        for x in range(res-1):
+            i = x + z*res
+            tris += [i, i+1, i+res, i+1, i+res+1, i+res]
+    return verts, uvs, tris
+
+
+def numpy_terrain(res, cache_dir):
+    heights = load_or_build_heightfield(SEED, res, octaves=4, amplitude=3, cache_dir=cache_dir)
+    return build_terrain_arrays(heights)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--res', type=int, nargs='+', default=[100, 256, 512])
+    parser.add_argument('--skip-legacy', action='store_true', help='skip the slow pure-Python loop')
+    args = parser.parse_args()
+
+    print(f"{'res':>6} {'legacy ms':>12} {'numpy cold ms':>14} {'numpy cached ms':>16}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for res in args.res:
+            legacy = 'skipped' if args.skip_legacy else f'{timed(legacy_terrain, res):.1f}'
+            cold = timed(numpy_terrain, res, cache_dir)
+            warm = timed(numpy_terrain, res, cache_dir)
+            print(f'{res:>6} {legacy:>12} {cold:>14.1f} {warm:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Wave benchmark suite
+====================
+Plays game2.py headlessly through waves 1-30 with the scripted bot from
+autoplay.py (strafing, firing at the nearest enemy, grappling, closing in on
+bosses) at a fixed timestep and seed, then prints per-wave frame-time
+percentiles, peak entity counts, allocation growth and peak RSS.
+
+The game runs in a child process (python game2.py --headless --bot ...) so
+peak RSS is the game's own. Results are written as JSON. With --baseline,
+each wave's p50/p95/p99 frame time and peak RSS are compared against a
+stored run and anything more than --tolerance slower (and at least
+--min-ms in absolute terms) is flagged; the exit code is 1 if anything
+regressed. Save a baseline with --save-baseline.
+
+Usage: python benchmarks/bench_waves.py [--waves 30] [--seed 1] [--out waves.json]
+                                        [--baseline base.json] [--save-baseline base.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMING_METRICS = ('p50', 'p95', 'p99')
+
+
+def run_game(args):
+    command = [sys.executable, os.path.join(ROOT, 'game2.py'), '--headless', '--bot',
+               '--waves', str(args.waves), '--seed', str(args.seed), '--dt', str(args.dt),
+               '--window', args.window, '--bot-weapon', args.weapon,
+               '--enemy-budget', str(args.enemy_budget), '--max-ticks', str(args.max_ticks), '--report', os.path.abspath(args.out)]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0 or not os.path.exists(args.out):
+        print(result.stdout[-4000:])
+        raise SystemExit(f'game2.py exited with code {result.returncode}')
+    for line in result.stdout.splitlines():
+        if line.startswith('[INFO] Headless run'):
+            print(line)
+    print(f'Run took {elapsed:.1f} s')
+    with open(args.out) as f:
+        return json.load(f)
+
+
+def print_report(report):
+    print(f"{'wave':>4} {'frames':>7} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7} "
+          f"{'enemies':>7} {'bosses':>6} {'proj':>5} {'entities':>8} {'blocks':>8} {'gc':>4} {'rss MB':>7}")
+    for wave in report['waves']:
+        times, peaks = wave['frame_ms'], wave['peak_counts']
+        print(f"{wave['wave']:>4} {wave['frames']:>7} {times['p50']:>7.2f} {times['p95']:>7.2f} {times['p99']:>7.2f} "
+              f"{times['max']:>7.2f} {peaks.get('enemies', 0):>7} {peaks.get('bosses', 0):>6} "
+              f"{peaks.get('projectiles', 0):>5} {peaks.get('entities', 0):>8} {wave['allocated_blocks_delta']:>8} "
+              f"{wave['gc_collections']:>4} {wave['peak_rss_mb']:>7.1f}")
+
+
+def compare(report, baseline, tolerance, min_ms):
+    """List of regression messages for waves present in both runs"""
+    same_run = all(report['meta'].get(key) == baseline['meta'].get(key) for key in ('seed', 'waves', 'dt', 'bot'))
+    if same_run and report['meta'].get('state') != baseline['meta'].get('state'):
+        print('[WARNING] Final game state differs from the baseline run; the workloads are not identical')
+    base_waves = {wave['wave']: wave for wave in baseline['waves']}
+    regressions = []
+    for wave in report['waves']:
+        base = base_waves.get(wave['wave'])
+        if base is None:
+            continue
+        for metric in TIMING_METRICS:
+            new, old = wave['frame_ms'][metric], base['frame_ms'][metric]
+            if new > old * (1 + tolerance) and new - old >= min_ms:
+                regressions.append(f"wave {wave['wave']}: {metric} {old:.2f} -> {new:.2f} ms (+{(new / old - 1) * 100:.0f}%)")
+        new, old = wave['peak_rss_mb'], base['peak_rss_mb']
+        if old and new > old * (1 + tolerance):
+            regressions.append(f"wave {wave['wave']}: peak RSS {old:.1f} -> {new:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--waves', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--dt', type=float, default=1 / 60)
+    parser.add_argument('--window', choices=('none', 'offscreen'), default='none')
+    parser.add_argument('--weapon', choices=('1', '2', '3'), default='3', help='Shop key of the weapon the bot buys')
+    parser.add_argument('--enemy-budget', type=int, default=60,
+                        help='Fixed alive-enemy cap (the adaptive budget depends on machine speed, so runs would differ)')
+    parser.add_argument('--max-ticks', type=int, default=600000)
+    parser.add_argument('--out', default='wave_benchmark.json')
+    parser.add_argument('--baseline', default=None, help='Compare against a stored result file')
+    parser.add_argument('--save-baseline', default=None, help='Copy this run to a baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed slowdown before flagging (0.15 = 15%%)')
+    parser.add_argument('--min-ms', type=float, default=0.25, help='Ignore differences smaller than this')
+    args = parser.parse_args()
+
+    report = run_game(args)
+    print_report(report)
+    if args.save_baseline:
+        shutil.copyfile(args.out, args.save_baseline)
+        print(f'Baseline saved to {args.save_baseline}')
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_ms)
+        if regressions:
+            print(f'{len(regressions)} regression(s) against {args.baseline}:')
+            for line in regressions:
+                print(f'  {line}')
+            sys.exit(1)
+        print(f'No regressions against {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
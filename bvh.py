@@ -0,0 +1,259 @@
+"""
+BOUNDING VOLUME HIERARCHY
+=========================
+Ray queries for game2.py that used to go through ursina's raycast(), which
+traverses every collider in the scene (enemy bodies, nameplates, loot).
+
+BVH is a binary tree of axis-aligned boxes built top-down by splitting at
+the median of the longest axis. Nodes live in flat NumPy arrays; each node
+also stores the OR of its items' layer bits, so a masked query (for example
+"grappleable only") skips whole subtrees that cannot match.
+
+The level gets one BVH built at load. Moving actors go in a second tree that
+is rebuilt from their current boxes whenever it is queried after they moved;
+with a few hundred actors a rebuild is cheaper than refitting in Python.
+
+raycast() walks the tree for one ray and returns the hit item, distance,
+point and surface normal. raycast_many() walks it once for a whole batch of
+rays, testing every ray still alive at a node in one vectorized slab test.
+"""
+
+import numpy as np
+
+# Layer bits for masked queries
+LAYER_STATIC = 1      # Level geometry that blocks sight and shots
+LAYER_GRAPPLE = 2     # Surfaces the grapple hook can attach to
+LAYER_ENEMY = 4
+LAYER_BOSS = 8
+LAYER_ALL = 0xFFFF
+
+LEAF_SIZE = 4
+
+
+class RayHit:
+    """Result of a BVH ray query"""
+    __slots__ = ('item', 'distance', 'point', 'normal')
+
+    def __init__(self, item, distance, point, normal):
+        self.item = item
+        self.distance = distance
+        self.point = point
+        self.normal = normal
+
+
+class BVH:
+    """Static binary AABB tree with per-node layer masks"""
+    def __init__(self):
+        self.items = []
+        self._mins = []
+        self._maxs = []
+        self._layers = []
+        self.node_count = 0
+
+    def add(self, item, center, size, layers=LAYER_STATIC):
+        """Add an axis-aligned box. Call build() once everything is added"""
+        cx, cy, cz = center
+        hx, hy, hz = (abs(s) / 2 for s in size)
+        self.add_bounds(item, (cx - hx, cy - hy, cz - hz), (cx + hx, cy + hy, cz + hz), layers)
+
+    def add_bounds(self, item, box_min, box_max, layers=LAYER_STATIC):
+        self.items.append(item)
+        self._mins.append(tuple(box_min))
+        self._maxs.append(tuple(box_max))
+        self._layers.append(layers)
+
+    def clear(self):
+        self.items = []
+        self._mins = []
+        self._maxs = []
+        self._layers = []
+        self.node_count = 0
+
+    def build(self):
+        """(Re)build the tree from the boxes added so far"""
+        self.build_from_arrays(self.items, np.array(self._mins, dtype=np.float64).reshape(-1, 3),
+                               np.array(self._maxs, dtype=np.float64).reshape(-1, 3),
+                               np.array(self._layers, dtype=np.int64))
+
+    def build_from_arrays(self, items, mins, maxs, layers):
+        """Build straight from (n, 3) min/max arrays, e.g. for actors each frame"""
+        n = len(items)
+        self.items = list(items)
+        self.box_min = mins
+        self.box_max = maxs
+        self.box_layers = layers
+        capacity = max(1, 2 * n)
+        self.node_min = np.zeros((capacity, 3))
+        self.node_max = np.zeros((capacity, 3))
+        self.node_layers = np.zeros(capacity, dtype=np.int64)
+        self.node_left = np.full(capacity, -1, dtype=np.int64)  # Right child is always left + 1
+        self.node_start = np.zeros(capacity, dtype=np.int64)
+        self.node_count_items = np.zeros(capacity, dtype=np.int64)
+        self.order = np.arange(n)
+        self.node_count = 0
+        self._nodes, self._boxes, self._order = [], [], []
+        if n == 0:
+            return
+        centers = (mins + maxs) * 0.5
+
+        self.node_count = 1
+        stack = [(0, 0, n)]
+        while stack:
+            node, start, end = stack.pop()
+            indices = self.order[start:end]
+            self.node_min[node] = mins[indices].min(axis=0)
+            self.node_max[node] = maxs[indices].max(axis=0)
+            self.node_layers[node] = np.bitwise_or.reduce(layers[indices])
+            count = end - start
+            if count <= LEAF_SIZE:
+                self.node_start[node] = start
+                self.node_count_items[node] = count
+                continue
+            # Median split on the longest axis of the centroid bounds
+            spread = centers[indices].max(axis=0) - centers[indices].min(axis=0)
+            axis = int(spread.argmax())
+            mid = count // 2
+            split = np.argpartition(centers[indices, axis], mid)
+            self.order[start:end] = indices[split]
+            left = self.node_count
+            self.node_left[node] = left
+            self.node_count += 2
+            stack.append((left, start, start + mid))
+            stack.append((left + 1, start + mid, end))
+
+        # Plain-list copies for the scalar single-ray walk (indexing NumPy per node is slow)
+        self._nodes = list(zip(self.node_min[:self.node_count].tolist(), self.node_max[:self.node_count].tolist(),
+                               self.node_layers[:self.node_count].tolist(), self.node_left[:self.node_count].tolist(),
+                               self.node_start[:self.node_count].tolist(), self.node_count_items[:self.node_count].tolist()))
+        self._boxes = list(zip(mins.tolist(), maxs.tolist(), layers.tolist()))
+        self._order = self.order.tolist()
+
+    def raycast(self, origin, direction, max_dist, mask=LAYER_ALL):
+        """Nearest box hit by one ray whose layers match mask. Returns a RayHit or None"""
+        if self.node_count == 0:
+            return None
+        ox, oy, oz = origin
+        dx, dy, dz = direction
+        ix = 1.0 / dx if abs(dx) > 1e-12 else 1e12
+        iy = 1.0 / dy if abs(dy) > 1e-12 else 1e12
+        iz = 1.0 / dz if abs(dz) > 1e-12 else 1e12
+        nodes, boxes, order = self._nodes, self._boxes, self._order
+        best_t, best_index = max_dist, -1
+
+        stack = [0]
+        while stack:
+            node_min, node_max, layers, left, start, count = nodes[stack.pop()]
+            if not layers & mask:
+                continue
+            t = _slab(ox, oy, oz, ix, iy, iz, node_min, node_max)
+            if t is None or t > best_t:
+                continue
+            if left >= 0:
+                stack.append(left)
+                stack.append(left + 1)
+                continue
+            for index in order[start:start + count]:
+                box_min, box_max, layers = boxes[index]
+                if not layers & mask:
+                    continue
+                t = _slab(ox, oy, oz, ix, iy, iz, box_min, box_max)
+                if t is not None and t <= best_t:
+                    best_t, best_index = t, index
+
+        if best_index < 0:
+            return None
+        point = (ox + dx * best_t, oy + dy * best_t, oz + dz * best_t)
+        normal = _box_normal(point, self.box_min[best_index], self.box_max[best_index])
+        return RayHit(self.items[best_index], best_t, point, normal)
+
+    def raycast_many(self, origins, directions, max_dist, mask=LAYER_ALL):
+        """Nearest hit for every ray in a batch
+
+        origins and directions are (n, 3) arrays. Returns (indices, distances)
+        where indices[i] is the hit box index (-1 for a miss) and distances[i]
+        is the hit distance (max_dist for a miss). Use hits_from_batch() to
+        turn those into RayHits.
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        n = len(origins)
+        best_t = np.full(n, float(max_dist))
+        best_index = np.full(n, -1, dtype=np.int64)
+        if self.node_count == 0 or n == 0:
+            return best_index, best_t
+        inv = 1.0 / np.where(np.abs(directions) < 1e-12, 1e-12, directions)
+
+        stack = [(0, np.arange(n))]
+        while stack:
+            node, rays = stack.pop()
+            if not self.node_layers[node] & mask:
+                continue
+            t = _slab_many(origins[rays], inv[rays], self.node_min[node], self.node_max[node])
+            rays = rays[t <= best_t[rays]]
+            if not len(rays):
+                continue
+            left = self.node_left[node]
+            if left >= 0:
+                stack.append((left, rays))
+                stack.append((left + 1, rays))
+                continue
+            start = self.node_start[node]
+            for index in self.order[start:start + self.node_count_items[node]]:
+                if not self.box_layers[index] & mask:
+                    continue
+                t = _slab_many(origins[rays], inv[rays], self.box_min[index], self.box_max[index])
+                closer = t <= best_t[rays]
+                best_t[rays[closer]] = t[closer]
+                best_index[rays[closer]] = index
+        return best_index, best_t
+
+    def hits_from_batch(self, origins, directions, indices, distances):
+        """RayHit (or None) per ray from raycast_many() results"""
+        hits = []
+        for origin, direction, index, t in zip(np.asarray(origins).tolist(), np.asarray(directions).tolist(),
+                                              indices.tolist(), distances.tolist()):
+            if index < 0:
+                hits.append(None)
+                continue
+            point = tuple(o + d * t for o, d in zip(origin, direction))
+            hits.append(RayHit(self.items[index], t, point, _box_normal(point, self.box_min[index], self.box_max[index])))
+        return hits
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _slab(ox, oy, oz, ix, iy, iz, box_min, box_max):
+    """Entry distance of a ray into a box (0 if it starts inside), or None"""
+    t1, t2 = (box_min[0] - ox) * ix, (box_max[0] - ox) * ix
+    near, far = (t1, t2) if t1 < t2 else (t2, t1)
+    t1, t2 = (box_min[1] - oy) * iy, (box_max[1] - oy) * iy
+    if t1 > t2:
+        t1, t2 = t2, t1
+    near, far = max(near, t1), min(far, t2)
+    t1, t2 = (box_min[2] - oz) * iz, (box_max[2] - oz) * iz
+    if t1 > t2:
+        t1, t2 = t2, t1
+    near, far = max(near, t1, 0.0), min(far, t2)
+    return near if near <= far else None
+
+
+def _slab_many(origins, inv, box_min, box_max):
+    """Entry distance of every ray into one box (inf for a miss)"""
+    t1 = (box_min - origins) * inv
+    t2 = (box_max - origins) * inv
+    near = np.maximum(np.minimum(t1, t2).max(axis=1), 0.0)
+    far = np.maximum(t1, t2).min(axis=1)
+    return np.where(near <= far, near, np.inf)
+
+
+def _box_normal(point, box_min, box_max):
+    """Outward normal of the box face closest to a point on its surface"""
+    best, normal = None, (0.0, 1.0, 0.0)
+    for axis in range(3):
+        for bound, sign in ((box_min[axis], -1.0), (box_max[axis], 1.0)):
+            gap = abs(point[axis] - bound)
+            if best is None or gap < best:
+                best = gap
+                normal = tuple(sign if i == axis else 0.0 for i in range(3))
+    return normal
@@ -0,0 +1,87 @@
+"""
+CROWD STEERING
+==============
+Keeps the enemy horde in game2.py from collapsing onto a single point while
+it chases the player. Every frame the close pairs of enemies come from
+spatial.neighbour_pairs() (a sorted cell grid, not an all-pairs check), and
+two forces are summed over those pairs in one vectorized pass:
+
+  separation - pushes overlapping enemies apart, harder the more they overlap
+  avoidance  - an enemy with a neighbour ahead of it sidesteps, perpendicular
+               to its heading, toward the side the neighbour is not on, and
+               slows down (queues) the more its way is blocked, so the
+               back of a crowd doesn't compress the front into a pile
+
+steer() returns a velocity per enemy in units of its own speed, which
+EnemySimulation adds to its seek velocity. Enemies standing exactly on top
+of each other are split apart along a fixed per-index direction, so results
+stay deterministic.
+"""
+
+import numpy as np
+
+from spatial import neighbour_pairs
+
+GOLDEN_ANGLE = np.pi * (3 - 5 ** 0.5)
+
+
+class CrowdSteering:
+    """Separation and avoidance for agents on the ground plane, from grid neighbour pairs"""
+    def __init__(self, radius=1.6, separation=2.0, avoidance=0.75, max_push=1.5):
+        self.radius = radius            # Agents closer than this (centre to centre) interact
+        self.separation = separation
+        self.avoidance = avoidance
+        self.max_push = max_push        # Cap on the combined steering, in units of speed
+        # Instrumentation
+        self.pairs = 0
+
+    def steer(self, positions, headings):
+        """(n, 2) steering velocity for (n, 2) x/z positions and unit headings"""
+        n = len(positions)
+        xs, zs = positions[:, 0], positions[:, 1]
+        i, j = neighbour_pairs(xs, zs, self.radius)
+        self.pairs = len(i)
+        if not len(i):
+            return np.zeros((n, 2))
+
+        # Unit offset from j to i; coincident agents get a fixed direction from their index
+        offset = positions[i] - positions[j]
+        dist = np.sqrt(np.einsum('ij,ij->i', offset, offset))
+        stacked = dist < 1e-6
+        if stacked.any():
+            angle = i[stacked] * GOLDEN_ANGLE
+            offset[stacked] = np.column_stack((np.cos(angle), np.sin(angle)))
+            dist[stacked] = 1.0
+        away = offset / dist[:, np.newaxis]
+        weight = np.clip(1.0 - np.where(stacked, 0.0, dist) / self.radius, 0.0, 1.0)
+
+        # Separation: equal and opposite pushes along the offset
+        push = away * weight[:, np.newaxis]
+        force = np.zeros((n, 2))
+        for axis in (0, 1):
+            force[:, axis] = self.separation * (np.bincount(i, push[:, axis], n) - np.bincount(j, push[:, axis], n))
+
+        # Avoidance: sidestep a neighbour that is ahead, away from the side it is on,
+        # and brake in proportion to how squarely the way ahead is blocked
+        blocked = np.zeros(n)
+        for me, to_other in ((i, -away), (j, away)):
+            heading = headings[me]
+            facing = np.einsum('ij,ij->i', heading, to_other)
+            ahead = facing > 0
+            if not ahead.any():
+                continue
+            side = np.column_stack((-heading[:, 1], heading[:, 0]))
+            sign = np.where(np.einsum('ij,ij->i', side, to_other) > 0, -1.0, 1.0)
+            sidestep = side * (sign * weight * ahead)[:, np.newaxis]
+            for axis in (0, 1):
+                force[:, axis] += self.avoidance * np.bincount(me, sidestep[:, axis], n)
+            blocked += np.bincount(me, weight * facing * ahead, n)
+        force -= headings * np.minimum(blocked, 1.0)[:, np.newaxis]
+
+        length = np.sqrt(np.einsum('ij,ij->i', force, force))
+        over = length > self.max_push
+        force[over] *= (self.max_push / length[over])[:, np.newaxis]
+        return force
+
+    def stats(self):
+        return {'radius': self.radius, 'pairs': self.pairs}
@@ -0,0 +1,69 @@
+"""
+DEBUG OVERLAY
+=============
+Persistent F3 overlay for game2.py. One Text entity is created up front and
+reused; its contents are rebuilt from registered sections at a throttled
+rate (a few times per second) while the overlay is shown. When it is hidden
+update() returns immediately, so the overlay costs nothing when disabled.
+
+A section is a title and a function returning either a dict (shown as
+"key: value" lines) or a list of lines.
+"""
+
+from ursina import Text, color
+
+
+class DebugOverlay:
+    """Reusable debug text panel built from named sections"""
+    def __init__(self, position=(0.45, -0.05), scale=0.7, interval=0.25):
+        self.interval = interval
+        self.sections = []
+        self.text = Text(text='', position=position, scale=scale, color=color.yellow, enabled=False)
+        self.enabled = False
+        self._timer = 0.0
+        self._frame_time = 0.0
+        self._frames = 0
+
+    def add_section(self, title, source):
+        self.sections.append((title, source))
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.text.enabled = enabled
+        self._timer = self.interval  # Refresh on the first update after showing
+        self._frame_time = 0.0
+        self._frames = 0
+
+    @property
+    def average_frame_ms(self):
+        return self._frame_time * 1000 / self._frames if self._frames else 0.0
+
+    def update(self, dt):
+        if not self.enabled:
+            return
+        self._frame_time += dt
+        self._frames += 1
+        self._timer += dt
+        if self._timer < self.interval:
+            return
+        self._timer = 0.0
+        self.text.text = self.render()
+        self._frame_time = 0.0
+        self._frames = 0
+
+    def render(self):
+        lines = []
+        for title, source in self.sections:
+            try:
+                content = source()
+            except Exception as section_error:
+                content = [f'<{section_error}>']
+            lines.append(f'[{title}]')
+            if isinstance(content, dict):
+                lines.extend(f'  {key}: {value}' for key, value in content.items())
+            else:
+                lines.extend(f'  {line}' for line in content)
+        return '\n'.join(lines)
@@ -0,0 +1,159 @@
+"""
+ENEMY SIMULATION
+================
+Struct-of-arrays movement core for the enemy horde in game2.py. Positions,
+vertical velocities, speeds and archetypes live in contiguous NumPy arrays;
+seeking the player, contact checks, knockback, launch and landing on the
+terrain are computed for every enemy in one vectorized step, and the results
+are written back onto the enemy entities in a single pass afterwards.
+
+Health, nameplates and models stay on the entities themselves. Each
+registered entity gets a sim_index attribute pointing at its row; removal
+swaps the last row into the gap and updates that entity's index.
+
+With a flow field (flowfield.py), enemies steer along its per-cell direction
+around walls and obstacles, and only seek the player in a straight line when
+they are within direct_range of the player or stand in a cell the field has
+no direction for. With crowd steering (crowd.py), separation and avoidance
+from nearby enemies are added on top of the seek, so the horde spreads out
+instead of stacking on one point.
+"""
+
+import numpy as np
+
+# Archetype codes for the types array
+ENEMY_TYPES = {'grunt': 0, 'brute': 1, 'crawler': 2}
+
+
+class EnemySimulation:
+    """Vectorized seek / contact / knockback for all live enemies"""
+    def __init__(self, capacity=128, contact_range=1.5, knockback=15, launch_height=10, gravity=30, direct_range=5):
+        self.contact_range = contact_range
+        self.direct_range = direct_range  # Closer than this, ignore the flow field and seek directly
+        self.knockback = knockback
+        self.gravity = gravity
+        # Initial upward speed that peaks launch_height above the ground
+        self.launch_speed = np.sqrt(2 * gravity * launch_height)
+        self.count = 0
+        self.entities = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 3))
+        self.velocity_y = np.zeros(capacity)
+        self.speeds = np.zeros(capacity)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.yaw = np.zeros(capacity)
+
+    def _grow(self):
+        n = self.count
+        old = (self.positions, self.velocity_y, self.speeds, self.types, self.yaw)
+        self._allocate(self.capacity * 2)
+        for src, dst in zip(old, (self.positions, self.velocity_y, self.speeds, self.types, self.yaw)):
+            dst[:n] = src[:n]
+
+    def add(self, entity, position, speed, enemy_type='grunt'):
+        """Register an enemy entity with the simulation"""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.positions[i] = (position[0], position[1], position[2])
+        self.velocity_y[i] = 0
+        self.speeds[i] = speed
+        self.types[i] = ENEMY_TYPES.get(enemy_type, 0)
+        self.yaw[i] = 0
+        entity.sim_index = i
+        self.entities.append(entity)
+        self.count += 1
+
+    def remove(self, entity):
+        """Unregister an enemy (swap-with-last)"""
+        i = getattr(entity, 'sim_index', None)
+        if i is None or i >= self.count or self.entities[i] is not entity:
+            return
+        last = self.count - 1
+        if i != last:
+            for array in (self.positions, self.velocity_y, self.speeds, self.types, self.yaw):
+                array[i] = array[last]
+            moved = self.entities[last]
+            self.entities[i] = moved
+            moved.sim_index = i
+        self.entities.pop()
+        entity.sim_index = None
+        self.count -= 1
+
+    def clear(self):
+        for entity in self.entities:
+            entity.sim_index = None
+        self.entities.clear()
+        self.count = 0
+
+    def set_speed(self, entity, speed):
+        if getattr(entity, 'sim_index', None) is not None:
+            self.speeds[entity.sim_index] = speed
+
+    def step(self, dt, player_position, heightfield=None, flow_field=None, crowd=None):
+        """Advance every enemy by dt. Returns the entities that touched the player this step"""
+        n = self.count
+        if n == 0:
+            return []
+        pos = self.positions[:n]
+        player = np.array((player_position[0], player_position[1], player_position[2]))
+
+        # Seek the player on the ground plane
+        to_player = player[[0, 2]] - pos[:, [0, 2]]
+        dist = np.sqrt(np.einsum('ij,ij->i', to_player, to_player))
+        safe = np.where(dist > 1e-9, dist, 1.0)
+        seek = to_player / safe[:, np.newaxis]
+        seek[dist <= 1e-9] = 0
+        if flow_field is not None:
+            flow = flow_field.directions_at(pos[:, 0], pos[:, 2])
+            follow = (dist > self.direct_range) & flow.any(axis=1)
+            seek[follow] = flow[follow]
+        step = np.minimum(self.speeds[:n] * dt, dist)
+        move = seek * step[:, np.newaxis]
+        if crowd is not None:
+            move += crowd.steer(pos[:, [0, 2]], seek) * (self.speeds[:n] * dt)[:, np.newaxis]
+        pos[:, 0] += move[:, 0]
+        pos[:, 2] += move[:, 1]
+        self.yaw[:n] = np.degrees(np.arctan2(seek[:, 0], seek[:, 1]))
+
+        # Contact with the player: knock back along the ground and launch upward
+        offset = pos - player
+        touching = np.einsum('ij,ij->i', offset, offset) < self.contact_range * self.contact_range
+        if touching.any():
+            push = offset[touching][:, [0, 2]]
+            push_len = np.sqrt(np.einsum('ij,ij->i', push, push))
+            push_len[push_len < 1e-9] = 1.0
+            push /= push_len[:, np.newaxis]
+            pos[touching, 0] += push[:, 0] * self.knockback
+            pos[touching, 2] += push[:, 1] * self.knockback
+            self.velocity_y[:n][touching] = self.launch_speed
+
+        # Gravity and landing on the terrain
+        vy = self.velocity_y[:n]
+        if heightfield is not None:
+            ground = heightfield.heights_at(pos[:, 0], pos[:, 2])
+        else:
+            ground = np.zeros(n)
+        airborne = (vy != 0) | (pos[:, 1] > ground)
+        vy[airborne] -= self.gravity * dt
+        pos[:, 1] += vy * dt
+        landed = pos[:, 1] <= ground
+        pos[landed, 1] = ground[landed]
+        vy[landed] = 0
+
+        if not touching.any():
+            return []
+        return [self.entities[i] for i in np.flatnonzero(touching)]
+
+    def write_back(self):
+        """Copy simulated transforms onto the enemy entities"""
+        n = self.count
+        for entity, (x, y, z), yaw in zip(self.entities, self.positions[:n].tolist(), self.yaw[:n].tolist()):
+            entity.setPos(x, y, z)
+            entity.setH(-yaw)  # ursina's rotation_y is Panda3D's heading negated
+
+    def __len__(self):
+        return self.count
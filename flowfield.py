@@ -0,0 +1,161 @@
+"""
+FLOW FIELD
+==========
+Shared pathfinding for the enemy horde in game2.py. Instead of a path per
+enemy, the arena is rasterized into a grid of walkable and blocked cells
+(level boxes that stand on the ground, grown by a clearance margin), and one
+distance field to the player's cell is computed over it. Every walkable cell
+then stores the direction that leads downhill in that field, so an enemy's
+steering is one array lookup at its cell and the pathing cost doesn't grow
+with the number of enemies.
+
+Distances use 8-neighbour moves (1 straight, sqrt(2) diagonal) and are
+computed by vectorized frontier relaxation: each iteration relaxes the
+neighbours of every cell that improved in the previous one, working on flat
+indices into a grid padded with a blocked border so no bounds checks are
+needed. A field is only recomputed when the player moves to a different
+cell, and the work is spread over frames (update() runs a fixed number of
+iterations). Enemies keep following the last finished field until the new
+one is done; if the player moves again meanwhile, the latest cell is
+computed next.
+
+Cells with no direction (blocked, unreachable, or the player's own cell)
+return (0, 0); callers fall back to seeking the player directly there.
+"""
+
+import numpy as np
+
+SQRT2 = 2 ** 0.5
+# (dz, dx, cost) for the 8 neighbours
+NEIGHBOURS = [(dz, dx, SQRT2 if dz and dx else 1.0)
+              for dz in (-1, 0, 1) for dx in (-1, 0, 1) if dz or dx]
+NEIGHBOUR_COSTS = np.array([cost for _, _, cost in NEIGHBOURS])
+
+
+class FlowField:
+    """Grid distance field toward one target cell, with per-cell steering directions"""
+    def __init__(self, half_extent=150, cell_size=2.5, clearance=1.0, max_height=2.0):
+        self.half_extent = half_extent
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self.max_height = max_height  # Boxes whose bottom is above this don't block walking (platforms)
+        self.res = int(np.ceil(2 * half_extent / cell_size))
+        self.blocked = np.zeros((self.res, self.res), dtype=bool)
+        self.distance = np.full((self.res, self.res), np.inf)
+        self.directions = np.zeros((self.res, self.res, 2))
+        self.target_cell = None     # Cell of the finished field
+        self._pending_cell = None   # Latest requested cell not yet computed
+        self._work = None           # (cell, flat padded distances, frontier indices) while computing
+        # Instrumentation
+        self.builds = 0
+        self.iterations = 0
+
+    # === Grid ===
+    def cell_of(self, x, z):
+        ix = int((x + self.half_extent) // self.cell_size)
+        iz = int((z + self.half_extent) // self.cell_size)
+        return min(max(iz, 0), self.res - 1), min(max(ix, 0), self.res - 1)
+
+    def add_box(self, center, size):
+        """Mark the footprint of a box as blocked if it stands on the ground"""
+        cx, cy, cz = center
+        sx, sy, sz = (abs(s) for s in size)
+        if cy - sy / 2 > self.max_height:
+            return
+        hx, hz = sx / 2 + self.clearance, sz / 2 + self.clearance
+        x0, z0 = self.cell_of(cx - hx, cz - hz)[1], self.cell_of(cx - hx, cz - hz)[0]
+        x1, z1 = self.cell_of(cx + hx, cz + hz)[1], self.cell_of(cx + hx, cz + hz)[0]
+        self.blocked[z0:z1 + 1, x0:x1 + 1] = True
+
+    # === Field computation ===
+    def set_target(self, x, z):
+        """Request a field toward the cell containing (x, z); no-op if it is already current"""
+        cell = self.cell_of(x, z)
+        if self.blocked[cell]:
+            return  # Standing on blocked ground (on top of a box); keep the previous field
+        if cell == self.target_cell and self._work is None:
+            return
+        if self._work is not None and self._work[0] == cell:
+            self._pending_cell = None
+            return
+        self._pending_cell = cell if cell != self.target_cell else None
+        if self._work is None and self._pending_cell is not None:
+            self._start(self._pending_cell)
+
+    def _start(self, cell):
+        width = self.res + 2
+        distances = np.full(width * width, np.inf)
+        start = (cell[0] + 1) * width + cell[1] + 1
+        distances[start] = 0.0
+        self._work = (cell, distances, np.array([start]))
+        self._pending_cell = None
+
+    def update(self, iterations=16):
+        """Advance the field being computed; returns True when a new field was finished"""
+        if self._work is None:
+            return False
+        cell, distances, frontier = self._work
+        width = self.res + 2
+        free = np.pad(~self.blocked, 1).ravel()  # Border cells count as blocked
+        offsets = np.array([dz * width + dx for dz, dx, _ in NEIGHBOURS])
+        for _ in range(iterations):
+            if not len(frontier):
+                break
+            neighbours = (frontier[:, np.newaxis] + offsets).ravel()
+            candidates = (distances[frontier][:, np.newaxis] + NEIGHBOUR_COSTS).ravel()
+            better = free[neighbours] & (candidates < distances[neighbours])
+            neighbours, candidates = neighbours[better], candidates[better]
+            np.minimum.at(distances, neighbours, candidates)
+            frontier = np.unique(neighbours)
+            self.iterations += 1
+        self._work = (cell, distances, frontier)
+        if len(frontier):
+            return False
+
+        self.distance = distances.reshape(width, width)[1:-1, 1:-1].copy()
+        self.directions = self._directions(self.distance)
+        self.target_cell = cell
+        self.builds += 1
+        self._work = None
+        if self._pending_cell is not None:
+            self._start(self._pending_cell)
+        return True
+
+    def _directions(self, distances):
+        """Per-cell unit vector (x, z) toward lower distance, weighted by how much lower"""
+        res = self.res
+        padded = np.full((res + 2, res + 2), np.inf)
+        padded[1:-1, 1:-1] = distances
+        reachable = np.isfinite(distances)
+        directions = np.zeros((res, res, 2))
+        for dz, dx, cost in NEIGHBOURS:
+            neighbour = padded[1 + dz:1 + dz + res, 1 + dx:1 + dx + res]
+            with np.errstate(invalid='ignore'):
+                gain = (distances - neighbour) / cost
+            gain = np.where(reachable & np.isfinite(neighbour) & (gain > 0), gain, 0.0)
+            directions[..., 0] += gain * (dx / cost)
+            directions[..., 1] += gain * (dz / cost)
+        length = np.linalg.norm(directions, axis=2)
+        nonzero = length > 1e-9
+        directions[nonzero] /= length[nonzero][:, np.newaxis]
+        return directions
+
+    # === Queries ===
+    def directions_at(self, xs, zs):
+        """(n, 2) steering directions (x, z) for positions; (0, 0) where there is none"""
+        ix = np.clip(((np.asarray(xs) + self.half_extent) // self.cell_size).astype(np.intp), 0, self.res - 1)
+        iz = np.clip(((np.asarray(zs) + self.half_extent) // self.cell_size).astype(np.intp), 0, self.res - 1)
+        return self.directions[iz, ix]
+
+    @property
+    def computing(self):
+        return self._work is not None
+
+    def stats(self):
+        return {
+            'cells': self.res * self.res,
+            'blocked': int(self.blocked.sum()),
+            'builds': self.builds,
+            'iterations': self.iterations,
+            'computing': self.computing,
+        }
@@ -1,11 +1,61 @@
 from ursina import *
 from ursina.prefabs.first_person_controller import FirstPersonController
-import os, random
+import atexit, os, zlib
+import numpy as np
 from ursina.shaders import basic_lighting_shader
-from perlin_noise import PerlinNoise
-from math import cos, sin, radians
-
-app = Ursina()
+from terrain import load_or_build_heightfield, build_terrain_arrays, Heightfield
+from spatial import SpatialHashGrid, WallIndex, sweep_hits
+from pools import TracerPool, BulletPool, EnemyPool
+from projectiles import ProjectileSystem
+from enemy_sim import EnemySimulation
+from flowfield import FlowField
+from crowd import CrowdSteering
+from models import ModelCache
+from static_world import StaticWorld
+from particles import ParticleSystem
+from scheduler import Scheduler
+from spawn_director import SpawnDirector
+from hud import Hud, quantize
+from debug_overlay import DebugOverlay
+from profiler import FrameProfiler
+from rng import RandomService
+from autoplay import ScriptedBot, WaveRecorder
+from headless import parse_args, load_input_script, detach_mouse, set_up_camera_lens, use_fixed_timestep, HeadlessRunner
+from bvh import BVH, RayHit, LAYER_STATIC, LAYER_GRAPPLE, LAYER_ENEMY, LAYER_BOSS
+from math import cos, sin, radians, ceil
+
+# --headless runs the same game loop without an on-screen window (see headless.py)
+launch_options = parse_args()
+HEADLESS = launch_options.headless
+if HEADLESS:
+    app = Ursina(window_type=launch_options.window)
+    detach_mouse()
+    if launch_options.window == 'none':
+        set_up_camera_lens()
+    use_fixed_timestep(launch_options.dt)
+else:
+    app = Ursina()
+    if launch_options.fixed_timestep:
+        use_fixed_timestep(launch_options.dt, real_time=True)
+
+# === Color Compatibility ===
+# Color names used below that newer ursina releases no longer define
+for color_name, fallback in (('purple', (128, 0, 128)), ('dark_purple', (75, 0, 110)),
+                             ('dark_blue', (0, 0, 139)), ('dark_brown', (92, 64, 51))):
+    if not hasattr(color, color_name):
+        setattr(color, color_name, color.rgb32(*fallback))
+
+# === Random Streams ===
+# Every gameplay roll draws from a stream derived from one run seed (--seed),
+# so a seed and an input script reproduce the same run
+random_service = RandomService(launch_options.seed)
+terrain_rng = random_service.stream('terrain')
+level_rng = random_service.stream('level')
+spawn_rng = random_service.stream('spawns')
+loot_rng = random_service.stream('loot')
+boss_rng = random_service.stream('bosses')
+effect_rng = random_service.stream('effects')
+print(f"[INFO] Random seed: {random_service.seed}")
 # window.icon = None  # Commented out to avoid TypeError
 
 # === Safe Audio Loader ===
@@ -54,7 +104,6 @@ player = None
 gun = None
 enemies = []
 bosses = []
-bullets = []
 powerups = []
 boss_attack_indicators = []
 enemy_kills = 0
@@ -74,28 +123,20 @@ perk_choices = []
 Sky()
 
 # --- Procedural Bumpy Terrain ---
+# Heightfield is generated with NumPy and cached on disk per seed/resolution (see terrain.py)
 terrain_size = 300
 terrain_res = 100
-noise = PerlinNoise(octaves=4, seed=random.randint(0,10000))
-verts = []
-uvs = []
-tris = []
-for z in range(terrain_res):
-    for x in range(terrain_res):
-        y = noise([x/terrain_res*3, z/terrain_res*3]) * 3  # Reduced from 8 to 3 for smoother terrain
-        verts.append((x - terrain_res//2, y, z - terrain_res//2))
-        uvs.append((x/terrain_res, z/terrain_res))
-for z in range(terrain_res-1):
-    for x in range(terrain_res-1):
-        i = x + z*terrain_res
-        tris += [i, i+1, i+terrain_res, i+1, i+terrain_res+1, i+terrain_res]
+terrain_seed = terrain_rng.randint(1,10000)
+terrain_heights = load_or_build_heightfield(terrain_seed, terrain_res, octaves=4, amplitude=3)  # Reduced from 8 to 3 for smoother terrain
+verts, uvs, tris = build_terrain_arrays(terrain_heights)
 terrain = Entity(
     model=Mesh(vertices=verts, triangles=tris, uvs=uvs, mode='triangle'),
     texture='grass',
-    collider='box',  # Changed from 'mesh' to 'box' for better collision detection
     scale=(terrain_size/(terrain_res-1),1,terrain_size/(terrain_res-1)),
     shader=basic_lighting_shader
 )
+# Ground collision and height queries use the heightfield instead of a box/mesh collider
+terrain_heightfield = Heightfield(terrain_heights, cell_size=terrain_size/(terrain_res-1))
 
 # Add a flat ground plane as backup to prevent falling through
 ground_plane = Entity(
@@ -109,19 +150,27 @@ ground_plane = Entity(
 
 DirectionalLight().look_at(Vec3(1, -1, -1))
 
+# === Static Level Geometry ===
+# Every box below is static, so the level is batched into a few merged meshes
+# and colliders (static_world.py) instead of one Entity per box
+static_world = StaticWorld()
+
 # Add obstacles and cover
+obstacles = []
 for _ in range(50):
-    size = random.uniform(2, 8)
-    Entity(model='cube', color=color.gray, scale=(size, size * 2, size), 
-           position=(random.uniform(-140, 140), size, random.uniform(-140, 140)), collider='box')
+    size = level_rng.uniform(2, 8)
+    obstacles.append(static_world.add(scale=(size, size * 2, size), color=color.gray,
+           position=(level_rng.uniform(-140, 140), size, level_rng.uniform(-140, 140))))
 
 # Add boundary walls to prevent falling off
 wall_height = 10
 wall_thickness = 2
-Entity(model='cube', color=color.dark_gray, scale=(300, wall_height, wall_thickness), position=(0, wall_height/2, 150), collider='box')
-Entity(model='cube', color=color.dark_gray, scale=(300, wall_height, wall_thickness), position=(0, wall_height/2, -150), collider='box')
-Entity(model='cube', color=color.dark_gray, scale=(wall_thickness, wall_height, 300), position=(150, wall_height/2, 0), collider='box')
-Entity(model='cube', color=color.dark_gray, scale=(wall_thickness, wall_height, 300), position=(-150, wall_height/2, 0), collider='box')
+boundary_walls = [
+    static_world.add(color=color.dark_gray, scale=(300, wall_height, wall_thickness), position=(0, wall_height/2, 150)),
+    static_world.add(color=color.dark_gray, scale=(300, wall_height, wall_thickness), position=(0, wall_height/2, -150)),
+    static_world.add(color=color.dark_gray, scale=(wall_thickness, wall_height, 300), position=(150, wall_height/2, 0)),
+    static_world.add(color=color.dark_gray, scale=(wall_thickness, wall_height, 300), position=(-150, wall_height/2, 0)),
+]
 
 # === Large Walls for Wall Running and Grappling ===
 # Create massive walls for Titanfall-style movement
@@ -133,45 +182,37 @@ arena_wall_length = 80
 arena_wall_thickness = 3
 
 # North wall
-north_wall = Entity(
-    model='cube', 
+north_wall = static_world.add(
     color=color.gray, 
     scale=(arena_wall_length, arena_wall_height, arena_wall_thickness), 
     position=(0, arena_wall_height/2, 60), 
-    collider='box',
     texture='white_cube'
 )
 wall_run_walls.append(north_wall)
 
 # South wall
-south_wall = Entity(
-    model='cube', 
+south_wall = static_world.add(
     color=color.gray, 
     scale=(arena_wall_length, arena_wall_height, arena_wall_thickness), 
     position=(0, arena_wall_height/2, -60), 
-    collider='box',
     texture='white_cube'
 )
 wall_run_walls.append(south_wall)
 
 # East wall
-east_wall = Entity(
-    model='cube', 
+east_wall = static_world.add(
     color=color.gray, 
     scale=(arena_wall_thickness, arena_wall_height, arena_wall_length), 
     position=(60, arena_wall_height/2, 0), 
-    collider='box',
     texture='white_cube'
 )
 wall_run_walls.append(east_wall)
 
 # West wall
-west_wall = Entity(
-    model='cube', 
+west_wall = static_world.add(
     color=color.gray, 
     scale=(arena_wall_thickness, arena_wall_height, arena_wall_length), 
     position=(-60, arena_wall_height/2, 0), 
-    collider='box',
     texture='white_cube'
 )
 wall_run_walls.append(west_wall)
@@ -182,14 +223,14 @@ corner_wall_length = 40
 
 # Corner walls
 corner_walls = [
-    Entity(model='cube', color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(40, corner_wall_height/2, 40), collider='box'),
-    Entity(model='cube', color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(40, corner_wall_height/2, 40), collider='box'),
-    Entity(model='cube', color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(-40, corner_wall_height/2, 40), collider='box'),
-    Entity(model='cube', color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(-40, corner_wall_height/2, 40), collider='box'),
-    Entity(model='cube', color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(40, corner_wall_height/2, -40), collider='box'),
-    Entity(model='cube', color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(40, corner_wall_height/2, -40), collider='box'),
-    Entity(model='cube', color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(-40, corner_wall_height/2, -40), collider='box'),
-    Entity(model='cube', color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(-40, corner_wall_height/2, -40), collider='box'),
+    static_world.add(color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(40, corner_wall_height/2, 40)),
+    static_world.add(color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(40, corner_wall_height/2, 40)),
+    static_world.add(color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(-40, corner_wall_height/2, 40)),
+    static_world.add(color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(-40, corner_wall_height/2, 40)),
+    static_world.add(color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(40, corner_wall_height/2, -40)),
+    static_world.add(color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(40, corner_wall_height/2, -40)),
+    static_world.add(color=color.dark_gray, scale=(corner_wall_length, corner_wall_height, 2), position=(-40, corner_wall_height/2, -40)),
+    static_world.add(color=color.dark_gray, scale=(2, corner_wall_height, corner_wall_length), position=(-40, corner_wall_height/2, -40)),
 ]
 
 wall_run_walls.extend(corner_walls)
@@ -202,15 +243,70 @@ platform_positions = [
 ]
 
 for pos in platform_positions:
-    platform = Entity(
-        model='cube',
+    platform = static_world.add(
         color=color.light_gray,
         scale=(8, 1, 8),
-        position=pos,
-        collider='box'
+        position=pos
     )
     wall_run_walls.append(platform)
 
+# Merge everything above into batched meshes and colliders
+static_before, static_after = static_world.build()
+print(f"[INFO] Static level: {len(static_world.boxes)} boxes batched into {len(static_world.batches)} meshes - "
+      f"draw calls ~{static_before['draw_calls']} (estimated, one per box) -> {static_after['draw_calls']}, "
+      f"nodes ~{static_before['nodes']} (estimated) -> {static_after['nodes']}")
+
+# === Ray Query Index ===
+# Ray queries for hitscan, grapple and line of sight: level boxes in a static
+# BVH, enemies and bosses in a second tree rebuilt on demand after they move
+level_bvh = BVH()
+for static_box in static_world.boxes:
+    level_bvh.add(static_box, static_box.world_position, static_box.world_scale, LAYER_STATIC | LAYER_GRAPPLE)
+level_bvh.build()
+actor_bvh = BVH()
+actor_bvh_items = set()  # Entities currently in actor_bvh, to tell actor hits from level hits
+actor_bvh_dirty = True
+
+# === Enemy Pathing ===
+# One flow field toward the player over the whole arena; enemies steer by
+# looking up their cell instead of walking straight through walls
+flow_field = FlowField(half_extent=150, cell_size=2.5, clearance=1.0)
+for static_box in static_world.boxes:
+    flow_field.add_box(static_box.world_position, static_box.world_scale)
+print(f"[INFO] Flow field: {flow_field.res}x{flow_field.res} cells, {flow_field.stats()['blocked']} blocked")
+
+# === Inventory System ===
+class Inventory:
+    def __init__(self, max_size=20):
+        self.items = []
+        self.max_size = max_size
+        self.equipped_weapon = None
+        self.equipped_armor = None
+    
+    def add_item(self, item):
+        if len(self.items) < self.max_size:
+            self.items.append(item)
+            return True
+        return False
+    
+    def remove_item(self, item):
+        if item in self.items:
+            self.items.remove(item)
+            return True
+        return False
+    
+    def get_items_by_type(self, item_type):
+        return [item for item in self.items if item['type'] == item_type]
+    
+    def sort_items(self, sort_by='rarity'):
+        if sort_by == 'rarity':
+            rarity_order = {'common': 0, 'uncommon': 1, 'rare': 2, 'legendary': 3}
+            self.items.sort(key=lambda x: rarity_order.get(x.get('rarity', 'common'), 0))
+        elif sort_by == 'type':
+            self.items.sort(key=lambda x: x.get('type', ''))
+        elif sort_by == 'name':
+            self.items.sort(key=lambda x: x.get('name', ''))
+
 # === Player ===
 player = FirstPersonController()
 player.gravity = 0.8  # Increased gravity to prevent getting stuck on slopes
@@ -260,6 +356,11 @@ player.jump_count = 0
 player.wall_detection_range = 3.0  # Increased range for easier detection
 player.wall_run_angle_threshold = 30  # Reduced angle threshold for easier wall running
 
+# Side faces of every runnable wall, for wall-run detection
+wall_index = WallIndex(reach=player.wall_detection_range)
+for wall in wall_run_walls:
+    wall_index.add_box(wall, wall.world_position, wall.world_scale)
+
 # === HUD ===
 health_bar = Text(text='Health: 100', position=(-0.85, 0.45), scale=1.5)
 ammo_bar = Text(text='Ammo: 10/10', position=(-0.85, 0.38), scale=1.5)
@@ -276,6 +377,71 @@ movement_text = Text(text='', position=(0.7, 0.38), scale=1.0, color=color.cyan)
 grapple_cooldown_text = Text(text='', position=(0.7, 0.31), scale=1.0, color=color.orange)
 wall_run_text = Text(text='', position=(0.7, 0.24), scale=1.0, color=color.green)
 
+# HUD widgets bound to the values they show; text is only rebuilt when a value changes
+hud = Hud()
+hud.bind(health_bar, lambda: int(player.health), lambda v: f'Health: {v}')
+hud.bind(ammo_bar, lambda: (player.ammo, player.max_ammo), lambda v: f'Ammo: {v[0]}/{v[1]}')
+hud.bind(score_text, lambda: player.score, lambda v: f'Score: {v}')
+hud.bind(wave_text, lambda: wave, lambda v: f'Wave: {v}')
+hud.bind(money_text, lambda: player.money, lambda v: f'Money: ${v}')
+hud.bind(weapon_text, lambda: weapons[player.current_weapon]["name"], lambda v: f'Weapon: {v}')
+hud.bind(wall_run_text,
+         lambda: quantize(player.wall_run_duration - player.wall_run_timer) if player.is_wall_running else None,
+         lambda v: (f'Wall Running: {v:.1f}s', color.green) if v is not None else ('Press W near walls to wall run', color.gray))
+hud.bind(movement_text, lambda: player.is_grappling,
+         lambda v: ('Grappling!', color.yellow) if v else ('Press E to grapple to cursor', color.cyan))
+hud.bind(grapple_cooldown_text, lambda: quantize(player.grapple_cooldown) if player.grapple_cooldown > 0 else None,
+         lambda v: (f'Grapple Cooldown: {v:.1f}s', color.red) if v is not None else ('Grapple Ready', color.green))
+
+# === Frame Profiler ===
+# Section timings for update(); on while the debug overlay is shown, or for the
+# whole run when GAME2_PROFILE names a .json/.csv file to write at exit
+profile_path = os.environ.get('GAME2_PROFILE')
+profiler = FrameProfiler(window=600, enabled=bool(profile_path))
+
+def dump_profile():
+    try:
+        print(f"[INFO] Frame profile written to {profiler.dump(profile_path)}")
+    except Exception as profile_error:
+        print(f"[ERROR 1008] Could not write frame profile: {profile_error}")
+
+if profile_path:
+    atexit.register(dump_profile)
+
+# === Debug Overlay (F3) ===
+# One persistent panel, refreshed a few times per second while shown
+debug_overlay = DebugOverlay()
+debug_overlay.add_section('Player', lambda: {
+    'pos': tuple(round(v, 1) for v in player.position),
+    'speed': player.speed,
+    'health': int(player.health),
+    'wall running': player.is_wall_running,
+    'grappling': player.is_grappling,
+})
+debug_overlay.add_section('Entities', lambda: {
+    'enemies': len(enemies),
+    'bosses': len(bosses),
+    'projectiles': len(projectiles),
+    'particles': len(particles),
+    'loot': len(loot_items_world),
+    'scene': len(scene.entities),
+})
+debug_overlay.add_section('Frame', lambda: {
+    'frame': f'{debug_overlay.average_frame_ms:.1f} ms',
+    'fps': round(1000 / debug_overlay.average_frame_ms) if debug_overlay.average_frame_ms else 0,
+})
+debug_overlay.add_section('update() p50 / p95 / p99', profiler.overlay_lines)
+debug_overlay.add_section('Spawns', lambda: spawn_director.stats())
+debug_overlay.add_section('Pathing', lambda: {**flow_field.stats(), 'crowd pairs': crowd.pairs})
+debug_overlay.add_section('Pools', lambda: {
+    'bullets': bullet_pool.stats(),
+    'enemies': enemy_pool.stats(),
+    'tracers': tracer_pool.active,
+    'models': model_cache.stats(),
+    'scheduler': scheduler.pending,
+    'hud rebuilds/s': hud.stats()['rebuilds_per_second'],
+})
+
 # === Movement Instructions ===
 instructions_text = Text(
     text='Movement: WASD=Move, SPACE=Jump/Double Jump, E=Grapple to Cursor, W+Wall=Wall Run, SHIFT=Slide\nMouse=Look Around (M=Toggle Mouse Lock), F3=Debug Mode, K=Show All Controls, I=Inventory', 
@@ -291,7 +457,6 @@ crosshair_v = Entity(parent=camera.ui, model='quad', texture='white_cube', scale
 crosshair_dot = Entity(parent=camera.ui, model='sphere', scale=0.003, color=color.red, position=(0, 0, 0.6))
 
 # === Game State ===
-bullets = []
 enemies = []
 wave = 1
 enemy_kills = 0
@@ -312,7 +477,10 @@ weapons = {
         'ammo_capacity': 12,
         'reload_time': 2.0,
         'description': 'Basic sidearm. Reliable and accurate.',
-        'model': 'pistol'
+        'model': 'pistol',
+        'color': color.gray,
+        'bullet_size': 0.1,
+        'bullet_speed': 50
     },
     'assault_rifle': {
         'name': 'Assault Rifle',
@@ -321,8 +489,12 @@ weapons = {
         'fire_rate': 0.1,
         'ammo_capacity': 30,
         'reload_time': 2.5,
+        'hitscan': True,  # Resolved as an instant ray query instead of a Bullet entity
         'description': 'High rate of fire. Good for crowd control.',
-        'model': 'assault_rifle'
+        'model': 'assault_rifle',
+        'color': color.dark_gray,
+        'bullet_size': 0.08,
+        'bullet_speed': 60
     },
     'laser': {
         'name': 'Laser Rifle',
@@ -332,7 +504,10 @@ weapons = {
         'ammo_capacity': 20,
         'reload_time': 3.0,
         'description': 'High damage energy weapon. Pierces enemies.',
-        'model': 'laser'
+        'model': 'laser',
+        'color': color.cyan,
+        'bullet_size': 0.06,
+        'bullet_speed': 80
     }
 }
 
@@ -501,37 +676,19 @@ loot_items = {
     }
 }
 
-# === Inventory System ===
-class Inventory:
-    def __init__(self, max_size=20):
-        self.items = []
-        self.max_size = max_size
-        self.equipped_weapon = None
-        self.equipped_armor = None
-    
-    def add_item(self, item):
-        if len(self.items) < self.max_size:
-            self.items.append(item)
-            return True
-        return False
-    
-    def remove_item(self, item):
-        if item in self.items:
-            self.items.remove(item)
-            return True
-        return False
-    
-    def get_items_by_type(self, item_type):
-        return [item for item in self.items if item['type'] == item_type]
-    
-    def sort_items(self, sort_by='rarity'):
-        if sort_by == 'rarity':
-            rarity_order = {'common': 0, 'uncommon': 1, 'rare': 2, 'legendary': 3}
-            self.items.sort(key=lambda x: rarity_order.get(x.get('rarity', 'common'), 0))
-        elif sort_by == 'type':
-            self.items.sort(key=lambda x: x.get('type', ''))
-        elif sort_by == 'name':
-            self.items.sort(key=lambda x: x.get('name', ''))
+# === Scheduler ===
+# Delayed callbacks and per-frame tweens, driven once per frame from update()
+scheduler = Scheduler()
+
+# === Spawn Director ===
+# Wave spawns are queued and trickled in under a cap on enemies alive at once.
+# The adaptive budget follows wall-clock frame time, so it is only used in the
+# normal windowed game; headless and fixed-timestep runs keep a fixed budget
+# and stay reproducible for a given seed
+adaptive_budget = launch_options.enemy_budget is None and not (HEADLESS or launch_options.fixed_timestep)
+spawn_director = SpawnDirector(budget=launch_options.enemy_budget or 60,
+                               adaptive=adaptive_budget,
+                               target_ms=launch_options.frame_target_ms)
 
 # === Loot Drop System ===
 def drop_loot(position, enemy_type='normal', is_boss=False):
@@ -540,35 +697,35 @@ def drop_loot(position, enemy_type='normal', is_boss=False):
     
     if is_boss:
         # Bosses always drop loot
-        num_drops = random.randint(2, 4)  # 2-4 items
+        num_drops = loot_rng.randint(2, 4)  # 2-4 items
         for _ in range(num_drops):
             # Higher chance for rare/legendary items
-            rarity_roll = random.random()
+            rarity_roll = loot_rng.random()
             if rarity_roll < 0.1:  # 10% legendary
-                possible_items = [item for item in loot_items.values() if item['rarity'] == 'legendary']
+                possible_items = [key for key, item in loot_items.items() if item['rarity'] == 'legendary']
             elif rarity_roll < 0.3:  # 20% rare
-                possible_items = [item for item in loot_items.values() if item['rarity'] == 'rare']
+                possible_items = [key for key, item in loot_items.items() if item['rarity'] == 'rare']
             elif rarity_roll < 0.6:  # 30% uncommon
-                possible_items = [item for item in loot_items.values() if item['rarity'] == 'uncommon']
+                possible_items = [key for key, item in loot_items.items() if item['rarity'] == 'uncommon']
             else:  # 40% common
-                possible_items = [item for item in loot_items.values() if item['rarity'] == 'common']
+                possible_items = [key for key, item in loot_items.items() if item['rarity'] == 'common']
             
             if possible_items:
-                item_key = random.choice(list(possible_items))
+                item_key = loot_rng.choice(list(possible_items))
                 dropped_items.append(create_loot_entity(position, item_key))
     else:
         # Normal enemies have a chance to drop loot
-        if random.random() < 0.15:  # 15% chance for normal enemies
-            rarity_roll = random.random()
+        if loot_rng.random() < 0.15:  # 15% chance for normal enemies
+            rarity_roll = loot_rng.random()
             if rarity_roll < 0.05:  # 5% rare
-                possible_items = [item for item in loot_items.values() if item['rarity'] == 'rare']
+                possible_items = [key for key, item in loot_items.items() if item['rarity'] == 'rare']
             elif rarity_roll < 0.2:  # 15% uncommon
-                possible_items = [item for item in loot_items.values() if item['rarity'] == 'uncommon']
+                possible_items = [key for key, item in loot_items.items() if item['rarity'] == 'uncommon']
             else:  # 80% common
-                possible_items = [item for item in loot_items.values() if item['rarity'] == 'common']
+                possible_items = [key for key, item in loot_items.items() if item['rarity'] == 'common']
             
             if possible_items:
-                item_key = random.choice(list(possible_items))
+                item_key = loot_rng.choice(list(possible_items))
                 dropped_items.append(create_loot_entity(position, item_key))
     
     return dropped_items
@@ -581,7 +738,7 @@ def create_loot_entity(position, item_key):
     loot_entity = Entity(
         model=item_data['model'],
         color=item_data['color'],
-        position=position + Vec3(0, 1, 0),  # Slightly above ground
+        position=Vec3(position.x, terrain_heightfield.height_at(position.x, position.z) + 1, position.z),  # Slightly above ground
         scale=0.5,
         collider='sphere'
     )
@@ -590,12 +747,12 @@ def create_loot_entity(position, item_key):
     loot_entity.item_data = item_data
     loot_entity.item_key = item_key
     
-    # Add floating animation
-    def float_animation():
-        loot_entity.y += sin(time.time() * 2) * 0.1
-        invoke(float_animation, delay=0.05)
+    # Add floating animation (stops by itself once the loot is destroyed)
+    base_y = loot_entity.y
+    def float_animation(dt):
+        loot_entity.y = base_y + sin(scheduler.time * 2) * 0.25  # Simulated time, so seeded runs bob identically
     
-    float_animation()
+    scheduler.each_frame(float_animation, owner=loot_entity)
     
     # Add glow effect for rare items
     if item_data['rarity'] in ['rare', 'legendary']:
@@ -608,11 +765,10 @@ def create_loot_entity(position, item_key):
         )
         loot_entity.glow = glow
         
-        def glow_animation():
-            glow.alpha = 0.3 + sin(time.time() * 3) * 0.2
-            invoke(glow_animation, delay=0.05)
+        def glow_animation(dt):
+            glow.alpha = 0.3 + sin(scheduler.time * 3) * 0.2
         
-        glow_animation()
+        scheduler.each_frame(glow_animation, owner=glow)
     
     return loot_entity
 
@@ -657,7 +813,7 @@ def apply_consumable_effect(item_data):
             player.speed = original_speed
             print("Speed boost expired")
         
-        invoke(restore_speed, delay=30)
+        scheduler.after(30, restore_speed)
     elif effect == 'damage_boost_temp':
         # Temporary damage boost (would need to be implemented in weapon system)
         print(f"Used {item_data['name']}: Damage Boost for 30 seconds")
@@ -665,7 +821,7 @@ def apply_consumable_effect(item_data):
 def apply_currency_effect(item_data):
     """Apply the effect of a currency item"""
     if item_data['effect'] == 'random_money':
-        money_amount = random.randint(100, 500)
+        money_amount = loot_rng.randint(100, 500)
         player.money += money_amount
         print(f"Found {item_data['name']}: +${money_amount}")
 
@@ -812,7 +968,7 @@ def create_titan_boss_model():
     # Helmet
     Entity(parent=boss, model='sphere', color=color.dark_gray, scale=(0.8, 0.8, 0.8), position=(0, 4.5, 0))
     # Helmet visor
-    Entity(parent=boss, model='cube', color=color.red, scale=(0.6, 0.2, 0.1), position=(0, 0, 4.5, 0.3))
+    Entity(parent=boss, model='cube', color=color.red, scale=(0.6, 0.2, 0.1), position=(0, 4.5, 0.3))
     # Arms
     Entity(parent=boss, model='cube', color=color.dark_gray, scale=(0.4, 1.5, 0.4), position=(-1.8, 2.5, 0))
     Entity(parent=boss, model='cube', color=color.dark_gray, scale=(0.4, 1.5, 0.4), position=(1.8, 2.5, 0))
@@ -841,14 +997,16 @@ def create_warlock_boss_model():
     Entity(parent=boss, model='cylinder', color=color.gold, scale=(0.05, 2, 0.05), position=(0.8, 1.5, 0))
     # Staff orb
     Entity(parent=boss, model='sphere', color=color.cyan, scale=(0.2, 0.2, 0.2), position=(0.8, 2.5, 0))
-    # Floating orbs (will be animated)
+    
+    return boss
+
+def add_warlock_orbs(body):
+    """Attach the warlock's floating orbs (animated, so kept out of the cached model)"""
     for i in range(4):
-        orb = Entity(parent=boss, model='sphere', color=color.cyan, scale=0.3)
+        orb = Entity(parent=body, model='sphere', color=color.cyan, scale=0.3)
         orb.orbit_speed = 2 + i * 0.5
         orb.orbit_radius = 2
         orb.orbit_angle = i * 90
-    
-    return boss
 
 def create_behemoth_boss_model():
     """Create a detailed behemoth boss model"""
@@ -876,28 +1034,32 @@ def create_behemoth_boss_model():
     
     return boss
 
+# Each enemy/boss archetype is built once and flattened; spawns share its geometry
+model_cache = ModelCache()
+
+# Transient effects (wall-run sparks, boss shockwaves, bursts, teleport flashes)
+particles = ParticleSystem()
+
 # === Titanfall 2 Movement Functions ===
 def detect_wall_run():
-    """Detect if player can wall run and return wall normal - Simplified version"""
+    """Detect if player can wall run and return the normal of the nearest wall surface"""
     player_pos = player.position
     
-    # Check all wall run walls using simple distance-based detection
-    for wall in wall_run_walls:
-        distance = (player_pos - wall.position).length()
-        if distance < player.wall_detection_range:
-            # Simple wall normal calculation - wall faces outward from center
-            wall_to_center = (wall.position - Vec3(0, wall.position.y, 0)).normalized()
-            wall_normal = wall_to_center
-            
-            # Check if player is close enough to wall and moving forward
-            if held_keys['w'] and player.y > 0.5:
-                return wall_normal, wall
+    # Nearest wall face within range, from the index built at level load
+    nearest = wall_index.nearest(player_pos.x, player_pos.y, player_pos.z, player.wall_detection_range)
+    if nearest:
+        wall, (normal_x, normal_z), distance = nearest
+        wall_normal = Vec3(normal_x, 0, normal_z)
+        
+        # Check if player is close enough to wall and moving forward
+        if held_keys['w'] and player_height_above_ground() > 0.5:
+            return wall_normal, wall
     
     return None, None
 
 def start_wall_run(wall_normal, wall):
     """Start wall running"""
-    if not player.is_wall_running and player.y > 0.5:  # Must be off ground
+    if not player.is_wall_running and player_height_above_ground() > 0.5:  # Must be off ground
         player.is_wall_running = True
         player.wall_run_timer = 0
         player.wall_normal = wall_normal
@@ -909,26 +1071,7 @@ def start_wall_run(wall_normal, wall):
         camera.rotation_z = 15
         
         # Create wall run particles
-        for _ in range(5):
-            particle = Entity(
-                model='sphere',
-                color=color.blue,
-                scale=0.1,
-                position=player.position + Vec3(random.uniform(-0.5, 0.5), 0, random.uniform(-0.5, 0.5))
-            )
-            particle.velocity = Vec3(random.uniform(-2, 2), random.uniform(1, 3), random.uniform(-2, 2))
-            particle.lifetime = 1.0
-            particle.timer = 0
-            
-            def update_particle(particle=particle):
-                particle.timer += time.dt
-                particle.position += particle.velocity * time.dt
-                particle.scale *= 0.95
-                if particle.timer >= particle.lifetime:
-                    destroy(particle)
-            
-            # Store update function reference
-            particle.update_func = update_particle
+        particles.sparks(player.position, effect_rng, count=5, spark_color=color.blue)
 
 def end_wall_run():
     """End wall running"""
@@ -986,9 +1129,59 @@ def double_jump():
         if player.jump_count >= 2:
             player.double_jump_available = False
 
+def player_height_above_ground():
+    """Height of the player above the terrain surface"""
+    return terrain_heightfield.height_above(player.position)
+
+def player_on_ground():
+    """Check if player is standing on the terrain surface"""
+    return terrain_heightfield.is_grounded(player.position, tolerance=0.1)
+
+# === Ray Queries ===
+def refresh_actor_bvh():
+    """Rebuild the actor tree from current enemy and boss positions if they moved"""
+    global actor_bvh_dirty
+    if not actor_bvh_dirty:
+        return
+    actors = enemy_sim.entities + bosses
+    actor_bvh_items.clear()
+    actor_bvh_items.update(actors)
+    mins = np.empty((len(actors), 3))
+    maxs = np.empty((len(actors), 3))
+    layers = np.empty(len(actors), dtype=np.int64)
+    for i, actor in enumerate(actors):
+        x, y, z = actor.world_position
+        mins[i] = (x - actor.hit_radius, y, z - actor.hit_radius)
+        maxs[i] = (x + actor.hit_radius, y + actor.hit_height, z + actor.hit_radius)
+        layers[i] = LAYER_BOSS if actor.is_boss else LAYER_ENEMY
+    actor_bvh.build_from_arrays(actors, mins, maxs, layers)
+    actor_bvh_dirty = False
+
+def world_raycast(origin, direction, max_dist, mask=LAYER_STATIC, hit_terrain=True):
+    """Nearest hit against level boxes, actors (if in mask) and terrain. Returns a RayHit or None"""
+    direction = direction.normalized()
+    hit = level_bvh.raycast(origin, direction, max_dist, mask)
+    if mask & (LAYER_ENEMY | LAYER_BOSS):
+        refresh_actor_bvh()
+        actor_hit = actor_bvh.raycast(origin, direction, hit.distance if hit else max_dist, mask)
+        if actor_hit:
+            hit = actor_hit
+    if hit_terrain:
+        ground_distance = terrain_heightfield.raycast(origin, direction, hit.distance if hit else max_dist)
+        if ground_distance is not None:
+            point = origin + direction * ground_distance
+            hit = RayHit(terrain, ground_distance, tuple(point), (0, 1, 0))
+    return hit
+
+def has_line_of_sight(start, end):
+    """True if no level geometry or terrain blocks the segment between two points"""
+    offset = end - start
+    distance = offset.length()
+    return distance < 1e-6 or world_raycast(start, offset, distance) is None
+
 def reset_jump():
     """Reset jump when touching ground"""
-    if player.y <= 0.1:
+    if player_on_ground():
         player.jump_count = 0
         player.double_jump_available = True
 
@@ -1022,7 +1215,8 @@ update_gun_model()
 # === Power-up logic ===
 def spawn_powerup(type='health'):
     color_map = {'health': color.green, 'ammo': color.azure}
-    pos = Vec3(random.uniform(-140, 140), 0.5, random.uniform(-140, 140))
+    x, z = spawn_rng.uniform(-140, 140), spawn_rng.uniform(-140, 140)
+    pos = Vec3(x, terrain_heightfield.height_at(x, z) + 0.5, z)
     powerup = Entity(
         model='sphere', color=color_map[type], position=pos, scale=0.5,
         collider='sphere'
@@ -1031,33 +1225,63 @@ def spawn_powerup(type='health'):
     powerups.append(powerup)
 
 # === Bullet logic ===
+# Bullet entities are only visuals: flight, lifetime and hits are simulated in
+# `projectiles` (see projectiles.py), which moves them once per frame. They have
+# no update() of their own, so ursina no longer advances them a second time.
+# Bullets are pooled per weapon (see bullet_pool below) and never destroyed mid-game.
 class Bullet(Entity):
-    def __init__(self, position, direction, weapon_type='pistol'):
+    def __init__(self, weapon_type='pistol'):
         weapon_data = weapons[weapon_type]
         super().__init__(
             parent=scene,
             model='sphere',
             color=weapon_data['color'],
             scale=weapon_data['bullet_size'],
-            position=position,
-            collider='sphere'
+            enabled=False
         )
-        self.direction = direction.normalized()
-        self.speed = weapon_data['bullet_speed']
-        self.damage = weapon_data['damage']
-        self.lifetime = 2  # Bullet disappears after 2 seconds
-        self.timer = 0
 
-    def update(self):
-        self.position += self.direction * self.speed * time.dt
-        self.timer += time.dt
-        
-        # Destroy bullet if it goes too far or times out
-        if self.timer >= self.lifetime or (self.position - player.position).length() > 100:
-            if self in bullets:
-                bullets.remove(self)
-            destroy(self)
+    def launch(self, position, direction):
+        """Reset a pooled bullet and show it at the muzzle"""
+        self.position = position
+        self.look_at(position + direction)
+        self.enabled = True
 
+# Pre-allocate enough bullets per projectile weapon to cover one bullet lifetime of sustained fire
+bullet_pool = BulletPool(
+    factory=Bullet,
+    prewarm={key: 0 if data.get('hitscan') else ceil(2 / data['fire_rate']) for key, data in weapons.items()}
+)
+
+# All projectile state (positions, directions, speeds, timers, damage) in NumPy arrays
+projectiles = ProjectileSystem(capacity=256, on_remove=bullet_pool.release)
+bullet_lifetime = 2  # Bullets disappear after 2 seconds
+bullet_range = 100  # ...or once they are this far from the player
+
+
+# === Hitscan logic ===
+hitscan_range = 100  # Same reach as a bullet before it despawns
+tracer_pool = TracerPool(size=24)
+
+def fire_hitscan(gun_pos, direction, weapon_data):
+    """Resolve a shot instantly with one ray query against targets, walls and terrain"""
+    global actor_bvh_dirty
+    # Ray starts at the camera so the shot lands under the crosshair; the tracer starts at the gun
+    origin = camera.world_position
+    direction = direction.normalized()
+
+    hit = world_raycast(origin, direction, hitscan_range, mask=LAYER_STATIC | LAYER_ENEMY | LAYER_BOSS)
+    distance = hit.distance if hit else hitscan_range
+    target = hit.item if hit and hit.item in actor_bvh_items else None
+
+    if target is not None and target.health > 0:
+        if hit_sfx: hit_sfx.play()
+        if target.is_boss:
+            damage_boss(target, weapon_data['damage'])
+        else:
+            damage_enemy(target, weapon_data['damage'])
+        actor_bvh_dirty = True  # The target may have died and left the tree
+
+    tracer_pool.spawn(gun_pos, origin + direction * distance, weapon_data['color'])
 
 def shoot():
     try:
@@ -1078,8 +1302,12 @@ def shoot():
 
         # Spawn bullet from gun position (bottom right of screen)
         gun_pos = camera.world_position + camera.forward * 1.5 + camera.right * 0.5 - camera.up * 0.25
-        bullet = Bullet(position=gun_pos, direction=camera.forward, weapon_type=player.current_weapon)
-        bullets.append(bullet)
+        if weapon_data.get('hitscan'):
+            fire_hitscan(gun_pos, camera.forward, weapon_data)
+        else:
+            bullet = bullet_pool.acquire(player.current_weapon, gun_pos, camera.forward)
+            projectiles.spawn(gun_pos, camera.forward, weapon_data['bullet_speed'], weapon_data['damage'],
+                              weapon_data['bullet_size'] / 2, lifetime=bullet_lifetime, visual=bullet)
 
     except Exception as e:
         print(f"[ERROR 1001] Failed to shoot bullet: {e}")
@@ -1096,7 +1324,7 @@ def reload():
     else:
         if reload_sfx: reload_sfx.play()
     
-    invoke(finish_reload, delay=player.reload_time)
+    scheduler.after(player.reload_time, finish_reload)
 
 def finish_reload():
     weapon_data = weapons[player.current_weapon]
@@ -1108,6 +1336,14 @@ def finish_reload():
 bosses = []
 boss_attack_indicators = []
 
+# Movement, contact knockback and launch for every enemy, simulated as arrays
+enemy_sim = EnemySimulation(contact_range=1.5, knockback=15, launch_height=10)
+# Separation and avoidance between enemies, from grid neighbour pairs
+crowd = CrowdSteering(radius=1.6)
+
+# Broad phase for bullet hits, rebuilt every frame from enemies and bosses
+target_grid = SpatialHashGrid(cell_size=4)
+
 class BossAttackIndicator(Entity):
     def __init__(self, position, attack_type, delay=2.0):
         super().__init__(
@@ -1144,26 +1380,24 @@ class BossAttackIndicator(Entity):
             destroy(self)
 
 def spawn_boss():
-    boss_type = random.choice(['titan', 'warlock', 'behemoth'])
-    base = Entity(model=None, position=Vec3(random.uniform(-100, 100), 2, random.uniform(-100, 100)),
+    boss_type = spawn_rng.choice(['titan', 'warlock', 'behemoth'])
+    base = Entity(model=None, position=Vec3(spawn_rng.uniform(-100, 100), 2, spawn_rng.uniform(-100, 100)),
                   collider='box')
     
     if boss_type == 'titan':
-        body = create_titan_boss_model()
-        body.parent = base
-        stats = dict(speed=3, health=500, attack_damage=40, attack_range=8, attack_cooldown=4)
+        body = model_cache.instance('titan', create_titan_boss_model, parent=base)
+        stats = dict(speed=3, health=500, attack_damage=40, attack_range=8, attack_cooldown=4, hit_radius=1.8, hit_height=5)
         abilities = ['ground_slam', 'charge']
         
     elif boss_type == 'warlock':
-        body = create_warlock_boss_model()
-        body.parent = base
-        stats = dict(speed=2, health=400, attack_damage=35, attack_range=12, attack_cooldown=3)
+        body = model_cache.instance('warlock', create_warlock_boss_model, parent=base)
+        add_warlock_orbs(body)
+        stats = dict(speed=2, health=400, attack_damage=35, attack_range=12, attack_cooldown=3, hit_radius=1.2, hit_height=4)
         abilities = ['magic_burst', 'teleport']
         
     else:  # behemoth
-        body = create_behemoth_boss_model()
-        body.parent = base
-        stats = dict(speed=4, health=600, attack_damage=50, attack_range=6, attack_cooldown=5)
+        body = model_cache.instance('behemoth', create_behemoth_boss_model, parent=base)
+        stats = dict(speed=4, health=600, attack_damage=50, attack_range=6, attack_cooldown=5, hit_radius=1.6, hit_height=4.6)
         abilities = ['roar', 'stomp']
 
     # Boss nameplate
@@ -1184,6 +1418,9 @@ def spawn_boss():
     base.abilities = abilities
     base.current_ability = None
     base.ability_timer = 0
+    base.hit_radius = stats['hit_radius']
+    base.hit_height = stats['hit_height']
+    base.is_boss = True
     
     bosses.append(base)
     print(f"BOSS SPAWNED: {boss_type.upper()} - HP: {stats['health']}")
@@ -1196,13 +1433,7 @@ def boss_ground_slam(boss):
     # Execute attack after delay
     def execute_slam():
         # Create shockwave effect
-        shockwave = Entity(
-            model='sphere',
-            color=color.red,
-            scale=(1, 0.1, 1),
-            position=boss.position,
-            alpha=0.8
-        )
+        particles.shockwave(boss.position, color.red, growth=2, fade=2)
         
         # Damage player if in range
         if (player.position - boss.position).length() < boss.attack_range:
@@ -1210,18 +1441,8 @@ def boss_ground_slam(boss):
             # Knockback effect
             knockback_dir = (player.position - boss.position).normalized()
             player.position += knockback_dir * 10
-        
-        # Animate shockwave
-        def expand_shockwave():
-            shockwave.scale += Vec3(2, 0, 2) * time.dt
-            shockwave.alpha -= time.dt * 2
-            if shockwave.alpha > 0:
-                invoke(expand_shockwave, delay=0.05)
-            else:
-                destroy(shockwave)
-        expand_shockwave()
     
-    invoke(execute_slam, delay=2.0)
+    scheduler.after(2.0, execute_slam, owner=boss)
 
 def boss_charge(boss):
     # Predict charge path
@@ -1248,10 +1469,10 @@ def boss_charge(boss):
             # Heavy knockback
             knockback_dir = (player.position - boss.position).normalized()
             player.position += knockback_dir * 15
-        
-        destroy(warning_line)
     
-    invoke(execute_charge, delay=1.5)
+    scheduler.after(1.5, execute_charge, owner=boss)
+    # Removed on its own timer, so it doesn't outlive a boss that dies during the wind-up
+    scheduler.after(1.5, lambda: destroy(warning_line), owner=warning_line)
 
 def boss_magic_burst(boss):
     # Create warning ring
@@ -1264,43 +1485,24 @@ def boss_magic_burst(boss):
     )
     
     def execute_burst():
-        # Damage player if in range
-        if (player.position - boss.position).length() < boss.attack_range:
+        # Damage player if in range and not hiding behind cover
+        eye_offset = Vec3(0, 2, 0)
+        if (player.position - boss.position).length() < boss.attack_range and \
+                has_line_of_sight(boss.position + eye_offset, player.position + eye_offset):
             player.health -= boss.attack_damage
         
         # Visual burst effect
-        burst = Entity(
-            model='sphere',
-            color=color.cyan,
-            scale=(0.1, 0.1, 0.1),
-            position=boss.position
-        )
-        
-        def expand_burst():
-            burst.scale += Vec3(1, 1, 1) * time.dt * 5
-            burst.alpha -= time.dt * 2
-            if burst.alpha > 0:
-                invoke(expand_burst, delay=0.05)
-            else:
-                destroy(burst)
-        expand_burst()
-        
-        destroy(warning_ring)
+        particles.burst(boss.position, color.cyan, start_scale=0.1, growth=5, fade=2)
     
-    invoke(execute_burst, delay=1.5)
+    scheduler.after(1.5, execute_burst, owner=boss)
+    scheduler.after(1.5, lambda: destroy(warning_ring), owner=warning_ring)
 
 def boss_teleport(boss):
     # Teleport to random position near player
-    teleport_pos = player.position + Vec3(random.uniform(-10, 10), 0, random.uniform(-10, 10))
+    teleport_pos = player.position + Vec3(boss_rng.uniform(-10, 10), 0, boss_rng.uniform(-10, 10))
     
-    # Teleport effect
-    teleport_effect = Entity(
-        model='sphere',
-        color=color.purple,
-        scale=(3, 3, 3),
-        position=boss.position,
-        alpha=0.8
-    )
+    # Teleport effect, shown until the boss arrives
+    particles.flash(boss.position, color.purple, size=3, alpha=0.8, fade=0, lifetime=0.5)
     
     def execute_teleport():
         boss.position = teleport_pos
@@ -1310,25 +1512,9 @@ def boss_teleport(boss):
             player.health -= boss.attack_damage // 2
         
         # Teleport arrival effect
-        arrival_effect = Entity(
-            model='sphere',
-            color=color.cyan,
-            scale=(3, 3, 3),
-            position=boss.position,
-            alpha=0.8
-        )
-        
-        def fade_effect():
-            arrival_effect.alpha -= time.dt * 2
-            if arrival_effect.alpha > 0:
-                invoke(fade_effect, delay=0.05)
-            else:
-                destroy(arrival_effect)
-        fade_effect()
-        
-        destroy(teleport_effect)
+        particles.flash(boss.position, color.cyan, size=3, alpha=0.8, fade=2)
     
-    invoke(execute_teleport, delay=0.5)
+    scheduler.after(0.5, execute_teleport, owner=boss)
 
 def boss_roar(boss):
     # Create warning indicator
@@ -1341,9 +1527,9 @@ def boss_roar(boss):
             player.health -= boss.attack_damage
             # Slow player temporarily
             player.speed *= 0.5
-            invoke(lambda: setattr(player, 'speed', 7.5), delay=3.0)
+            scheduler.after(3.0, lambda: setattr(player, 'speed', 7.5))
     
-    invoke(execute_roar, delay=1.5)
+    scheduler.after(1.5, execute_roar, owner=boss)
 
 def boss_stomp(boss):
     # Create warning indicator
@@ -1357,48 +1543,57 @@ def boss_stomp(boss):
             knockback_dir = (player.position - boss.position).normalized()
             player.position += knockback_dir * 20
     
-    invoke(execute_stomp, delay=1.0)
+    scheduler.after(1.0, execute_stomp, owner=boss)
 
 # === Enemy spawn ===
-def spawn_enemy():
-    enemy_type = random.choice(['grunt', 'brute', 'crawler'])
-    base = Entity(model=None, position=Vec3(random.uniform(-140, 140), 1, random.uniform(-140, 140)),
-                  collider='box')
-    
-    if enemy_type == 'grunt':
-        body = create_grunt_model()
-        body.parent = base
-        stats = dict(speed=7.5, health=50)  # Increased by 200%
-    elif enemy_type == 'brute':
-        body = create_brute_model()
-        body.parent = base
-        stats = dict(speed=4.5, health=150)  # Increased by 200%
-    else:  # crawler
-        body = create_crawler_model()
-        body.parent = base
-        stats = dict(speed=10.5, health=30)  # Increased by 200%
+# Per-archetype model builders and stats
+ENEMY_TYPES = {
+    'grunt': (create_grunt_model, dict(speed=7.5, health=50, hit_radius=0.7, hit_height=2.3)),  # Increased by 200%
+    'brute': (create_brute_model, dict(speed=4.5, health=150, hit_radius=1.0, hit_height=3.3)),  # Increased by 200%
+    'crawler': (create_crawler_model, dict(speed=10.5, health=30, hit_radius=0.8, hit_height=1.0)),  # Increased by 200%
+}
 
+def create_enemy(enemy_type):
+    """Build a disabled enemy (collider, body, nameplate) for the enemy pool"""
+    base = Entity(model=None, collider='box', enabled=False)
+    base.body = model_cache.instance(enemy_type, ENEMY_TYPES[enemy_type][0], parent=base)
     # Nameplate
-    name_text = Text(text=enemy_type.upper(), world_parent=base, y=3, scale=1.5, color=color.white, billboard=True)
-    base.body = body
-    base.nameplate = name_text
-    base.speed = stats['speed']
-    base.health = stats['health']
+    base.nameplate = Text(text=enemy_type.upper(), world_parent=base, y=3, scale=1.5, color=color.white, billboard=True)
     base.type = enemy_type
+    base.is_boss = False
+    return base
+
+# Killed enemies go back to their archetype's pool and are reused by later waves
+enemy_pool = EnemyPool(create_enemy)
+
+def spawn_enemy():
+    enemy_type = spawn_rng.choice(['grunt', 'brute', 'crawler'])
+    x, z = spawn_rng.uniform(-140, 140), spawn_rng.uniform(-140, 140)
+    base = enemy_pool.acquire(enemy_type, Vec3(x, terrain_heightfield.height_at(x, z), z), **ENEMY_TYPES[enemy_type][1])
     enemies.append(base)
+    enemy_sim.add(base, base.position, base.speed, enemy_type)
+
+def enemy_pool_targets():
+    """Idle enemies per archetype to have ready for the next wave"""
+    alive_cap = min(enemies_per_wave, spawn_director.budget)
+    return {enemy_type: ceil(alive_cap / len(ENEMY_TYPES)) + 4 for enemy_type in ENEMY_TYPES}
+
+def prewarm_enemy_pool():
+    """Fill the enemy pool a couple of enemies per frame during the gap before a wave"""
+    targets = enemy_pool_targets()
+    scheduler.each_frame(lambda dt: enemy_pool.prewarm_step(targets, limit=2), duration=3)
 
 def spawn_wave():
     global enemies_per_wave
-    for _ in range(enemies_per_wave):
-        spawn_enemy()
+    # Released a few per frame by the spawn director, within its alive budget
+    spawn_director.enqueue(spawn_enemy, enemies_per_wave)
     
     # Spawn boss every 3 waves
     if wave % 3 == 0:
         spawn_boss()
     
-    wave_text.text = f"Wave: {wave}"
-    for _ in range(random.randint(1,3)):
-        spawn_powerup(random.choice(['health','ammo']))
+    for _ in range(spawn_rng.randint(1,3)):
+        spawn_powerup(spawn_rng.choice(['health','ammo']))
 
 # === Shop System ===
 shop_panel = Panel(scale=(0.5,0.6), color=color.rgba(30,30,30,220), enabled=False)
@@ -1515,12 +1710,17 @@ def input(key):
     if key == 'f3':
         global debug_mode
         debug_mode = not debug_mode
+        debug_overlay.set_enabled(debug_mode)
+        profiler.set_enabled(debug_mode or bool(profile_path))
         print(f"Debug mode: {'ON' if debug_mode else 'OFF'}")
         print(f"Mouse locked: {mouse.locked}")
         print(f"Shop open: {shop_open}")
         print(f"Inventory open: {inventory_open}")
         print(f"Pause panel enabled: {pause_panel.enabled}")
         print(f"Keybind panel enabled: {keybind_panel.enabled}")
+        print(f"Bullet pool: {bullet_pool.stats()}")
+        print(f"Scheduler: {scheduler.stats()}")
+        print(f"HUD: {hud.stats()}")
         return
     
     if key == 'left mouse down':
@@ -1595,7 +1795,7 @@ def input(key):
         crosshair_dot.color = color.red
     elif key == 'left shift':
         # Start sliding
-        if not player.is_sliding and player.y <= 0.1:  # Only slide when on ground
+        if not player.is_sliding and player_on_ground():  # Only slide when on ground
             player.is_sliding = True
             player.slide_timer = 0
             # Lower camera for slide effect
@@ -1604,7 +1804,7 @@ def input(key):
             player.speed = player.slide_speed
     elif key == 'space':
         # Jump or double jump
-        if player.y <= 0.1:  # Ground jump
+        if player_on_ground():  # Ground jump
             player.y += 2
             player.jump_count = 1
         else:  # Double jump
@@ -1612,17 +1812,12 @@ def input(key):
     elif key == 'e':
         # Grapple hook - grapple to where cursor is pointing
         if not player.is_grappling and player.grapple_cooldown <= 0:
-            # Cast a ray from camera to find where player is looking
-            raycast_result = raycast(
-                camera.world_position,
-                camera.forward,
-                distance=player.grapple_range,
-                ignore=(player,)
-            )
+            # Cast a ray from camera against grappleable level geometry and the terrain
+            raycast_result = world_raycast(camera.world_position, camera.forward, player.grapple_range, mask=LAYER_GRAPPLE)
             
-            if raycast_result.hit:
+            if raycast_result:
                 # Grapple to the hit point
-                grapple_target = raycast_result.world_point
+                grapple_target = Vec3(*raycast_result.point)
                 grapple_to_target(grapple_target)
                 print(f"Grappling to cursor position: {grapple_target}")
             else:
@@ -1640,75 +1835,96 @@ def input(key):
         mouse.locked = not mouse.locked
         print(f"Mouse lock manually toggled: {mouse.locked}")
 
+# === Damage ===
+def damage_enemy(e, damage):
+    """Apply bullet damage to an enemy and handle the kill"""
+    global enemy_kills
+    e.health -= damage
+    if e.health <= 0:
+        if explosion_sfx: explosion_sfx.play()
+        # Drop loot for normal enemies
+        dropped_loot = drop_loot(e.position, e.type, is_boss=False)
+        loot_items_world.extend(dropped_loot)
+
+        enemies.remove(e)
+        enemy_sim.remove(e)
+        enemy_pool.release(e)
+        player.score += 10
+        player.money += 25  # Money reward for killing enemies
+        enemy_kills += 1
+
+def damage_boss(boss, damage):
+    """Apply bullet damage to a boss and handle the kill"""
+    try:
+        boss.health -= damage
+
+        # Update boss health display
+        if hasattr(boss, 'health_text'):
+            boss.health_text.text = f'HP: {boss.health}'
+
+        if boss.health <= 0:
+            if explosion_sfx: explosion_sfx.play()
+            # Drop loot for bosses
+            dropped_loot = drop_loot(boss.position, boss.type, is_boss=True)
+            loot_items_world.extend(dropped_loot)
+
+            bosses.remove(boss)
+            destroy(boss)
+            player.score += 100  # Big reward for killing boss
+            player.money += 200  # Big money reward for killing boss
+            print(f"BOSS VANQUISHED! +100 Score, +$200 Money")
+    except Exception as inner_e:
+        print(f"[ERROR 1005] Boss bullet collision failed: {inner_e}")
+
 # === Update Loop ===
 def update():
-    global enemy_kills, wave, enemies_per_wave, game_over
+    global enemy_kills, wave, enemies_per_wave, game_over, actor_bvh_dirty
+    actor_bvh_dirty = True  # Enemies and bosses move this frame
+    profiler.begin()
+
+    # Timed events and tweens (delayed abilities, reloads, loot animations)
+    scheduler.update(time.dt)
+    profiler.lap('scheduler')
 
     if player.health <= 0 and not game_over:
         game_over_text.text = 'GAME OVER\nPress Q to Quit'
         game_over = True
-        bullets.clear()
+        projectiles.clear()
+        spawn_director.clear()
         for e in enemies:
             e.speed = 0
+            enemy_sim.set_speed(e, 0)
         return
 
     if game_over:
         return
 
-    # HUD
-    health_bar.text = f'Health: {int(player.health)}'
-    ammo_bar.text = f'Ammo: {player.ammo}/{player.max_ammo}'
-    score_text.text = f'Score: {player.score}'
-    money_text.text = f'Money: ${player.money}'
-    weapon_text.text = f'Weapon: {weapons[player.current_weapon]["name"]}'
-    
-    # Movement HUD
-    if player.is_wall_running:
-        wall_run_text.text = f'Wall Running: {player.wall_run_duration - player.wall_run_timer:.1f}s'
-        wall_run_text.color = color.green
-    else:
-        wall_run_text.text = 'Press W near walls to wall run'
-        wall_run_text.color = color.gray
-    
-    if player.is_grappling:
-        movement_text.text = 'Grappling!'
-        movement_text.color = color.yellow
-    else:
-        movement_text.text = 'Press E to grapple to cursor'
-        movement_text.color = color.cyan
-    
-    if player.grapple_cooldown > 0:
-        grapple_cooldown_text.text = f'Grapple Cooldown: {player.grapple_cooldown:.1f}s'
-        grapple_cooldown_text.color = color.red
-    else:
-        grapple_cooldown_text.text = 'Grapple Ready'
-        grapple_cooldown_text.color = color.green
-
-    # Debug information
-    if debug_mode:
-        debug_text = Text(
-            text=f'Pos: {player.position}\nSpeed: {player.speed}\nWall Running: {player.is_wall_running}\nGrappling: {player.is_grappling}',
-            position=(0.7, -0.2),
-            scale=0.7,
-            color=color.yellow
-        )
-        # Remove debug text after a short delay
-        invoke(lambda: destroy(debug_text), delay=0.1)
+    # HUD and movement HUD (only widgets whose values changed are rebuilt)
+    hud.update(time.dt)
+    profiler.lap('hud')
+
+    # Debug overlay (returns immediately while hidden)
+    debug_overlay.update(time.dt)
+    profiler.lap('debug')
 
     # Health Regen
     if player.health < player.max_health:
         player.health += time.dt * 0.5
 
+    # Ground collision check - keep player on the terrain heightfield
+    if terrain_heightfield.resolve_collision(player) or player_on_ground():
+        player.grounded = True
+        player.air_time = 0
+
     # Reset jump when touching ground
     reset_jump()
-    
-    # Ground collision check - removed slope debugging as requested
+    profiler.lap('player')
     
     # Wall running mechanics
     if not player.is_grappling and not player.is_sliding:
         wall_normal, wall = detect_wall_run()
         
-        if wall_normal and held_keys['w'] and player.y > 0.5:
+        if wall_normal and held_keys['w'] and player_height_above_ground() > 0.5:
             if not player.is_wall_running:
                 start_wall_run(wall_normal, wall)
         else:
@@ -1720,17 +1936,18 @@ def update():
             player.wall_run_timer += time.dt
             if player.wall_run_timer >= player.wall_run_duration:
                 end_wall_run()
-    
+    profiler.lap('wall_run')
+
     # Grappling mechanics
     update_grapple()
     if player.grapple_cooldown > 0:
         player.grapple_cooldown -= time.dt
-    
-    # Update wall run particles
-    for entity in scene.entities:
-        if hasattr(entity, 'update_func'):
-            entity.update_func()
-    
+    profiler.lap('grapple')
+
+    # Update effect particles (only the live ones)
+    particles.update(time.dt)
+    profiler.lap('particles')
+
     # Sliding mechanics
     if player.is_sliding:
         player.slide_timer += time.dt
@@ -1744,6 +1961,7 @@ def update():
             player.is_sliding = False
             player.speed = 7.5  # Return to normal speed
             camera.y = 0  # Return camera to normal height
+    profiler.lap('player')
 
     # Powerups
     for p in powerups[:]:
@@ -1761,95 +1979,63 @@ def update():
         if (player.position - loot.position).length() < 2:
             if pickup_loot(loot):
                 loot_items_world.remove(loot)
-
-    # Bullets
-    for bullet in bullets[:]:
-        try:
-            bullet.update()
-            
-            # Check for collisions with enemies
-            for e in enemies[:]:
-                if e is None or bullet is None:
-                    continue
-                try:
-                    if bullet.intersects(e).hit:
-                        if hit_sfx: hit_sfx.play()
-                        e.health -= bullet.damage
-                        if bullet in bullets:
-                            bullets.remove(bullet)
-                        destroy(bullet)
-                        
-                        if e.health <= 0:
-                            if explosion_sfx: explosion_sfx.play()
-                            # Drop loot for normal enemies
-                            dropped_loot = drop_loot(e.position, e.type, is_boss=False)
-                            loot_items_world.extend(dropped_loot)
-                            
-                            enemies.remove(e)
-                            destroy(e)
-                            player.score += 10
-                            player.money += 25  # Money reward for killing enemies
-                            enemy_kills += 1
-                        break  # Exit enemy loop since bullet is destroyed
-                except Exception as inner_e:
-                    print(f"[ERROR 1002] Bullet collision failed: {inner_e}")
-            
-            # Check for collisions with bosses
-            for boss in bosses[:]:
-                if boss is None or bullet is None:
-                    continue
-                try:
-                    if bullet.intersects(boss).hit:
-                        if hit_sfx: hit_sfx.play()
-                        boss.health -= bullet.damage
-                        if bullet in bullets:
-                            bullets.remove(bullet)
-                        destroy(bullet)
-                        
-                        # Update boss health display
-                        if hasattr(boss, 'health_text'):
-                            boss.health_text.text = f'HP: {boss.health}'
-                        
-                        if boss.health <= 0:
-                            if explosion_sfx: explosion_sfx.play()
-                            # Drop loot for bosses
-                            dropped_loot = drop_loot(boss.position, boss.type, is_boss=True)
-                            loot_items_world.extend(dropped_loot)
-                            
-                            bosses.remove(boss)
-                            destroy(boss)
-                            player.score += 100  # Big reward for killing boss
-                            player.money += 200  # Big money reward for killing boss
-                            print(f"BOSS VANQUISHED! +100 Score, +$200 Money")
-                        break  # Exit boss loop since bullet is destroyed
-                except Exception as inner_e:
-                    print(f"[ERROR 1005] Boss bullet collision failed: {inner_e}")
-        except Exception as bullet_e:
-            print(f"[ERROR 1003] Bullet update failed: {bullet_e}")
-            if bullet in bullets:
-                bullets.remove(bullet)
-            destroy(bullet)
-
-    # Enemies movement and contact damage
-    for e in enemies[:]:
+    profiler.lap('pickups')
+
+    # Hitscan tracers
+    tracer_pool.update(time.dt)
+    profiler.lap('tracers')
+
+    # Bullets - rebuild the spatial hash once, then sweep every projectile's path this frame
+    target_grid.clear()
+    for e in enemies:
+        target_grid.insert(e, e.x, e.z, e.hit_radius)
+    for boss in bosses:
+        target_grid.insert(boss, boss.x, boss.z, boss.hit_radius)
+
+    # Advance every projectile in one vectorized step
+    projectiles.step(time.dt)
+
+    # Swept segment-vs-capsule test, so fast bullets can't tunnel through targets on slow frames
+    spent = []
+    for index, hit in enumerate(sweep_hits(target_grid, projectiles.segments())):
+        if hit is None:
+            continue
+        target, _ = hit
+        if target.health <= 0:
+            continue  # Already killed by another bullet this frame
         try:
-            e.look_at(player.position)
-            dir = (player.position - e.position).normalized()
-            e.position += dir * time.dt * e.speed
-
-            # Check collision with player
-            if (e.position - player.position).length() < 1.5:
-                # Deal chunk damage
-                player.health -= 20  # Instant 20 HP damage
-                # Bounce enemy away and launch airborne
-                push_dir = (e.position - player.position).normalized()
-                e.position += push_dir * 15  # push 8 units back (much farther)
-                e.position.y += 10  # launch 5 units upward (airborne)
-        except Exception as e_error:
-            print(f"[ERROR 1004] Enemy update failed: {e_error}")
-            if e in enemies:
-                enemies.remove(e)
-                destroy(e)
+            if hit_sfx: hit_sfx.play()
+            spent.append(index)
+            if target.is_boss:
+                damage_boss(target, int(projectiles.damage[index]))
+            else:
+                damage_enemy(target, int(projectiles.damage[index]))
+        except Exception as inner_e:
+            print(f"[ERROR 1002] Bullet collision failed: {inner_e}")
+    projectiles.remove(spent)
+    # Expire after the hit test, so a bullet's final segment still counts (expired ones go back to the pool)
+    projectiles.remove_expired(player.position, bullet_range)
+    projectiles.sync_visuals()
+    profiler.lap('bullets')
+
+    # Queued wave spawns
+    spawn_director.update(time.dt, len(enemies))
+    profiler.lap('spawns')
+
+    # Flow field toward the player, recomputed over a few frames when the player changes cells
+    flow_field.set_target(player.x, player.z)
+    flow_field.update()
+    profiler.lap('pathing')
+
+    # Enemies movement and contact damage - one vectorized step for the whole horde
+    try:
+        for e in enemy_sim.step(time.dt, player.position, terrain_heightfield, flow_field, crowd):
+            # Deal chunk damage; the simulation already bounced the enemy away and launched it airborne
+            player.health -= 20  # Instant 20 HP damage
+        enemy_sim.write_back()
+    except Exception as e_error:
+        print(f"[ERROR 1004] Enemy update failed: {e_error}")
+    profiler.lap('enemies')
 
     # Boss movement and attacks
     for boss in bosses[:]:
@@ -1859,8 +2045,8 @@ def update():
                 for child in boss.body.children:
                     if hasattr(child, 'orbit_speed'):
                         child.orbit_angle += child.orbit_speed * time.dt
-                        child.position.x = cos(radians(child.orbit_angle)) * child.orbit_radius
-                        child.position.z = sin(radians(child.orbit_angle)) * child.orbit_radius
+                        child.x = cos(radians(child.orbit_angle)) * child.orbit_radius
+                        child.z = sin(radians(child.orbit_angle)) * child.orbit_radius
             
             # Boss movement towards player
             if (player.position - boss.position).length() > boss.attack_range:
@@ -1872,7 +2058,7 @@ def update():
             boss.attack_timer += time.dt
             if boss.attack_timer >= boss.attack_cooldown:
                 # Choose random ability
-                ability = random.choice(boss.abilities)
+                ability = boss_rng.choice(boss.abilities)
                 if ability == 'ground_slam':
                     boss_ground_slam(boss)
                 elif ability == 'charge':
@@ -1897,6 +2083,7 @@ def update():
             if boss in bosses:
                 bosses.remove(boss)
                 destroy(boss)
+    profiler.lap('bosses')
 
     # Update attack indicators
     for indicator in boss_attack_indicators[:]:
@@ -1907,13 +2094,16 @@ def update():
             if indicator in boss_attack_indicators:
                 boss_attack_indicators.remove(indicator)
             destroy(indicator)
+    profiler.lap('indicators')
 
     # Wave control - only advance if all enemies AND bosses are dead
     if enemy_kills >= enemies_per_wave and len(bosses) == 0:
         wave += 1
         enemy_kills = 0
         enemies_per_wave += 3
-        invoke(spawn_wave, delay=3)
+        prewarm_enemy_pool()
+        scheduler.after(3, spawn_wave)
+    profiler.lap('waves')
 
     # Show/hide shop UI
     shop_panel.enabled = shop_open
@@ -1926,6 +2116,8 @@ def update():
     if inventory_open:
         update_inventory_display()
         mouse.locked = False
+    profiler.lap('ui')
+    profiler.end()
     # Pause disables player movement
     if pause_panel.enabled:
         player.speed = 0
@@ -2005,5 +2197,55 @@ def toggle_keybinds():
 
 # === Start Game ===
 # Mouse is unlocked by default - user can manually lock with M key
+# Nothing is on screen yet, so fill the enemy pool for the first wave in one go
+enemy_pool.prewarm_step(enemy_pool_targets(), limit=len(ENEMY_TYPES) * enemy_pool.max_free)
 spawn_wave()
-app.run()
+
+def state_digest():
+    """Checksum of the gameplay state; equal digests mean two runs did the same work"""
+    state = [wave, enemy_kills, player.score, player.money, round(player.health, 3), len(loot_items_world)]
+    state += [(round(e.x, 3), round(e.z, 3), e.health) for e in enemies]
+    state += [(round(b.x, 3), round(b.z, 3), b.health) for b in bosses]
+    return f'{zlib.crc32(repr(state).encode()):08x}'
+
+def run_headless():
+    events = load_input_script(launch_options.input) if launch_options.input else []
+    runner = HeadlessRunner(app, events, max_ticks=launch_options.max_ticks)
+    press = lambda key: app.input(key, is_raw=True)
+    bot = None
+    if launch_options.bot:
+        weapon_key = {'1': 'pistol', '2': 'assault_rifle', '3': 'laser'}[launch_options.bot_weapon]
+        bot = ScriptedBot(press, player, lambda: (enemies, bosses), weapons[weapon_key]['fire_rate'],
+                          weapon_key=launch_options.bot_weapon)
+    recorder = None
+    if launch_options.report:
+        recorder = WaveRecorder(lambda: {'enemies': len(enemies), 'queued': len(spawn_director.pending),
+                                         'bosses': len(bosses), 'projectiles': len(projectiles),
+                                         'particles': len(particles), 'loot': len(loot_items_world),
+                                         'entities': len(scene.entities)})
+
+    def on_tick(tick, frame_time):
+        if recorder:
+            recorder.tick(wave, frame_time)
+        if bot:
+            bot.update(launch_options.dt)
+
+    runner.run(done=lambda: game_over or wave > launch_options.waves, on_tick=on_tick)
+    print(f"[INFO] Headless run: {runner.ticks} ticks ({runner.ticks * launch_options.dt:.1f} s simulated) "
+          f"in {runner.elapsed:.2f} s, {runner.ticks_per_second:.0f} ticks/s, "
+          f"wave {wave}, enemies {len(enemies)}, bosses {len(bosses)}, health {int(player.health)}, "
+          f"seed {random_service.seed}, state {state_digest()}")
+    if recorder:
+        recorder.finish()
+        recorder.waves = [record for record in recorder.waves if record['wave'] <= launch_options.waves]
+        recorder.write(launch_options.report, meta={
+            'seed': random_service.seed, 'waves': launch_options.waves, 'dt': launch_options.dt, 'window': launch_options.window,
+            'bot': launch_options.bot, 'ticks': runner.ticks, 'elapsed_s': round(runner.elapsed, 3),
+            'ticks_per_second': round(runner.ticks_per_second, 1), 'state': state_digest(),
+        })
+        print(f"[INFO] Wave report written to {launch_options.report}")
+
+if HEADLESS:
+    run_headless()
+else:
+    app.run()
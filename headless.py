@@ -0,0 +1,149 @@
+"""
+HEADLESS MODE
+=============
+Runs game2.py's normal update() loop without an on-screen window, as fast
+as the CPU allows, for load testing in CI and on build boxes:
+
+    python game2.py --headless --waves 5 --dt 0.0166667 --seed 42 --input bot.txt
+
+The Ursina app is created with window_type 'none' (no rendering at all) or
+'offscreen' (renders into a buffer, so draw cost is included). The global
+clock is forced to a fixed dt, so time.dt is identical every frame however
+long the frame really took. Scripted input is fed through app.input(), the
+same path real key presses take, so held_keys and game2's input() see it.
+
+Input scripts have one event per line: the tick it fires on and the ursina
+key name, e.g.
+
+    0    w            # start holding W
+    120  w up         # release it
+    150  left mouse down
+    151  left mouse up
+
+Blank lines and # comments are ignored. With the same --seed (see rng.py)
+and input script, two runs end in the same state and report the same
+state digest. Headless runs use a fixed enemy budget (--enemy-budget,
+default 60) for this; the adaptive budget reacts to real frame time and is
+not reproducible.
+"""
+
+import argparse
+import time as wall_time
+
+from panda3d.core import ClockObject, PerspectiveLens
+
+from ursina import camera, mouse
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='game2 (pass --headless to run without a window)')
+    parser.add_argument('--headless', action='store_true', help='Run the simulation without an on-screen window')
+    parser.add_argument('--window', choices=('none', 'offscreen'), default='none',
+                        help='Headless window type: none skips rendering, offscreen renders into a buffer')
+    parser.add_argument('--dt', type=float, default=1 / 60, help='Fixed timestep in seconds')
+    parser.add_argument('--waves', type=int, default=3, help='Stop once this many waves have been cleared')
+    parser.add_argument('--max-ticks', type=int, default=36000, help='Stop after this many ticks regardless')
+    parser.add_argument('--input', default=None, help='Scripted input file (tick key per line)')
+    parser.add_argument('--seed', type=int, default=None, help='Run seed for terrain, spawns, loot and bosses (random if omitted)')
+    parser.add_argument('--bot', action='store_true', help='Let the scripted bot play (see autoplay.py)')
+    parser.add_argument('--bot-weapon', choices=('1', '2', '3'), default='3', help='Shop key of the weapon the bot buys')
+    parser.add_argument('--report', default=None, help='Write per-wave benchmark stats to this JSON file')
+    parser.add_argument('--enemy-budget', type=int, default=None,
+                        help='Fixed cap on enemies alive at once (default: 60 in headless and '
+                             'fixed-timestep runs, otherwise adapt to frame time)')
+    parser.add_argument('--frame-target-ms', type=float, default=14.0, help='Frame time the adaptive enemy budget aims for')
+    parser.add_argument('--fixed-timestep', action='store_true', help='Use a fixed --dt in the windowed game too')
+    # Ursina and Panda3D read their own flags from sys.argv, so ignore anything unknown
+    options, _ = parser.parse_known_args(argv)
+    return options
+
+
+def load_input_script(path):
+    """[(tick, key), ...] sorted by tick"""
+    events = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            tick, _, key = line.partition(' ')
+            try:
+                events.append((int(tick), key.strip()))
+            except ValueError:
+                print(f"[ERROR 1009] Bad input script line {line_number}: {line!r}")
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def detach_mouse():
+    """Make the mouse work without an OS window
+
+    Locking the cursor asks the window to confine it and reading the mouse
+    position asks the window for its pointer; a headless app has neither
+    (the calls fail on 'none' and offscreen buffers). FirstPersonController
+    and the menus still set mouse.locked and every click reads the position,
+    so locked becomes a plain flag and the pointer stays at screen centre.
+    """
+    mouse_type = type(mouse)
+    mouse_type.locked = property(lambda self: getattr(self, '_locked', False),
+                                 lambda self, value: setattr(self, '_locked', value))
+    mouse_type.x = property(lambda self: 0.0, lambda self, value: None)
+    mouse_type.y = property(lambda self: 0.0, lambda self, value: None)
+
+
+def set_up_camera_lens():
+    """window_type 'none' skips camera.set_up(); give the camera a lens so fov and clip planes still work"""
+    camera.perspective_lens = PerspectiveLens()
+    camera.lens = camera.perspective_lens
+    camera.fov = 40
+    camera.clip_plane_near = 0.1
+    camera.clip_plane_far = 10000
+
+
+def use_fixed_timestep(dt, real_time=False):
+    """Make time.dt exactly dt every frame
+
+    Headless runs don't wait for real time to pass; with real_time the
+    windowed game waits out short frames so it still plays at normal speed.
+    """
+    clock = ClockObject.getGlobalClock()
+    clock.setMode(ClockObject.MForced if real_time else ClockObject.MNonRealTime)
+    clock.setFrameRate(1 / dt)
+
+
+class HeadlessRunner:
+    """Steps the app with a fixed dt, feeding scripted input, until done() or max_ticks"""
+    def __init__(self, app, events=None, max_ticks=36000):
+        self.app = app
+        self.events = list(events or [])
+        self.max_ticks = max_ticks
+        self.ticks = 0
+        self.elapsed = 0.0
+
+    def feed_input(self, tick):
+        while self.events and self.events[0][0] <= tick:
+            _, key = self.events.pop(0)
+            self.app.input(key, is_raw=True)
+
+    def run(self, done=None, on_tick=None):
+        """Run until done() returns True; returns ticks per second of wall time
+
+        on_tick(tick, frame_time) is called after every step with the step's wall time.
+        """
+        clock = wall_time.perf_counter
+        start = clock()
+        while self.ticks < self.max_ticks:
+            if done is not None and done():
+                break
+            self.feed_input(self.ticks)
+            step_start = clock()
+            self.app.step()
+            self.ticks += 1
+            if on_tick is not None:
+                on_tick(self.ticks, clock() - step_start)
+        self.elapsed = clock() - start
+        return self.ticks_per_second
+
+    @property
+    def ticks_per_second(self):
+        return self.ticks / self.elapsed if self.elapsed else 0.0
@@ -0,0 +1,79 @@
+"""
+HUD BINDINGS
+============
+Dirty-tracked HUD text for game2.py. Setting Text.text re-lays out the text
+and regenerates its geometry, so instead of rewriting every HUD widget each
+frame, each widget is bound to a source function that returns the value it
+shows. update() calls the sources and only rebuilds a widget's text when its
+value changed since the last rebuild.
+
+Sources should return display-ready values: round fast-changing numbers to
+the precision they are shown at (see quantize()), so a cooldown shown with
+one decimal only rebuilds ten times a second instead of every frame.
+"""
+
+
+def quantize(value, step=0.1):
+    """Round a value to the display step so tiny changes don't count as changes"""
+    return round(round(value / step) * step, 10)
+
+
+class HudBinding:
+    """One Text widget and the value it is currently showing"""
+    __slots__ = ('widget', 'source', 'render', 'value')
+
+    def __init__(self, widget, source, render):
+        self.widget = widget
+        self.source = source
+        self.render = render
+        self.value = object()  # Never equal to a real value, so the first update always renders
+
+
+class Hud:
+    """Updates bound Text widgets only when their values change"""
+    def __init__(self):
+        self.bindings = []
+        self.rebuilds = 0
+        self.rebuilds_per_second = 0
+        self._window_rebuilds = 0
+        self._window_time = 0.0
+
+    def bind(self, widget, source, render):
+        """Show render(source()) in widget; render returns text or (text, color)"""
+        binding = HudBinding(widget, source, render)
+        self.bindings.append(binding)
+        return binding
+
+    def update(self, dt):
+        for binding in self.bindings:
+            value = binding.source()
+            if value == binding.value:
+                continue
+            binding.value = value
+            shown = binding.render(value)
+            if isinstance(shown, tuple):
+                text, text_color = shown
+                binding.widget.text = text
+                binding.widget.color = text_color
+            else:
+                binding.widget.text = shown
+            self.rebuilds += 1
+            self._window_rebuilds += 1
+
+        self._window_time += dt
+        if self._window_time >= 1.0:
+            self.rebuilds_per_second = self._window_rebuilds / self._window_time
+            self._window_rebuilds = 0
+            self._window_time = 0.0
+
+    def refresh(self):
+        """Force every widget to re-render on the next update"""
+        for binding in self.bindings:
+            binding.value = object()
+
+    def stats(self):
+        return {
+            'widgets': len(self.bindings),
+            'rebuilds': self.rebuilds,
+            'rebuilds_per_second': round(self.rebuilds_per_second, 1),
+        }
@@ -0,0 +1,90 @@
+"""
+MODEL CACHE
+===========
+Enemy and boss models in game2.py are built from many child Entities (one
+per body part), which costs a scene node and a draw call per part for every
+enemy on screen. ModelCache builds each archetype once, flattens the parts
+into a single vertex-colored mesh with ursina's combine(), and hands every
+new enemy a copy of that node. Copies share the same Geom, so the vertex data
+is uploaded once per archetype and each instance renders in one draw call.
+That is still one node and one draw call per enemy: instances of an
+archetype are not instanced in hardware or merged into a single batch, so
+draw calls keep growing with the number of enemies on screen.
+
+Parts that animate independently (like the warlock's orbs) are not part of
+the cached mesh; the caller attaches those to the instance separately.
+
+ursina's built-in 'sphere' has 960 triangles, which dominates frame time on a
+software rasterizer once a wave has dozens of enemies. Sphere parts are
+rebuilt from a lower-resolution sphere (sphere_rings x sphere_segments) when
+an archetype is flattened; pass sphere_rings=None to keep the originals.
+"""
+
+from math import cos, sin, pi
+
+from ursina import Entity, Mesh, destroy
+from panda3d.core import NodePath
+
+
+def sphere_mesh_data(rings=6, segments=10):
+    """Vertices and triangles of a UV sphere with the same 1-unit diameter as ursina's 'sphere'"""
+    vertices = []
+    for ring in range(rings + 1):
+        polar = pi * ring / rings
+        y, r = cos(polar) * 0.5, sin(polar) * 0.5
+        for segment in range(segments):
+            azimuth = 2 * pi * segment / segments
+            vertices.append((cos(azimuth) * r, y, sin(azimuth) * r))
+    triangles = []
+    for ring in range(rings):
+        for segment in range(segments):
+            a = ring * segments + segment
+            b = ring * segments + (segment + 1) % segments
+            c, d = a + segments, b + segments
+            if ring > 0:
+                triangles.append((a, c, b))
+            if ring < rings - 1:
+                triangles.append((b, c, d))
+    return vertices, triangles
+
+
+class ModelCache:
+    """Flattened, shared geometry per model archetype"""
+    def __init__(self, sphere_rings=6, sphere_segments=10):
+        self.sphere_data = sphere_mesh_data(sphere_rings, sphere_segments) if sphere_rings else None
+        self.meshes = {}
+        self.builds = 0
+        self.instances = 0
+
+    def prepare(self, name, builder):
+        """Build and flatten an archetype now instead of on first spawn"""
+        if name not in self.meshes:
+            prototype = builder()
+            if self.sphere_data:
+                self._simplify_spheres(prototype)
+            mesh = prototype.combine()
+            mesh.detachNode()
+            destroy(prototype)
+            self.meshes[name] = mesh
+            self.builds += 1
+        return self.meshes[name]
+
+    def _simplify_spheres(self, prototype):
+        vertices, triangles = self.sphere_data
+        for part in prototype.children:
+            if part.model is not None and part.model.name == 'sphere':
+                part.model = Mesh(vertices=vertices, triangles=triangles)
+
+    def instance(self, name, builder, **kwargs):
+        """Return a new Entity showing the archetype's flattened model"""
+        mesh = self.prepare(name, builder)
+        self.instances += 1
+        return Entity(model=mesh.copyTo(NodePath()), **kwargs)
+
+    def stats(self):
+        return {
+            'archetypes': len(self.meshes),
+            'builds': self.builds,
+            'instances': self.instances,
+            'vertices': {name: len(mesh.vertices) for name, mesh in self.meshes.items()},
+        }
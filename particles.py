@@ -0,0 +1,214 @@
+"""
+PARTICLE EFFECTS
+================
+Transient visual effects for game2.py (wall-run sparks, boss shockwaves,
+magic bursts, teleport flashes), drawn without a Python object or Entity per
+particle.
+
+Each ParticleEmitter owns one dynamic Geom of textured quads. Particle state
+(position, velocity, size, color, timers) lives in NumPy arrays; update(dt)
+advances every particle in one vectorized step, drops the expired ones and
+rewrites the vertex buffer straight from the arrays. An emitter is a single
+draw call however many particles it holds. Quads face the camera, or lie flat
+on the ground for shockwave rings.
+
+ParticleSystem groups the emitters game2.py uses and exposes the effect
+helpers. Rates are per second (scaled by dt), so effects look the same at
+any frame rate.
+"""
+
+import numpy as np
+from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexArrayFormat, GeomVertexData,
+                          GeomVertexFormat, InternalName, NodePath, OmniBoundingVolume, TransparencyAttrib)
+
+from ursina import Entity, camera, color
+
+# Quad corner signs (x, y) and texture coordinates, counter-clockwise
+QUAD_CORNERS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=np.float32)
+QUAD_UVS = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float32)
+QUAD_TRIANGLES = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+
+
+def _particle_format():
+    """Vertex format with position, color and uv in separate arrays so each can be copied from NumPy"""
+    vertex_format = GeomVertexFormat()
+    for name, components, contents in ((InternalName.getVertex(), 3, Geom.C_point),
+                                       (InternalName.getColor(), 4, Geom.C_color),
+                                       (InternalName.getTexcoord(), 2, Geom.C_texcoord)):
+        array = GeomVertexArrayFormat()
+        array.addColumn(name, components, Geom.NT_float32, contents)
+        vertex_format.addArray(array)
+    return GeomVertexFormat.registerFormat(vertex_format)
+
+
+class ParticleEmitter:
+    """Fixed-capacity particle arrays drawn as one dynamic quad mesh"""
+    def __init__(self, texture='circle', capacity=256, max_particles=20000):
+        self.max_particles = max_particles
+        self.count = 0
+        self._allocate(capacity)
+
+        self.vertex_data = GeomVertexData('particles', _particle_format(), Geom.UH_dynamic)
+        self.triangles = GeomTriangles(Geom.UH_dynamic)
+        self.triangles.setIndexType(Geom.NT_uint32)
+        geom = Geom(self.vertex_data)
+        geom.addPrimitive(self.triangles)
+        node = GeomNode('particles')
+        node.addGeom(geom)
+        # Particles move every frame; skip bounds recomputation and never cull the batch
+        node.setBounds(OmniBoundingVolume())
+        node.setFinal(True)
+
+        self.entity = Entity(model=NodePath(node), texture=texture)
+        self.entity.setTransparency(TransparencyAttrib.M_alpha)
+        self.entity.setTwoSided(True)
+        self.entity.setDepthWrite(False)
+        self.entity.setBin('fixed', 10)
+        self._written_count = -1
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 3), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 3), dtype=np.float32)
+        self.sizes = np.zeros(capacity, dtype=np.float32)
+        self.growth = np.zeros(capacity, dtype=np.float32)
+        self.shrink = np.ones(capacity, dtype=np.float32)
+        self.colors = np.zeros((capacity, 4), dtype=np.float32)
+        self.fade = np.zeros(capacity, dtype=np.float32)
+        self.timers = np.zeros(capacity, dtype=np.float32)
+        self.lifetimes = np.zeros(capacity, dtype=np.float32)
+        self.flat = np.zeros(capacity, dtype=bool)
+
+    def _arrays(self):
+        return (self.positions, self.velocities, self.sizes, self.growth, self.shrink,
+                self.colors, self.fade, self.timers, self.lifetimes, self.flat)
+
+    def _grow(self, needed):
+        n = self.count
+        old = self._arrays()
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self._allocate(capacity)
+        for src, dst in zip(old, self._arrays()):
+            dst[:n] = src[:n]
+
+    def emit(self, positions, velocities, sizes, particle_color, lifetime, growth=0, shrink=1, fade=0, flat=False):
+        """Add len(positions) particles. Returns how many were added"""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        k = min(len(positions), self.max_particles - self.count)
+        if k <= 0:
+            return 0
+        if self.count + k > self.capacity:
+            self._grow(self.count + k)
+        s = slice(self.count, self.count + k)
+        self.positions[s] = positions[:k]
+        self.velocities[s] = np.asarray(velocities, dtype=np.float32).reshape(-1, 3)[:k] if velocities is not None else 0
+        self.sizes[s] = sizes
+        self.growth[s] = growth
+        self.shrink[s] = shrink
+        self.colors[s] = tuple(particle_color)
+        self.fade[s] = fade
+        self.timers[s] = 0
+        self.lifetimes[s] = lifetime
+        self.flat[s] = flat
+        self.count += k
+        return k
+
+    def update(self, dt, right=None, up=None):
+        """Advance every particle, drop expired ones and rewrite the mesh"""
+        n = self.count
+        if n:
+            self.timers[:n] += dt
+            alive = (self.timers[:n] < self.lifetimes[:n]) & (self.colors[:n, 3] > 0)
+            if not alive.all():
+                n = int(alive.sum())
+                for array in self._arrays():
+                    array[:n] = array[:self.count][alive]
+                self.count = n
+        if n:
+            self.positions[:n] += self.velocities[:n] * dt
+            self.sizes[:n] += self.growth[:n] * dt
+            self.sizes[:n] *= self.shrink[:n] ** (dt * 60)  # shrink is the factor per 60 fps frame
+            self.colors[:n, 3] -= self.fade[:n] * dt
+        self._write_mesh(right, up)
+
+    def _write_mesh(self, right, up):
+        n = self.count
+        if n == 0 and self._written_count == 0:
+            return
+        right = np.asarray(right if right is not None else (1, 0, 0), dtype=np.float32)
+        up = np.asarray(up if up is not None else (0, 1, 0), dtype=np.float32)
+        flat = self.flat[:n, np.newaxis]
+        axis_a = np.where(flat, np.float32((1, 0, 0)), right)
+        axis_b = np.where(flat, np.float32((0, 0, 1)), up)
+        half = (self.sizes[:n] * 0.5)[:, np.newaxis, np.newaxis]
+        vertices = (self.positions[:n, np.newaxis, :]
+                    + QUAD_CORNERS[np.newaxis, :, 0:1] * half * axis_a[:, np.newaxis, :]
+                    + QUAD_CORNERS[np.newaxis, :, 1:2] * half * axis_b[:, np.newaxis, :])
+        colors = np.repeat(np.clip(self.colors[:n], 0, 1), 4, axis=0)
+
+        self.vertex_data.setNumRows(4 * n)
+        self.vertex_data.modifyArrayHandle(0).copyDataFrom(np.ascontiguousarray(vertices, dtype=np.float32))
+        self.vertex_data.modifyArrayHandle(1).copyDataFrom(colors)
+        if n != self._written_count:
+            # uvs and indices only depend on the particle count
+            self.vertex_data.modifyArrayHandle(2).copyDataFrom(np.tile(QUAD_UVS, (n, 1)))
+            indices = (QUAD_TRIANGLES[np.newaxis, :] + 4 * np.arange(n, dtype=np.uint32)[:, np.newaxis]).reshape(-1)
+            self.triangles.modifyVertices().modifyHandle().copyDataFrom(indices)
+            self._written_count = n
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+
+class ParticleSystem:
+    """The game's particle emitters and effect helpers, advanced by update(dt)"""
+    def __init__(self, capacity=256):
+        self.sparks_emitter = ParticleEmitter('circle', capacity)
+        self.ring_emitter = ParticleEmitter('circle_outlined', capacity)
+        self.glow_emitter = ParticleEmitter('radial_gradient', capacity)
+        self.emitters = (self.sparks_emitter, self.ring_emitter, self.glow_emitter)
+
+    # === Emitters ===
+    def sparks(self, position, rng, count=5, spark_color=color.blue, size=0.1, lifetime=1.0):
+        """Small sparks thrown upward and shrinking (wall-run sparks)"""
+        offsets = [(rng.uniform(-0.5, 0.5), 0, rng.uniform(-0.5, 0.5)) for _ in range(count)]
+        velocities = [(rng.uniform(-2, 2), rng.uniform(1, 3), rng.uniform(-2, 2)) for _ in range(count)]
+        positions = np.array(offsets, dtype=np.float32) + np.array(tuple(position), dtype=np.float32)
+        self.sparks_emitter.emit(positions, velocities, size, spark_color, lifetime, shrink=0.95)
+
+    def shockwave(self, position, wave_color=color.red, growth=2, fade=2, alpha=0.8):
+        """Flat ring that spreads along the ground while fading out"""
+        self.ring_emitter.emit([tuple(position)], None, 1, _with_alpha(wave_color, alpha), alpha / fade,
+                               growth=growth, fade=fade, flat=True)
+
+    def burst(self, position, burst_color=color.cyan, start_scale=0.1, growth=5, fade=2):
+        """Glow that expands in every direction while fading out"""
+        self.glow_emitter.emit([tuple(position)], None, start_scale, burst_color, 1 / fade, growth=growth, fade=fade)
+
+    def flash(self, position, flash_color=color.cyan, size=3, alpha=0.8, fade=2, lifetime=None):
+        """Glow that fades out in place (teleport departure/arrival)"""
+        self.glow_emitter.emit([tuple(position)], None, size, _with_alpha(flash_color, alpha),
+                               lifetime if lifetime is not None else alpha / fade, fade=fade)
+
+    # === Simulation ===
+    def update(self, dt):
+        """Advance every emitter, with quads facing the camera"""
+        right, up = tuple(camera.right), tuple(camera.up)
+        for emitter in self.emitters:
+            emitter.update(dt, right, up)
+
+    def clear(self):
+        for emitter in self.emitters:
+            emitter.clear()
+
+    def __len__(self):
+        return sum(len(emitter) for emitter in self.emitters)
+
+
+def _with_alpha(base_color, alpha):
+    return (base_color[0], base_color[1], base_color[2], alpha)
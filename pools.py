@@ -0,0 +1,220 @@
+"""
+ENTITY POOLS
+============
+Reusable ursina Entities for things game2.py would otherwise create and
+destroy over and over (hitscan tracers, projectile bullets, wave enemies).
+Pooled entities are disabled instead of destroyed and re-enabled on reuse,
+so sustained fire and wave after wave of enemies don't churn Panda3D
+NodePaths or Python objects.
+"""
+
+from ursina import Entity, color, destroy
+
+
+# === Hitscan Tracers ===
+class TracerPool:
+    """Fixed ring of thin tracer beams used to draw hitscan shots
+
+    The oldest tracer is recycled when every tracer is in use, so the pool
+    never allocates after construction.
+    """
+    def __init__(self, size=24, lifetime=0.06, thickness=0.03):
+        self.lifetime = lifetime
+        self.thickness = thickness
+        self.tracers = []
+        for _ in range(size):
+            tracer = Entity(model='cube', color=color.yellow, enabled=False)
+            tracer.timer = 0
+            self.tracers.append(tracer)
+        self.next_index = 0
+        self.spawned = 0
+
+    def spawn(self, start, end, tracer_color=None):
+        """Show a tracer from start to end"""
+        tracer = self.tracers[self.next_index]
+        self.next_index = (self.next_index + 1) % len(self.tracers)
+
+        length = (end - start).length()
+        tracer.enabled = True
+        tracer.position = (start + end) / 2
+        tracer.scale = (self.thickness, self.thickness, max(length, 0.01))
+        tracer.color = tracer_color or color.yellow
+        tracer.alpha = 1
+        if length > 0:
+            tracer.look_at(end)
+        tracer.timer = self.lifetime
+        self.spawned += 1
+        return tracer
+
+    def update(self, dt):
+        """Fade out live tracers and hide expired ones"""
+        for tracer in self.tracers:
+            if not tracer.enabled:
+                continue
+            tracer.timer -= dt
+            if tracer.timer <= 0:
+                tracer.enabled = False
+            else:
+                tracer.alpha = tracer.timer / self.lifetime
+
+    @property
+    def active(self):
+        return sum(1 for tracer in self.tracers if tracer.enabled)
+
+
+# === Bullets ===
+class BulletPool:
+    """Per-weapon pools of Bullet entities, recycled by disabling and re-enabling
+
+    factory(weapon_type) must return a new, disabled bullet with a
+    launch(position, direction) method. Each weapon keeps at most
+    max_free idle bullets; extra bullets created during a burst are
+    destroyed when they come back instead of being kept forever.
+    """
+    def __init__(self, factory, prewarm=None, max_free=32):
+        self.factory = factory
+        self.max_free = max_free
+        self.free = {}
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.high_water = 0
+        for weapon_type, count in (prewarm or {}).items():
+            pool = self.free.setdefault(weapon_type, [])
+            for _ in range(min(count, max_free)):
+                pool.append(self._create(weapon_type))
+
+    def _create(self, weapon_type):
+        bullet = self.factory(weapon_type)
+        bullet.weapon_type = weapon_type
+        bullet.pooled = True  # True while sitting idle in the pool
+        return bullet
+
+    def acquire(self, weapon_type, position, direction):
+        """Get a bullet for a weapon and launch it"""
+        pool = self.free.setdefault(weapon_type, [])
+        if pool:
+            bullet = pool.pop()
+            self.hits += 1
+        else:
+            bullet = self._create(weapon_type)
+            self.misses += 1
+        bullet.pooled = False
+        bullet.launch(position, direction)
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return bullet
+
+    def release(self, bullet):
+        """Return a bullet to its pool. Safe to call more than once"""
+        if bullet.pooled:
+            return
+        bullet.pooled = True
+        bullet.enabled = False
+        self.in_use -= 1
+        pool = self.free.setdefault(bullet.weapon_type, [])
+        if len(pool) < self.max_free:
+            pool.append(bullet)
+        else:
+            destroy(bullet)
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'in_use': self.in_use,
+            'free': sum(len(pool) for pool in self.free.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 1.0,
+            'high_water': self.high_water,
+        }
+
+
+# === Enemies ===
+class EnemyPool:
+    """Per-archetype pools of composite enemies (body, nameplate, collider)
+
+    factory(enemy_type) must return a new, disabled enemy. Killed enemies
+    are released back to their archetype's pool and acquire() resets
+    transform, stats and nameplate before re-enabling one, so later waves
+    reuse the entities of earlier ones instead of rebuilding them.
+    prewarm_step() fills the pools a few enemies at a time, so the gap
+    between waves can be used without a hitch.
+    """
+    def __init__(self, factory, max_free=64):
+        self.factory = factory
+        self.max_free = max_free
+        self.free = {}
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.high_water = 0
+
+    def _create(self, enemy_type):
+        enemy = self.factory(enemy_type)
+        enemy.enemy_type = enemy_type
+        enemy.pooled = True  # True while sitting idle in the pool
+        self.created += 1
+        return enemy
+
+    def acquire(self, enemy_type, position, **stats):
+        """Get an enemy of an archetype at position, with its stats (health, speed, ...) reset"""
+        pool = self.free.setdefault(enemy_type, [])
+        if pool:
+            enemy = pool.pop()
+            self.hits += 1
+        else:
+            enemy = self._create(enemy_type)
+            self.misses += 1
+        enemy.pooled = False
+        enemy.position = position
+        enemy.rotation = (0, 0, 0)
+        for name, value in stats.items():
+            setattr(enemy, name, value)
+        nameplate = getattr(enemy, 'nameplate', None)
+        if nameplate is not None:
+            nameplate.text = enemy_type.upper()
+            nameplate.color = color.white
+        enemy.enabled = True
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return enemy
+
+    def release(self, enemy):
+        """Return an enemy to its pool. Safe to call more than once"""
+        if enemy.pooled:
+            return
+        enemy.pooled = True
+        enemy.enabled = False
+        self.in_use -= 1
+        pool = self.free.setdefault(enemy.enemy_type, [])
+        if len(pool) < self.max_free:
+            pool.append(enemy)
+        else:
+            destroy(enemy)
+
+    def prewarm_step(self, targets, limit=2):
+        """Create up to limit idle enemies toward targets ({type: free count}). True once all are met"""
+        for enemy_type, target in targets.items():
+            pool = self.free.setdefault(enemy_type, [])
+            while len(pool) < min(target, self.max_free):
+                if limit <= 0:
+                    return False
+                pool.append(self._create(enemy_type))
+                limit -= 1
+        return True
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'in_use': self.in_use,
+            'free': {enemy_type: len(pool) for enemy_type, pool in self.free.items()},
+            'created': self.created,
+            'hits': self.hits,
+            'misses': self.misses,
+            'reuse_rate': self.hits / requests if requests else 1.0,
+            'high_water': self.high_water,
+        }
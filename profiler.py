@@ -0,0 +1,144 @@
+"""
+FRAME PROFILER
+==============
+Per-subsystem timings for game2.py's update(). The frame is split into
+named sections with lap markers instead of nested context managers:
+begin() at the top of update(), then lap('hud'), lap('bullets'), ... after
+each section. A lap records the time since the previous marker under that
+name, so sections can be added or removed without reindenting update().
+
+Each section keeps its last `window` samples in a ring buffer; p50/p95/p99
+are computed from that window on demand (a few times per second for the
+debug overlay, once at exit for the dump). Laps within one frame that share
+a name are added together.
+
+When the profiler is disabled begin() and lap() return after one attribute
+check, so the markers can stay in the game loop permanently.
+"""
+
+import csv
+import json
+import time
+
+import numpy as np
+
+
+class SectionTimes:
+    """Rolling window of one section's frame times, in seconds"""
+    __slots__ = ('samples', 'index', 'filled', 'total', 'calls', 'frame_time')
+
+    def __init__(self, window):
+        self.samples = np.zeros(window)
+        self.index = 0
+        self.filled = 0
+        self.total = 0.0
+        self.calls = 0
+        self.frame_time = 0.0  # Accumulated during the current frame
+
+    def push(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.filled = min(self.filled + 1, len(self.samples))
+        self.total += value
+        self.calls += 1
+
+    def percentiles(self, points=(50, 95, 99)):
+        if not self.filled:
+            return [0.0] * len(points)
+        return np.percentile(self.samples[:self.filled], points).tolist()
+
+
+class FrameProfiler:
+    """Lap-based section timer with rolling p50/p95/p99 per section"""
+    def __init__(self, window=600, enabled=False, clock=time.perf_counter):
+        self.window = window
+        self.enabled = enabled
+        self.clock = clock
+        self.sections = {}
+        self.frame_times = SectionTimes(window)
+        self.frames = 0
+        self._last = 0.0
+        self._frame_start = 0.0
+        self._in_frame = False
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._in_frame = False
+
+    # === Markers ===
+    def begin(self):
+        """Start a frame; closes the previous one if end() wasn't called"""
+        if not self.enabled:
+            return
+        now = self.clock()
+        if self._in_frame:
+            self._close_frame(self._last)  # Up to the last marker, so rendering isn't charged to update()
+        self._frame_start = self._last = now
+        self._in_frame = True
+
+    def lap(self, name):
+        """Charge the time since the previous marker to a section"""
+        if not self.enabled or not self._in_frame:
+            return
+        now = self.clock()
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = SectionTimes(self.window)
+        section.frame_time += now - self._last
+        self._last = now
+
+    def end(self):
+        """Finish the frame (update() has several early returns, so begin() also does this)"""
+        if not self.enabled or not self._in_frame:
+            return
+        self._close_frame(self.clock())
+        self._in_frame = False
+
+    def _close_frame(self, now):
+        for section in self.sections.values():
+            section.push(section.frame_time)
+            section.frame_time = 0.0
+        self.frame_times.push(now - self._frame_start)
+        self.frames += 1
+
+    # === Reports ===
+    def report(self):
+        """{section: {'p50', 'p95', 'p99', 'mean', 'frames'}} in milliseconds; 'frame' is the whole update()"""
+        rows = {}
+        for name, section in list(self.sections.items()) + [('frame', self.frame_times)]:
+            p50, p95, p99 = section.percentiles()
+            rows[name] = {
+                'p50': round(p50 * 1000, 3),
+                'p95': round(p95 * 1000, 3),
+                'p99': round(p99 * 1000, 3),
+                'mean': round(section.total * 1000 / section.calls, 3) if section.calls else 0.0,
+                'frames': section.calls,
+            }
+        return rows
+
+    def overlay_lines(self, limit=8):
+        """Slowest sections by p95, formatted for the debug overlay"""
+        if not self.enabled:
+            return ['profiler off']
+        rows = sorted(self.report().items(), key=lambda item: -item[1]['p95'])
+        return [f"{name:<12} {row['p50']:6.2f} {row['p95']:6.2f} {row['p99']:6.2f} ms" for name, row in rows[:limit]]
+
+    def dump(self, path):
+        """Write the report to path as JSON or CSV (chosen by extension)"""
+        rows = self.report()
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['section', 'p50_ms', 'p95_ms', 'p99_ms', 'mean_ms', 'frames'])
+                for name, row in rows.items():
+                    writer.writerow([name, row['p50'], row['p95'], row['p99'], row['mean'], row['frames']])
+        else:
+            with open(path, 'w') as f:
+                json.dump({'frames': self.frames, 'window': self.window, 'sections': rows}, f, indent=2)
+        return path
+
+    def reset(self):
+        self.sections = {}
+        self.frame_times = SectionTimes(self.window)
+        self.frames = 0
+        self._in_frame = False
@@ -0,0 +1,129 @@
+"""
+PROJECTILE SIMULATION
+=====================
+Struct-of-arrays projectile system for game2.py. Positions, directions,
+speeds, timers, damage and radii live in NumPy arrays and every live
+projectile is advanced in one vectorized step per frame; the visible Bullet
+entities are only moved afterwards in sync_visuals(). Expired and
+out-of-range projectiles are dropped by remove_expired() after the frame's
+segments have been hit-tested, so the last stretch a bullet flies can still
+hit.
+
+Live projectiles are kept densely packed in [0, count). Removing one moves
+the last projectile into its slot, so indices are only stable until the next
+remove() call.
+"""
+
+import numpy as np
+
+
+class ProjectileSystem:
+    """Vectorized projectile simulation with optional per-projectile visuals
+
+    on_remove(visual) is called for every projectile that expires, goes out
+    of range or is removed after a hit, so visuals can go back to their pool.
+    """
+    def __init__(self, capacity=256, on_remove=None):
+        self.on_remove = on_remove
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 3))
+        self.prev_positions = np.zeros((capacity, 3))
+        self.directions = np.zeros((capacity, 3))
+        self.speeds = np.zeros(capacity)
+        self.timers = np.zeros(capacity)
+        self.lifetimes = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.radii = np.zeros(capacity)
+        self.visuals = [None] * capacity
+
+    def _grow(self):
+        n = self.count
+        old = (self.positions, self.prev_positions, self.directions, self.speeds,
+               self.timers, self.lifetimes, self.damage, self.radii, self.visuals)
+        self._allocate(self.capacity * 2)
+        new = (self.positions, self.prev_positions, self.directions, self.speeds,
+               self.timers, self.lifetimes, self.damage, self.radii)
+        for src, dst in zip(old, new):
+            dst[:n] = src[:n]
+        self.visuals[:n] = old[-1][:n]
+
+    def spawn(self, position, direction, speed, damage, radius, lifetime=2, visual=None):
+        """Add a projectile and return its current index"""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        d = np.array((direction[0], direction[1], direction[2]), dtype=np.float64)
+        length = np.sqrt(d @ d)
+        self.positions[i] = (position[0], position[1], position[2])
+        self.prev_positions[i] = self.positions[i]
+        self.directions[i] = d / length if length > 0 else d
+        self.speeds[i] = speed
+        self.timers[i] = 0
+        self.lifetimes[i] = lifetime
+        self.damage[i] = damage
+        self.radii[i] = radius
+        self.visuals[i] = visual
+        self.count += 1
+        return i
+
+    def step(self, dt):
+        """Advance every projectile by dt (expiry is separate, so the last segment still gets hit-tested)"""
+        n = self.count
+        if n == 0:
+            return
+        positions = self.positions[:n]
+        self.prev_positions[:n] = positions
+        positions += self.directions[:n] * (self.speeds[:n] * dt)[:, np.newaxis]
+        self.timers[:n] += dt
+
+    def remove_expired(self, center=None, max_range=None):
+        """Drop projectiles past their lifetime or farther than max_range from center"""
+        n = self.count
+        if n == 0:
+            return
+        expired = self.timers[:n] >= self.lifetimes[:n]
+        if center is not None and max_range is not None:
+            offset = self.positions[:n] - np.array((center[0], center[1], center[2]))
+            expired |= np.einsum('ij,ij->i', offset, offset) > max_range * max_range
+        if expired.any():
+            self.remove(np.flatnonzero(expired))
+
+    def segments(self):
+        """(ax, ay, az, bx, by, bz, radius) for the path each projectile travelled last step"""
+        n = self.count
+        return np.hstack((self.prev_positions[:n], self.positions[:n], self.radii[:n, np.newaxis])).tolist()
+
+    def remove(self, indices):
+        """Remove projectiles by index (swap-with-last, so order is not kept)"""
+        arrays = (self.positions, self.prev_positions, self.directions, self.speeds,
+                  self.timers, self.lifetimes, self.damage, self.radii)
+        # Highest index first so a slot we still need to remove is never moved
+        for i in sorted(set(int(i) for i in indices), reverse=True):
+            if i >= self.count:
+                continue
+            last = self.count - 1
+            visual = self.visuals[i]
+            if visual is not None and self.on_remove:
+                self.on_remove(visual)
+            if i != last:
+                for array in arrays:
+                    array[i] = array[last]
+                self.visuals[i] = self.visuals[last]
+            self.visuals[last] = None
+            self.count -= 1
+
+    def clear(self):
+        self.remove(range(self.count))
+
+    def sync_visuals(self):
+        """Copy simulated positions onto the visual entities"""
+        for visual, (x, y, z) in zip(self.visuals, self.positions[:self.count].tolist()):
+            if visual is not None:
+                visual.setPos(x, y, z)
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,34 @@
+"""
+SEEDED RANDOMNESS
+=================
+One seed for a whole game2.py run. Each subsystem draws from its own named
+stream (terrain, level, spawns, loot, bosses, effects) derived from the run
+seed, so a seed plus an input script always produces the same terrain,
+spawn positions, loot rolls and boss ability picks. Streams are independent:
+an extra particle or an extra loot roll doesn't shift where the next enemy
+spawns, so workloads stay comparable between commits that touch only one
+subsystem.
+
+Streams are plain random.Random instances and can be passed anywhere the
+random module was used (rng.uniform, rng.choice, ...).
+"""
+
+import random
+import zlib
+
+
+class RandomService:
+    """Named random.Random streams derived from one run seed"""
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randint(1, 2**31 - 1)
+        self.seed = seed
+        self.streams = {}
+
+    def stream(self, name):
+        """The stream for a subsystem, created on first use"""
+        rng = self.streams.get(name)
+        if rng is None:
+            # crc32 rather than hash(): str hashes are salted per process
+            rng = self.streams[name] = random.Random(self.seed * 1000003 + zlib.crc32(name.encode()))
+        return rng
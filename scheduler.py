@@ -0,0 +1,176 @@
+"""
+EVENT SCHEDULER
+===============
+One place for everything game2.py wants to happen later or every frame:
+delayed callbacks (reload finishing, boss ability wind-ups, power-up
+expiry), repeating timers and per-frame tweens (loot bobbing and glow).
+It replaces invoke() chains that re-scheduled themselves every 0.05 s with
+a new closure and Sequence each time and kept running after their entity was
+destroyed.
+
+Timed events sit in a binary heap keyed by due time; per-frame tweens sit in
+a list. Both are driven by a single update(dt) call from the game loop.
+Every event returns an EventHandle that can be cancelled. An event can have
+an owner entity: cancel_owner() drops all of its events, and events whose
+owner has been destroyed are dropped automatically the next time they would
+run.
+"""
+
+import heapq
+from itertools import count
+
+
+class EventHandle:
+    """A scheduled callback; call cancel() to stop it"""
+    __slots__ = ('callback', 'owner', 'interval', 'due', 'duration', 'elapsed', 'cancelled', '_scheduler')
+
+    def __init__(self, scheduler, callback, owner, interval=None, due=0.0, duration=None):
+        self._scheduler = scheduler
+        self.callback = callback
+        self.owner = owner
+        self.interval = interval
+        self.due = due
+        self.duration = duration
+        self.elapsed = 0.0
+        self.cancelled = False
+
+    def cancel(self):
+        self._scheduler.cancel(self)
+
+    @property
+    def active(self):
+        return not self.cancelled
+
+
+def _owner_gone(owner):
+    """True once an owner entity has been destroyed (its NodePath is empty)"""
+    is_empty = getattr(owner, 'is_empty', None)
+    return is_empty is not None and is_empty()
+
+
+class Scheduler:
+    """Heap-based timer queue plus per-frame tweens, advanced by update(dt)"""
+    def __init__(self):
+        self.time = 0.0
+        self._heap = []
+        self._order = count()
+        self._tweens = []
+        self._by_owner = {}
+        # Instrumentation
+        self.scheduled = 0
+        self.fired = 0
+        self.cancelled = 0
+
+    # === Scheduling ===
+    def after(self, delay, callback, owner=None):
+        """Run callback() once, delay seconds from now"""
+        handle = EventHandle(self, callback, owner, due=self.time + delay)
+        heapq.heappush(self._heap, (handle.due, next(self._order), handle))
+        return self._track(handle)
+
+    def every(self, interval, callback, owner=None):
+        """Run callback() every interval seconds until cancelled"""
+        handle = EventHandle(self, callback, owner, interval=interval, due=self.time + interval)
+        heapq.heappush(self._heap, (handle.due, next(self._order), handle))
+        return self._track(handle)
+
+    def each_frame(self, callback, owner=None, duration=None):
+        """Run callback(dt) every update, for duration seconds or until cancelled
+
+        The tween also stops when the callback returns True.
+        """
+        handle = EventHandle(self, callback, owner, duration=duration)
+        self._tweens.append(handle)
+        return self._track(handle)
+
+    def _track(self, handle):
+        self.scheduled += 1
+        if handle.owner is not None:
+            self._by_owner.setdefault(id(handle.owner), []).append(handle)
+        return handle
+
+    def _untrack(self, handle):
+        if handle.owner is None:
+            return
+        handles = self._by_owner.get(id(handle.owner))
+        if handles is not None:
+            if handle in handles:
+                handles.remove(handle)
+            if not handles:
+                del self._by_owner[id(handle.owner)]
+
+    # === Cancellation ===
+    def cancel(self, handle):
+        """Cancel one event. Heap entries are dropped lazily when they come due"""
+        if handle is None or handle.cancelled:
+            return
+        handle.cancelled = True
+        self.cancelled += 1
+        self._untrack(handle)
+
+    def cancel_owner(self, owner):
+        """Cancel every event owned by an entity (call before or after destroying it)"""
+        for handle in list(self._by_owner.get(id(owner), ())):
+            self.cancel(handle)
+
+    def clear(self):
+        for handle in [entry[2] for entry in self._heap] + self._tweens:
+            self.cancel(handle)
+        self._heap.clear()
+        self._tweens.clear()
+
+    # === Update ===
+    def update(self, dt):
+        """Advance time by dt, run due events and step tweens"""
+        self.time += dt
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            _, _, handle = heapq.heappop(heap)
+            if handle.cancelled:
+                continue
+            if handle.owner is not None and _owner_gone(handle.owner):
+                self.cancel(handle)
+                continue
+            if handle.interval is not None:
+                handle.due += handle.interval
+                heapq.heappush(heap, (handle.due, next(self._order), handle))
+            else:
+                handle.cancelled = True  # Finished; cancelling it later is a no-op
+                self._untrack(handle)
+            self.fired += 1
+            handle.callback()
+
+        if self._tweens:
+            # Tweens started by a callback during this pass land in the fresh list
+            tweens, self._tweens = self._tweens, []
+            live = []
+            for handle in tweens:
+                if handle.cancelled:
+                    continue
+                if handle.owner is not None and _owner_gone(handle.owner):
+                    self.cancel(handle)
+                    continue
+                handle.elapsed += dt
+                self.fired += 1
+                done = handle.callback(dt)
+                if done or (handle.duration is not None and handle.elapsed >= handle.duration):
+                    handle.cancelled = True
+                    self._untrack(handle)
+                elif not handle.cancelled:
+                    live.append(handle)
+            self._tweens = live + self._tweens
+
+    @property
+    def pending(self):
+        """Live timed events plus live tweens"""
+        return sum(1 for entry in self._heap if not entry[2].cancelled) + sum(1 for t in self._tweens if not t.cancelled)
+
+    def stats(self):
+        return {
+            'pending': self.pending,
+            'heap_size': len(self._heap),
+            'tweens': len(self._tweens),
+            'scheduled': self.scheduled,
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+        }
@@ -0,0 +1,293 @@
+"""
+SPATIAL QUERIES
+===============
+Broad-phase and narrow-phase helpers for game2.py collision checks that used
+to go through Panda3D collider traversals for every pair of entities.
+
+SpatialHashGrid buckets entities into uniform cells on the ground (x/z)
+plane, so a bullet only has to look at the few enemies in its neighbourhood.
+Enemies and bosses are treated as vertical capsules (feet at entity.y, a
+radius and a height) and bullets as spheres swept along the segment they
+travelled this frame, so fast bullets cannot tunnel through thin targets.
+(Single ray queries, for hitscan and the grapple, go through bvh.py.)
+WallIndex holds the side faces of runnable walls for wall-run detection.
+neighbour_pairs() finds every close pair among many points at once, for
+crowd steering.
+"""
+
+from math import floor, sqrt
+import numpy as np
+
+
+# === Uniform Spatial Hash ===
+class SpatialHashGrid:
+    """Uniform grid over the x/z plane, rebuilt every frame
+
+    Each item is stored once, in the cell that contains its centre. Queries
+    widen their search by the largest item radius inserted since the last
+    clear(), so items that straddle a cell border are still found without
+    inserting them into several cells.
+    """
+    def __init__(self, cell_size=4.0):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.max_radius = 0.0
+        self.count = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.max_radius = 0.0
+        self.count = 0
+
+    def cell_of(self, x, z):
+        return floor(x / self.cell_size), floor(z / self.cell_size)
+
+    def insert(self, item, x, z, radius=0.0):
+        key = (floor(x / self.cell_size), floor(z / self.cell_size))
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+        if radius > self.max_radius:
+            self.max_radius = radius
+        self.count += 1
+
+    def query(self, x, z, radius=0.0):
+        """All items whose cell could overlap a circle at (x, z)"""
+        reach = radius + self.max_radius
+        size = self.cell_size
+        x0, x1 = floor((x - reach) / size), floor((x + reach) / size)
+        z0, z1 = floor((z - reach) / size), floor((z + reach) / size)
+        cells = self.cells
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cz in range(z0, z1 + 1):
+                bucket = cells.get((cx, cz))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def query_segment(self, ax, az, bx, bz, radius=0.0):
+        """All items whose cell could overlap a swept circle from (ax, az) to (bx, bz)"""
+        reach = radius + self.max_radius
+        size = self.cell_size
+        x0, x1 = floor((min(ax, bx) - reach) / size), floor((max(ax, bx) + reach) / size)
+        z0, z1 = floor((min(az, bz) - reach) / size), floor((max(az, bz) + reach) / size)
+        cells = self.cells
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cz in range(z0, z1 + 1):
+                bucket = cells.get((cx, cz))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def __len__(self):
+        return self.count
+
+
+# === Narrow Phase ===
+def sphere_capsule_overlap(px, py, pz, radius, cx, cy, cz, cap_radius, cap_height):
+    """Sphere at (px, py, pz) vs vertical capsule whose base is at (cx, cy, cz)
+
+    The capsule's core segment runs from cy + cap_radius to
+    cy + cap_height - cap_radius, so cap_height is the full standing height.
+    """
+    bottom = cy + cap_radius
+    top = cy + cap_height - cap_radius
+    if top < bottom:
+        top = bottom
+    # Closest point on the core segment is just a clamp on y
+    if py < bottom:
+        dy = py - bottom
+    elif py > top:
+        dy = py - top
+    else:
+        dy = 0.0
+    dx = px - cx
+    dz = pz - cz
+    reach = radius + cap_radius
+    return dx * dx + dy * dy + dz * dz <= reach * reach
+
+def segment_capsule_hit(ax, ay, az, bx, by, bz, radius, cx, cy, cz, cap_radius, cap_height):
+    """Swept sphere from a to b vs vertical capsule based at (cx, cy, cz)
+
+    Returns the fraction along a->b (0..1) where the sphere first touches the
+    capsule, or None if it never does.
+    """
+    bottom = cy + cap_radius
+    top = cy + cap_height - cap_radius
+    if top < bottom:
+        top = bottom
+    reach = radius + cap_radius
+
+    # Closest points between segment a->b and the capsule core (cx, bottom..top, cz)
+    dx, dy, dz = bx - ax, by - ay, bz - az
+    core = top - bottom
+    rx, ry, rz = ax - cx, ay - bottom, az - cz
+    seg_len2 = dx * dx + dy * dy + dz * dz
+    if seg_len2 < 1e-12:
+        return 0.0 if sphere_capsule_overlap(ax, ay, az, radius, cx, cy, cz, cap_radius, cap_height) else None
+
+    # Core direction is +y, so the dot products collapse to single terms
+    b = dy * core
+    c = dx * rx + dy * ry + dz * rz
+    f = ry * core
+    core_len2 = core * core
+    if core_len2 < 1e-12:
+        t = min(max(-c / seg_len2, 0.0), 1.0)
+        s = 0.0
+    else:
+        denom = seg_len2 * core_len2 - b * b
+        t = min(max((b * f - c * core_len2) / denom, 0.0), 1.0) if denom > 1e-12 else 0.0
+        s = (b * t + f) / core_len2
+        if s < 0.0:
+            s = 0.0
+            t = min(max(-c / seg_len2, 0.0), 1.0)
+        elif s > 1.0:
+            s = 1.0
+            t = min(max((b - c) / seg_len2, 0.0), 1.0)
+
+    px = rx + dx * t
+    py = ry + dy * t - core * s
+    pz = rz + dz * t
+    dist2 = px * px + py * py + pz * pz
+    if dist2 > reach * reach:
+        return None
+    # Back off from the closest approach to roughly where the sphere first made contact
+    return max(0.0, t - sqrt(reach * reach - dist2) / sqrt(seg_len2))
+
+def sweep_hits(grid, segments):
+    """First target hit by each swept segment, in one pass over the grid
+
+    segments is a list of (ax, ay, az, bx, by, bz, radius). Items in the grid
+    need x/y/z plus hit_radius and hit_height. Returns a list with one
+    (target, t) tuple or None per segment.
+    """
+    results = []
+    for ax, ay, az, bx, by, bz, radius in segments:
+        best = None
+        best_t = 2.0
+        for target in grid.query_segment(ax, az, bx, bz, radius):
+            t = segment_capsule_hit(ax, ay, az, bx, by, bz, radius,
+                                    target.x, target.y, target.z,
+                                    target.hit_radius, target.hit_height)
+            if t is not None and t < best_t:
+                best, best_t = target, t
+        results.append((best, best_t) if best is not None else None)
+    return results
+
+
+# === Vectorized Neighbour Pairs ===
+# (dx, dz) cell offsets covering each pair of neighbouring cells exactly once
+HALF_NEIGHBOURHOOD = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+def neighbour_pairs(xs, zs, radius):
+    """Index arrays (i, j) of every pair of points closer than radius, each pair once
+
+    Points are binned into cells of size radius by sorting their cell keys,
+    so each point is only compared with the points in its own and adjacent
+    cells. The cost grows with the number of points times their local
+    density rather than with the square of the count.
+    """
+    n = len(xs)
+    if n < 2:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    cx = np.floor(xs / radius).astype(np.int64)
+    cz = np.floor(zs / radius).astype(np.int64)
+    cx -= cx.min()
+    cz -= cz.min()
+    width = int(cx.max()) + 3  # An empty column on each side, so offsets never wrap to the next row
+    keys = (cz + 1) * width + (cx + 1)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    index = np.arange(n)
+
+    found_i, found_j = [], []
+    for dx, dz in HALF_NEIGHBOURHOOD:
+        target = keys + dz * width + dx
+        start = np.searchsorted(sorted_keys, target, 'left')
+        counts = np.searchsorted(sorted_keys, target, 'right') - start
+        total = int(counts.sum())
+        if not total:
+            continue
+        i = np.repeat(index, counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[np.repeat(start, counts) + within]
+        if dx == 0 and dz == 0:
+            keep = i < j  # Same cell: skip self-pairs and the mirrored duplicate
+            i, j = i[keep], j[keep]
+        found_i.append(i)
+        found_j.append(j)
+    if not found_i:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    i, j = np.concatenate(found_i), np.concatenate(found_j)
+    ddx, ddz = xs[i] - xs[j], zs[i] - zs[j]
+    close = ddx * ddx + ddz * ddz < radius * radius
+    return i[close], j[close]
+
+
+# === Wall Running Surfaces ===
+class WallIndex:
+    """Vertical faces of static boxes, bucketed by the x/z cells they can be reached from
+
+    Each side face of a box is stored as a rectangle with an outward normal.
+    A face is registered in every cell within reach of its footprint, so a
+    query only looks at the faces listed in the player's own cell no matter
+    how many walls the level has.
+    """
+    def __init__(self, reach, cell_size=8.0):
+        self.reach = float(reach)
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.faces = []
+
+    def add_box(self, item, center, size):
+        """Register the four side faces of an axis-aligned box"""
+        cx, cy, cz = center
+        hx, hy, hz = (abs(s) / 2 for s in size)
+        bottom, top = cy - hy, cy + hy
+        # (normal x, normal z, plane point x, plane point z, half extent along the face)
+        for nx, nz, px, pz, half in ((1, 0, cx + hx, cz, hz), (-1, 0, cx - hx, cz, hz),
+                                     (0, 1, cx, cz + hz, hx), (0, -1, cx, cz - hz, hx)):
+            self._insert((item, nx, nz, px, pz, half, bottom, top))
+
+    def _insert(self, face):
+        _, nx, nz, px, pz, half, _, _ = face
+        # Footprint of the face on the ground plane (tangent runs along z when the normal is along x)
+        ex, ez = (self.reach, half) if nx else (half, self.reach)
+        size = self.cell_size
+        x0, x1 = floor((px - ex) / size), floor((px + ex) / size)
+        z0, z1 = floor((pz - ez) / size), floor((pz + ez) / size)
+        for cx in range(x0, x1 + 1):
+            for cz in range(z0, z1 + 1):
+                self.cells.setdefault((cx, cz), []).append(face)
+        self.faces.append(face)
+
+    def nearest(self, x, y, z, max_distance=None):
+        """Closest face the point is in front of. Returns (item, (nx, nz), distance) or None"""
+        max_distance = self.reach if max_distance is None else min(max_distance, self.reach)
+        bucket = self.cells.get((floor(x / self.cell_size), floor(z / self.cell_size)))
+        if not bucket:
+            return None
+        best = None
+        best_dist = max_distance
+        for face in bucket:
+            item, nx, nz, px, pz, half, bottom, top = face
+            # Signed distance in front of the plane; behind it means the other side of the wall
+            front = (x - px) * nx + (z - pz) * nz
+            if front < 0 or front > best_dist:
+                continue
+            along = (z - pz) if nx else (x - px)
+            over = abs(along) - half
+            over = over if over > 0 else 0.0
+            above = y - top if y > top else (bottom - y if y < bottom else 0.0)
+            dist = sqrt(front * front + over * over + above * above)
+            if dist <= best_dist:
+                best_dist = dist
+                best = (item, (nx, nz), dist)
+        return best
+
+    def __len__(self):
+        return len(self.faces)
@@ -0,0 +1,98 @@
+"""
+SPAWN DIRECTOR
+==============
+Trickles wave spawns in over several frames under a cap on how many enemies
+can be alive at once, instead of spawn_wave() creating the whole wave in a
+single frame.
+
+spawn_wave() queues the wave's spawns; update() runs a few of them per
+frame while the number alive is under the budget. A wave still contains
+all of its enemies, later ones arrive as earlier ones die.
+
+The budget is either fixed (set per machine with --enemy-budget) or adapts
+to measured frame time: while frames run over the target it shrinks by 10%
+per adjustment (down to min_budget), while they run comfortably under it
+grows by one. Frame time is measured with the wall clock between update()
+calls, so it is the real cost of a frame even when time.dt is fixed. That
+makes adaptive mode depend on machine speed: the number of enemies alive,
+and everything downstream of it, is not reproducible from a seed. Runs that
+need to be (headless, fixed timestep, benchmarks) use a fixed budget.
+"""
+
+import time
+from collections import deque
+
+
+class SpawnDirector:
+    """Queue of pending spawns released under a concurrent-alive budget"""
+    def __init__(self, budget=60, per_frame=2, adaptive=True, target_ms=14.0,
+                 min_budget=20, max_budget=200, adjust_interval=0.5):
+        self.budget = budget
+        self.per_frame = per_frame
+        self.adaptive = adaptive
+        self.target_ms = target_ms
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.adjust_interval = adjust_interval
+        self.pending = deque()
+        self.frame_ms = 0.0             # Smoothed wall-clock frame time
+        self._last_update = None
+        self._adjust_timer = 0.0
+        # Instrumentation
+        self.spawned = 0
+        self.peak_pending = 0
+        self.budget_changes = 0
+
+    def enqueue(self, spawn, count=1):
+        """Queue count calls of spawn()"""
+        self.pending.extend([spawn] * count)
+        self.peak_pending = max(self.peak_pending, len(self.pending))
+
+    def clear(self):
+        self.pending.clear()
+
+    def update(self, dt, alive):
+        """Release queued spawns while alive is under the budget; returns how many spawned"""
+        if self.adaptive:
+            self._adapt(dt)
+        released = 0
+        while self.pending and released < self.per_frame and alive + released < self.budget:
+            spawn = self.pending.popleft()
+            try:
+                spawn()
+            except Exception as spawn_error:
+                print(f"[ERROR 1010] Queued spawn failed: {spawn_error}")
+            released += 1
+        self.spawned += released
+        return released
+
+    def _adapt(self, dt):
+        now = time.perf_counter()
+        if self._last_update is not None:
+            frame_ms = (now - self._last_update) * 1000
+            self.frame_ms = frame_ms if not self.frame_ms else self.frame_ms * 0.9 + frame_ms * 0.1
+        self._last_update = now
+
+        self._adjust_timer += dt
+        if self._adjust_timer < self.adjust_interval or not self.frame_ms:
+            return
+        self._adjust_timer = 0.0
+        budget = self.budget
+        if self.frame_ms > self.target_ms:
+            budget = max(self.min_budget, int(budget * 0.9))
+        elif self.frame_ms < self.target_ms * 0.75 and self.pending:
+            budget = min(self.max_budget, budget + 1)  # Only grow while enemies are actually waiting
+        if budget != self.budget:
+            self.budget = budget
+            self.budget_changes += 1
+
+    def stats(self):
+        return {
+            'budget': self.budget,
+            'adaptive': self.adaptive,
+            'pending': len(self.pending),
+            'peak_pending': self.peak_pending,
+            'spawned': self.spawned,
+            'frame_ms': round(self.frame_ms, 2),
+            'budget_changes': self.budget_changes,
+        }
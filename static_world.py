@@ -0,0 +1,88 @@
+"""
+STATIC WORLD
+============
+Batches the level's static boxes (obstacles, boundary walls, arena and corner
+walls, platforms) for game2.py. Instead of one Entity, model node and
+collider per box, each box is a plain StaticBox record; build() merges every
+box that shares a texture into one vertex-colored mesh and gives that batch a
+single collider holding one CollisionBox per box. Raycasts (player movement,
+grapple) still hit the individual boxes, but the level renders in a handful
+of draw calls.
+"""
+
+import numpy as np
+from panda3d.core import CollisionBox, Point3
+
+from ursina import Entity, Mesh, Vec3, load_model
+from ursina.collider import Collider
+
+
+class StaticBox:
+    """One axis-aligned level box (an Entity stand-in for code that reads position/scale)"""
+    def __init__(self, position, scale, color, texture=None):
+        self.position = Vec3(*position)
+        self.scale = Vec3(*scale)
+        self.color = color
+        self.texture = texture
+
+    # Static boxes live at the scene root, so local and world transforms match
+    @property
+    def world_position(self):
+        return self.position
+
+    @property
+    def world_scale(self):
+        return self.scale
+
+
+class StaticWorld:
+    """Collects StaticBoxes and merges them into per-texture batches"""
+    def __init__(self):
+        self.boxes = []
+        self.batches = []
+
+    def add(self, position, scale, color, texture=None):
+        box = StaticBox(position, scale, color, texture)
+        self.boxes.append(box)
+        return box
+
+    def build(self):
+        """Create the batched meshes and colliders. Returns (estimated before, measured after) node/draw-call counts
+
+        The unbatched layout is never built, so its counts are estimated from
+        what it used per box; the batched counts are read from the scene graph.
+        """
+        cube = load_model('cube', use_deepcopy=True)
+        cube_vertices = np.array([tuple(v) for v in cube.vertices], dtype=np.float32)
+        cube_triangles = np.array(cube.triangles, dtype=np.uint32).reshape(-1)
+        cube_uvs = np.array([tuple(uv) for uv in cube.uvs], dtype=np.float32)
+
+        groups = {}
+        for box in self.boxes:
+            groups.setdefault(box.texture, []).append(box)
+
+        for texture, boxes in groups.items():
+            n = len(boxes)
+            offsets = np.array([tuple(box.position) for box in boxes], dtype=np.float32)
+            scales = np.array([tuple(box.scale) for box in boxes], dtype=np.float32)
+            vertices = cube_vertices[np.newaxis] * scales[:, np.newaxis] + offsets[:, np.newaxis]
+            triangles = cube_triangles[np.newaxis] + (np.arange(n, dtype=np.uint32) * len(cube_vertices))[:, np.newaxis]
+            colors = np.repeat(np.array([tuple(box.color) for box in boxes], dtype=np.float32), len(cube_vertices), axis=0)
+
+            batch = Entity(
+                model=Mesh(vertices=vertices.reshape(-1).tolist(), triangles=triangles.reshape(-1).tolist(),
+                           uvs=np.tile(cube_uvs, (n, 1)).reshape(-1).tolist(), colors=colors.tolist(), mode='triangle'),
+                texture=texture,
+            )
+            solids = [CollisionBox(Point3(*box.position), *(max(0.001, s / 2) for s in box.scale)) for box in boxes]
+            batch.collider = Collider(batch, solids)
+            batch.boxes = boxes
+            self.batches.append(batch)
+
+        # Estimate: one Entity per box had a model GeomNode and a CollisionNode, one draw call each
+        before = {'nodes': len(self.boxes) * 3, 'draw_calls': len(self.boxes)}
+        # Measured: every node under the batches, and one draw call per Geom in their GeomNodes
+        geom_nodes = [path.node() for batch in self.batches for path in batch.findAllMatches('**/+GeomNode')]
+        after = {'nodes': sum(1 + batch.findAllMatches('**').getNumPaths() for batch in self.batches),
+                 'draw_calls': sum(node.getNumGeoms() for node in geom_nodes)}
+        return before, after
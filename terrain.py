@@ -0,0 +1,251 @@
+"""
+PROCEDURAL TERRAIN
+==================
+NumPy terrain builder for game2.py. Produces the heightfield, vertices, UVs and
+triangle indices in bulk instead of one PerlinNoise call per vertex, and keeps
+the generated heightfield in a .npy cache keyed by seed and resolution so a
+restart with the same seed skips generation entirely. Every launch without a
+fixed seed picks a new one, so the cache keeps only the most recently used
+files (TERRAIN_CACHE_MAX_FILES) instead of growing without limit. Heightfield
+provides constant-time ground height queries over the same grid for grounded
+checks and for keeping entities on the surface.
+
+The noise matches the perlin_noise package (PerlinNoise(octaves, seed)) so the
+cached and freshly generated terrain look exactly like the old per-vertex loop.
+"""
+
+import os
+import random
+import numpy as np
+
+# Where generated heightfields are stored between runs
+TERRAIN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'terrain_cache')
+
+# Bump this if the noise function changes so old cache files are ignored
+TERRAIN_CACHE_VERSION = 1
+
+# Oldest cache files beyond this count are deleted after each write
+TERRAIN_CACHE_MAX_FILES = 16
+
+
+# === Noise ===
+def _lattice_gradient(seed, cx, cz):
+    """Gradient vector PerlinNoise uses for lattice point (cx, cz)"""
+    # Same hash and sampling as perlin_noise.tools.hasher / sample_vector
+    coord_hash = max(1, int(abs(cx + 10 * cz + 1)))
+    rng = random.Random(seed * coord_hash)
+    return rng.uniform(-1, 1), rng.uniform(-1, 1)
+
+def _fade(t):
+    """Perlin smoothstep (6t^5 - 15t^4 + 10t^3)"""
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+def perlin_grid(seed, res, octaves=4, extent=3):
+    """Sample 2D Perlin noise on a res x res grid, indexed [z, x]
+
+    Equivalent to calling PerlinNoise(octaves, seed)([x/res*extent, z/res*extent])
+    for every grid point, but evaluated in one vectorized pass.
+    """
+    coords = np.arange(res, dtype=np.float64) / res * extent * octaves
+    cells = np.floor(coords).astype(np.int64)
+    frac = coords - cells
+
+    # Gradients for every lattice point the grid touches (a handful, not res^2)
+    n_cells = int(cells[-1]) + 2
+    gradients = np.empty((n_cells, n_cells, 2), dtype=np.float64)
+    for cz in range(n_cells):
+        for cx in range(n_cells):
+            gradients[cz, cx] = _lattice_gradient(seed, cx, cz)
+
+    # Broadcast x along columns and z along rows
+    fx = frac[np.newaxis, :]
+    fz = frac[:, np.newaxis]
+    cx0 = cells[np.newaxis, :]
+    cz0 = cells[:, np.newaxis]
+
+    heights = np.zeros((res, res), dtype=np.float64)
+    for ox in (0, 1):
+        dx = fx - ox
+        wx = _fade(1 - np.abs(dx))
+        for oz in (0, 1):
+            dz = fz - oz
+            wz = _fade(1 - np.abs(dz))
+            g = gradients[cz0 + oz, cx0 + ox]
+            heights += wx * wz * (g[..., 0] * dx + g[..., 1] * dz)
+    return heights
+
+
+# === Heightfield Cache ===
+def heightfield_cache_path(seed, res, octaves=4, cache_dir=None):
+    """Cache file for a given seed and resolution"""
+    cache_dir = cache_dir or TERRAIN_CACHE_DIR
+    return os.path.join(cache_dir, f'heightfield_v{TERRAIN_CACHE_VERSION}_s{seed}_r{res}_o{octaves}.npy')
+
+def prune_heightfield_cache(cache_dir=None, keep=TERRAIN_CACHE_MAX_FILES):
+    """Delete all but the keep most recently used heightfield files"""
+    cache_dir = cache_dir or TERRAIN_CACHE_DIR
+    try:
+        paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                 if name.startswith('heightfield_') and name.endswith('.npy')]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[keep:]:
+            os.remove(path)
+    except OSError as e:
+        print(f'[WARNING] Failed to prune terrain cache {cache_dir}: {e}')
+
+def load_or_build_heightfield(seed, res, octaves=4, amplitude=3, cache_dir=None, use_cache=True):
+    """Return the (res, res) heightfield for a seed, generating and caching it if needed"""
+    path = heightfield_cache_path(seed, res, octaves, cache_dir)
+
+    if use_cache and os.path.exists(path):
+        try:
+            noise = np.load(path)
+            if noise.shape == (res, res):
+                os.utime(path)  # Mark as recently used so pruning keeps it
+                return noise * amplitude
+            print(f'[WARNING] Terrain cache {path} has wrong shape {noise.shape}, regenerating')
+        except Exception as e:
+            print(f'[WARNING] Failed to read terrain cache {path}: {e}')
+
+    # Keep exactly what the cache stores, so a cold build matches every later cached run
+    noise = perlin_grid(seed, res, octaves=octaves).astype(np.float32)
+
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            np.save(path, noise)
+            prune_heightfield_cache(os.path.dirname(path))
+        except Exception as e:
+            print(f'[WARNING] Failed to write terrain cache {path}: {e}')
+
+    return noise * amplitude
+
+
+# === Mesh Arrays ===
+def build_terrain_arrays(heights):
+    """Build flat vertex, UV and triangle arrays for a square heightfield
+
+    Vertices are laid out row by row (z outer, x inner) at integer grid
+    coordinates centred on the origin, same as the original per-vertex loop.
+    Returns float32 vertices (res*res*3), float32 uvs (res*res*2) and uint32
+    triangles ((res-1)^2 * 6), ready to hand straight to ursina's Mesh.
+    """
+    res = heights.shape[0]
+    half = res // 2
+    grid = np.arange(res, dtype=np.float32)
+    xs, zs = np.meshgrid(grid, grid)
+
+    verts = np.empty((res, res, 3), dtype=np.float32)
+    verts[..., 0] = xs - half
+    verts[..., 1] = heights
+    verts[..., 2] = zs - half
+
+    uvs = np.empty((res, res, 2), dtype=np.float32)
+    uvs[..., 0] = xs / res
+    uvs[..., 1] = zs / res
+
+    # Two triangles per quad: (i, i+1, i+res) and (i+1, i+res+1, i+res)
+    quad = np.arange(res - 1, dtype=np.uint32)
+    i = (quad[np.newaxis, :] + quad[:, np.newaxis] * res).ravel()
+    tris = np.empty((i.size, 6), dtype=np.uint32)
+    tris[:, 0] = i
+    tris[:, 1] = i + 1
+    tris[:, 2] = i + res
+    tris[:, 3] = i + 1
+    tris[:, 4] = i + res + 1
+    tris[:, 5] = i + res
+
+    return verts.ravel(), uvs.ravel(), tris.ravel()
+
+
+# === Heightfield Queries ===
+class Heightfield:
+    """Ground height lookups over a terrain grid, in world units
+
+    Mirrors the terrain Entity transform: grid index (ix, iz) sits at world
+    ((ix - res//2) * cell_size, (iz - res//2) * cell_size). Queries are
+    bilinear between the four surrounding samples and clamp to the grid
+    edge, so every lookup is constant time with no mesh raycasts.
+    """
+    def __init__(self, heights, cell_size=1.0):
+        self.heights = np.asarray(heights, dtype=np.float64)
+        self.res = self.heights.shape[0]
+        self.cell_size = float(cell_size)
+        self.half = self.res // 2
+        # Plain lists keep the scalar path free of NumPy per-call overhead
+        self._rows = self.heights.tolist()
+
+    def height_at(self, x, z):
+        """Terrain height at world (x, z)"""
+        gx = x / self.cell_size + self.half
+        gz = z / self.cell_size + self.half
+        last = self.res - 1
+        gx = min(max(gx, 0.0), last)
+        gz = min(max(gz, 0.0), last)
+        ix = min(int(gx), last - 1)
+        iz = min(int(gz), last - 1)
+        fx = gx - ix
+        fz = gz - iz
+        row0 = self._rows[iz]
+        row1 = self._rows[iz + 1]
+        h0 = row0[ix] + (row0[ix + 1] - row0[ix]) * fx
+        h1 = row1[ix] + (row1[ix + 1] - row1[ix]) * fx
+        return h0 + (h1 - h0) * fz
+
+    def heights_at(self, xs, zs):
+        """Terrain heights for arrays of world x and z positions"""
+        last = self.res - 1
+        gx = np.clip(np.asarray(xs, dtype=np.float64) / self.cell_size + self.half, 0, last)
+        gz = np.clip(np.asarray(zs, dtype=np.float64) / self.cell_size + self.half, 0, last)
+        ix = np.minimum(gx.astype(np.int64), last - 1)
+        iz = np.minimum(gz.astype(np.int64), last - 1)
+        fx = gx - ix
+        fz = gz - iz
+        h = self.heights
+        h0 = h[iz, ix] + (h[iz, ix + 1] - h[iz, ix]) * fx
+        h1 = h[iz + 1, ix] + (h[iz + 1, ix + 1] - h[iz + 1, ix]) * fx
+        return h0 + (h1 - h0) * fz
+
+    def height_above(self, position):
+        """How far a world position is above the terrain surface"""
+        return position[1] - self.height_at(position[0], position[2])
+
+    def is_grounded(self, position, tolerance=0.1):
+        """True if a world position is on (or below) the terrain surface"""
+        return self.height_above(position) <= tolerance
+
+    def resolve_collision(self, entity, offset=0):
+        """Push an entity back up if it sank into the terrain. Returns True if it did"""
+        ground = self.height_at(entity.x, entity.z) + offset
+        if entity.y < ground:
+            entity.y = ground
+            return True
+        return False
+
+    def raycast(self, origin, direction, max_dist):
+        """Distance along a normalized ray to the terrain surface, or None
+
+        Marches in half-cell steps and bisects the step where the ray first
+        drops below the surface.
+        """
+        ox, oy, oz = origin[0], origin[1], origin[2]
+        dx, dy, dz = direction[0], direction[1], direction[2]
+        step = self.cell_size * 0.5
+        prev = 0.0
+        if oy - self.height_at(ox, oz) <= 0:
+            return 0.0
+        dist = step
+        while prev < max_dist:
+            dist = min(dist, max_dist)
+            if oy + dy * dist - self.height_at(ox + dx * dist, oz + dz * dist) <= 0:
+                lo, hi = prev, dist
+                for _ in range(8):
+                    mid = (lo + hi) * 0.5
+                    if oy + dy * mid - self.height_at(ox + dx * mid, oz + dz * mid) <= 0:
+                        hi = mid
+                    else:
+                        lo = mid
+                return hi
+            prev = dist
+            dist += step
+        return None